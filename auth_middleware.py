@@ -70,6 +70,12 @@ def is_owner(request: Request) -> bool:
     return False
 
 
+def is_owner_key(request: Request) -> bool:
+    """Check if request carries the owner API key (headers like x-vercel-user don't count)."""
+    token = get_auth_token(request)
+    return bool(token) and verify_owner_token(token)
+
+
 def require_auth(request: Request, allow_public: bool = False) -> bool:
     """
     Require authentication for request.
@@ -112,3 +118,13 @@ def require_owner(request: Request) -> bool:
         detail="Owner access required. This endpoint is restricted.",
     )
 
+
+def require_owner_key(request: Request) -> bool:
+    """Require the owner API key, for owner-only tooling that must not trust SSO headers."""
+    if is_owner_key(request):
+        return True
+    
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Owner API key required. This endpoint is restricted.",
+    )
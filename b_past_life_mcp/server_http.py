@@ -13,6 +13,7 @@ import json
 import asyncio
 from typing import Any, Dict
 from pathlib import Path
+from sse_heartbeat import HeartbeatScheduler
 
 # Import matching functions directly
 from match_rank import (
@@ -24,6 +25,12 @@ from match_rank import (
 )
 import pandas as pd
 
+# Pre-encoded SSE frames, shared by every connection
+CONNECTED_FRAME = f"data: {json.dumps({'type': 'connection', 'status': 'connected'})}\n\n"
+PING_FRAME = f"data: {json.dumps({'type': 'ping'})}\n\n"
+
+heartbeat = HeartbeatScheduler(frame=PING_FRAME)
+
 # Create FastAPI app for HTTP
 http_app = FastAPI(title="B Past Life MCP HTTP Server", version="1.0.0")
 
@@ -48,7 +55,8 @@ async def root():
             "sse": "/sse",
             "tools": "/tools",
             "call": "/call"
-        }
+        },
+        "sse": heartbeat.stats()
     }
 
 @http_app.get("/mcp")
@@ -79,19 +87,18 @@ async def sse_endpoint(request: Request):
     This is the main endpoint OpenAI will connect to.
     """
     async def event_stream():
+        # Keepalives come from the shared heartbeat ticker instead of a per-connection loop
+        queue = asyncio.Queue(maxsize=1)
+        heartbeat.subscribe(queue)
         try:
-            # Send initial connection message
-            yield f"data: {json.dumps({'type': 'connection', 'status': 'connected'})}\n\n"
-            
-            # Keep connection alive and handle requests
+            yield CONNECTED_FRAME
             while True:
-                # In a real implementation, you'd parse SSE messages from the client
-                # For now, we'll keep the connection alive
-                await asyncio.sleep(1)
-                yield f"data: {json.dumps({'type': 'ping'})}\n\n"
-                
-        except asyncio.CancelledError:
-            yield f"data: {json.dumps({'type': 'connection', 'status': 'disconnected'})}\n\n"
+                frame = await queue.get()
+                if await request.is_disconnected():
+                    break
+                yield frame
+        finally:
+            heartbeat.unsubscribe(queue)
     
     return StreamingResponse(
         event_stream(),
@@ -0,0 +1,95 @@
+"""
+In-flight request registry for MCP cancellation
+- tools/call requests are registered under (scope, request id) while they
+  run: the SSE session, or on /mcp the Mcp-Session-Id issued on initialize;
+  an id already in flight in the same scope is rejected
+- notifications/cancelled trips the request's CancelToken; long-running tools
+  check it between chunks and stop with RequestCancelled, so the scheduler
+  thread is free for the next call instead of finishing unwanted work
+- Tokens are thread-safe, so tools running on scheduler threads can poll them
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class RequestCancelled(Exception):
+    """Raised inside a tool when its request was cancelled."""
+
+
+class DuplicateRequestId(Exception):
+    """Raised when a request id is reused while the first request still runs."""
+
+
+class CancelToken:
+    """Cancellation flag shared between the event loop and a worker thread."""
+
+    __slots__ = ("_event", "reason")
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: Optional[str] = None):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def check(self):
+        """Raise RequestCancelled if the request was cancelled."""
+        if self._event.is_set():
+            raise RequestCancelled(self.reason or "Request cancelled")
+
+
+class InFlightRequests:
+    """Tokens of running requests, keyed by (scope, request id)."""
+
+    def __init__(self):
+        self._tokens: Dict[Tuple[Hashable, Any], CancelToken] = {}
+        self._lock = threading.Lock()
+        self.cancelled = 0
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @contextmanager
+    def track(self, scope: Hashable, request_id: Any) -> Iterator[CancelToken]:
+        """
+        Register a request for the duration of the block and yield its token.
+
+        Raises DuplicateRequestId if the id is already in flight in this scope,
+        since a cancel for it could otherwise stop the wrong request.
+        """
+        token = CancelToken()
+        # Notifications have no id and can't be cancelled; ids must be hashable to be tracked
+        key = (scope, request_id) if isinstance(request_id, (str, int)) else None
+        if key is not None:
+            with self._lock:
+                if key in self._tokens:
+                    raise DuplicateRequestId(f"Request id already in flight: {request_id}")
+                self._tokens[key] = token
+        try:
+            yield token
+        finally:
+            if key is not None:
+                with self._lock:
+                    del self._tokens[key]
+
+    def cancel(self, scope: Hashable, request_id: Any, reason: Optional[str] = None) -> bool:
+        """Trip the token of a running request; False if it isn't (or is no longer) running."""
+        if not isinstance(request_id, (str, int)):
+            return False
+        with self._lock:
+            token = self._tokens.get((scope, request_id))
+        if token is None:
+            return False
+        token.cancel(reason)
+        self.cancelled += 1
+        return True
+
+
+inflight = InFlightRequests()
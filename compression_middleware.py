@@ -0,0 +1,198 @@
+"""
+Response compression middleware for Resume MCP
+- Negotiates zstd, brotli or gzip from Accept-Encoding (whichever codecs are installed)
+- Only compresses complete bodies above a minimum size; streamed responses
+  (/sse, NDJSON) pass through untouched
+- Caches compressed bytes for bodies that haven't changed
+"""
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from tracing import annotate
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bodies smaller than this are sent as-is
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Per-codec levels (gzip 1-9, brotli 0-11, zstd 1-22)
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+
+# Total bytes of compressed output kept for repeat responses
+COMPRESSION_CACHE_BYTES = int(os.getenv("COMPRESSION_CACHE_BYTES", str(8 * 1024 * 1024)))
+
+# Content types that are streamed incrementally and must never be buffered
+STREAMING_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _available_codecs() -> Dict[str, Callable[[bytes], bytes]]:
+    """Codecs usable in this environment, in server preference order."""
+    codecs = {}
+    if zstandard is not None:
+        codecs["zstd"] = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+    if brotli is not None:
+        codecs["br"] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+    codecs["gzip"] = _gzip
+    return codecs
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}."""
+    accepted = {}
+    for part in header.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        coding, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class CompressedBodyCache:
+    """Size-bounded LRU of compressed bodies keyed by (body digest, encoding)."""
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, body: bytes, encoding: str, codec: Callable[[bytes], bytes]) -> bytes:
+        """Return cached output for an identical body, compressing on a miss."""
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            annotate("cache.compression", "hit")
+            return cached
+        self.misses += 1
+        annotate("cache.compression", "miss")
+        compressed = codec(body)
+        if len(compressed) <= self.max_bytes:
+            self._entries[key] = compressed
+            self._size += len(compressed)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return compressed
+
+
+body_cache = CompressedBodyCache()
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses complete response bodies."""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, cache: CompressedBodyCache = body_cache):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codecs = _available_codecs()
+        self.cache = cache
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Pick the preferred codec the client accepts, or None."""
+        accepted = _parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best, best_q = None, 0.0
+        for coding in self.codecs:
+            q = accepted.get(coding, wildcard)
+            if q > best_q:
+                best, best_q = coding, q
+        return best
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a body with the negotiated codec (cached)."""
+        return self.cache.get_or_compress(body, encoding, self.codecs[encoding])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self, encoding, send).run(self.app, scope, receive)
+
+
+class _CompressionResponder:
+    """Holds back the response start until the body shows whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message = None
+        self.passthrough = False
+
+    async def run(self, app, scope, receive):
+        await app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or content_type.startswith(STREAMING_CONTENT_TYPES):
+                await self._pass_through(message)
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.middleware.minimum_size:
+            # Streamed or small response: send unchanged
+            await self._pass_through(self.start_message)
+            await self.send(message)
+            return
+
+        compressed = self.middleware.compress(body, self.encoding)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The compressed bytes differ from the identity representation
+            headers["ETag"] = f"W/{etag}"
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    async def _pass_through(self, start_message):
+        self.passthrough = True
+        if start_message is not None:
+            await self.send(start_message)
@@ -0,0 +1,86 @@
+"""
+Fast JSON encoding for Resume MCP
+- Uses orjson when installed, falls back to the stdlib json module
+- Both paths write NaN and Infinity as null, as orjson does
+- Compact output by default (set MCP_JSON_INDENT=2 for pretty tool text)
+- Pre-encoded fragments can be embedded in a response without re-encoding
+"""
+import json
+import math
+import os
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Indentation for tool text content; 0 keeps payloads compact
+MCP_JSON_INDENT = int(os.getenv("MCP_JSON_INDENT", "0"))
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _default(obj: Any) -> Any:
+    """Convert numpy/pandas scalars that the stdlib encoder can't handle."""
+    if hasattr(obj, "item"):
+        return obj.item()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of obj with non-finite floats replaced by None, for the stdlib encoder."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    if hasattr(obj, "item") and not isinstance(obj, (str, bytes)):
+        return _finite(obj.item())
+    return obj
+
+
+def dumps_bytes(obj: Any, indent: int = 0) -> bytes:
+    """Serialize to UTF-8 JSON bytes."""
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    return dumps(obj, indent).encode("utf-8")
+
+
+def dumps(obj: Any, indent: int = 0) -> str:
+    """Serialize to a JSON string."""
+    if orjson is not None:
+        return dumps_bytes(obj, indent).decode("utf-8")
+    if indent:
+        options = {"indent": indent}
+    else:
+        options = {"separators": (",", ":")}
+    try:
+        return json.dumps(obj, default=_default, ensure_ascii=False, allow_nan=False, **options)
+    except ValueError:
+        # Only payloads that actually hold NaN/Infinity pay for the copy
+        return json.dumps(_finite(obj), default=_default, ensure_ascii=False, allow_nan=False, **options)
+
+
+def fragment(encoded: bytes) -> Any:
+    """
+    Wrap already-encoded JSON so dumps_bytes() embeds it as-is.
+
+    Needs orjson >= 3.9; otherwise the bytes are decoded back to an object.
+    """
+    if orjson is not None and hasattr(orjson, "Fragment"):
+        return orjson.Fragment(encoded)
+    return json.loads(encoded)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fast encoder (compact output)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -0,0 +1,69 @@
+"""
+Parsed-file cache for Resume MCP
+- load_cached(path, parse) parses a file once and reuses the result until the
+  file's mtime or size changes
+- Used for the resume, rulebook, job index, B Past Life profile and Northstar
+  projects, so repeat tool calls skip JSON/YAML/CSV parsing
+- Values can be offered ahead of time (the data snapshot); an offer is used
+  instead of parsing only if its check accepts the file as unchanged
+- Results are shared between callers (and with forked workers), so treat them
+  as read-only
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+# Precomputed values: path -> (produce(), check(path, stat))
+_offers: Dict[str, Tuple[Callable[[], Any], Callable[[Path, os.stat_result], bool]]] = {}
+
+
+def offer(path: Union[str, Path], produce: Callable[[], Any], check: Callable[[Path, os.stat_result], bool]):
+    """Use produce() instead of parsing path on its first load, if check(path, stat) passes."""
+    _offers[str(Path(path).resolve())] = (produce, check)
+
+
+def load_cached(path: Union[str, Path], parse: Callable[[Path], Any]) -> Any:
+    """Return parse(path), re-parsing only when the file has changed."""
+    path = Path(path)
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    key = str(path.resolve())
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    offered = _offers.pop(key, None)
+    if offered is not None and offered[1](path, stat):
+        value = offered[0]()
+    else:
+        value = parse(path)
+    _cache[key] = (version, value)
+    return value
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes, mode: int = 0o644):
+    """Write data to a temp file next to path, then rename it over path."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def read_json(path: Path) -> Any:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def read_yaml(path: Path) -> Any:
+    import yaml
+
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
@@ -0,0 +1,45 @@
+"""
+Production launcher config for Resume MCP
+- gunicorn master supervising one uvicorn worker (uvloop + httptools are
+  picked up automatically when installed)
+- One event-loop process on purpose: SSE sessions, pagination cursors,
+  background ranking jobs and cancellation tokens live in its memory, and
+  gunicorn can't route a client's follow-up requests back to the same worker
+- Throughput scales with cores through the ranking process pool instead
+  (rank_pool.py, RANK_PROCESSES, one per CPU by default): the worker forks
+  it after loading the data and ranking chunks are scored there
+- The app is imported once in the master (preload_app) and the job index,
+  resume and rulebook matchers are loaded there, so the worker and its
+  scoring processes share them copy-on-write
+- Usage: gunicorn -c gunicorn.conf.py server_http:http_app
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Always one event-loop worker (see above); WEB_CONCURRENCY is ignored
+workers = 1
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app in the master so loaded data is shared with the worker (and its scoring processes)
+preload_app = True
+
+# Rankings can take several seconds; SSE streams keep connections open
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    """Runs in the master before any worker is forked."""
+    import server_http
+
+    loaded = server_http.preload()
+    server.log.info(f"Preloaded {loaded['jobs']} jobs, resume={loaded['resume']}, rulebook={loaded['rulebook']}")
+    # Move everything loaded so far out of the GC's tracked generations, so
+    # collections in the worker and its scoring processes don't touch (and copy) the shared pages
+    gc.freeze()
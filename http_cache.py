@@ -0,0 +1,89 @@
+"""
+HTTP caching helpers for Resume MCP read endpoints
+- Strong ETags derived from the versions of the source data files
+- 304 Not Modified when If-None-Match already names the current version
+- Cache-Control with max-age / s-maxage / stale-while-revalidate
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Browser freshness (seconds)
+CACHE_MAX_AGE = int(os.getenv("CACHE_MAX_AGE", "60"))
+
+# Shared/edge cache freshness for public responses (seconds)
+CACHE_S_MAXAGE = int(os.getenv("CACHE_S_MAXAGE", "300"))
+
+# How long a stale copy may be served while it is revalidated (seconds)
+CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "86400"))
+
+
+def file_version(path: Union[str, Path]) -> str:
+    """Cheap version stamp for a file (mtime + size, no read)."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "missing"
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def source_etag(paths: Iterable[Union[str, Path]], *variant: Any) -> str:
+    """
+    Strong ETag for a response built from the given files.
+
+    variant covers everything else that shapes the body (route, query args).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        digest.update(f"{path}={file_version(path)};".encode())
+    for part in variant:
+        digest.update(f"{part!r};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_headers(etag: str, private: bool = False) -> Dict[str, str]:
+    """
+    ETag and Cache-Control headers for a cacheable response.
+
+    Authenticated responses are marked private so the edge never serves them
+    to another caller; they still revalidate cheaply with If-None-Match.
+    """
+    if private:
+        cache_control = f"private, max-age={CACHE_MAX_AGE}, stale-while-revalidate={CACHE_STALE_WHILE_REVALIDATE}"
+    else:
+        cache_control = (
+            f"public, max-age={CACHE_MAX_AGE}, s-maxage={CACHE_S_MAXAGE}, "
+            f"stale-while-revalidate={CACHE_STALE_WHILE_REVALIDATE}"
+        )
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(request: Request, etag: str, private: bool = False) -> Optional[Response]:
+    """Return a 304 response if the client already has this version, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag):
+        # Echo the weak form if that's what the client holds (compressed copies are weak)
+        if f"W/{etag}" in if_none_match:
+            etag = f"W/{etag}"
+        return Response(status_code=304, headers=cache_headers(etag, private))
+    return None
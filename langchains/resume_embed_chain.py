@@ -3,12 +3,19 @@
 Resume Embedding Chain
 Embeds resume data using free/cheap embedding models.
 Uses sentence-transformers (free, local) as primary, Gemini as fallback.
+The sentence-transformers model is loaded once per process, and its
+embeddings are cached on disk (SQLite) by model id + sha256 of the text, so
+unchanged resume text and job descriptions are never re-encoded.
 """
 
+import hashlib
 import json
 import os
+import sqlite3
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
+import numpy as np
 
 # Load environment
 load_dotenv()
@@ -39,6 +46,117 @@ try:
 except ImportError:
     USE_HUGGINGFACE = False
 
+# Local sentence-transformers model
+EMBED_MODEL = os.getenv("EMBED_MODEL", "all-MiniLM-L6-v2")
+
+# SQLite embedding cache (empty disables it)
+EMBED_CACHE_FILE = os.getenv("EMBED_CACHE_FILE", str(Path(__file__).resolve().parent.parent / "embeddings_cache.db"))
+
+_models = {}
+_models_lock = threading.Lock()
+
+def get_model(model_id=EMBED_MODEL):
+    """The process-wide SentenceTransformer for model_id (loaded on first use)."""
+    model = _models.get(model_id)
+    if model is None:
+        with _models_lock:
+            model = _models.get(model_id)
+            if model is None:
+                model = SentenceTransformer(model_id)
+                _models[model_id] = model
+    return model
+
+def text_hash(text):
+    """Cache key for a text: sha256 of its UTF-8 bytes."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """Embeddings stored as float32 blobs in SQLite, keyed by (model id, text hash)."""
+    
+    def __init__(self, path):
+        self.path = path
+        self._ready = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (model TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL, PRIMARY KEY (model, hash))"
+                )
+                conn.commit()
+                self._ready = True
+        return conn
+    
+    def get_many(self, model_id, hashes):
+        """{hash: vector} for the hashes that are cached."""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        conn = self._connect()
+        try:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({', '.join('?' * len(batch))})",
+                    [model_id, *batch],
+                ).fetchall()
+                found.update((h, np.frombuffer(blob, dtype=np.float32)) for h, blob in rows)
+        finally:
+            conn.close()
+        self.hits += sum(1 for h in hashes if h in found)
+        self.misses += sum(1 for h in hashes if h not in found)
+        return found
+    
+    def put_many(self, model_id, vectors):
+        """Store {hash: vector}."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)",
+                    [(model_id, h, np.asarray(vector, dtype=np.float32).tobytes()) for h, vector in vectors.items()],
+                )
+        finally:
+            conn.close()
+
+embedding_cache = EmbeddingCache(EMBED_CACHE_FILE) if EMBED_CACHE_FILE else None
+
+def embed_texts(texts, model_id=EMBED_MODEL):
+    """
+    Embed texts with the local model, reusing cached embeddings.
+    
+    Only texts not in the cache are encoded (in one batch); returns one
+    list of floats per text, in order. The cache is best-effort: if it can't
+    be read or written (locked, corrupt, unwritable path) the texts are just
+    encoded.
+    """
+    hashes = [text_hash(text) for text in texts]
+    vectors = {}
+    if embedding_cache:
+        try:
+            vectors = embedding_cache.get_many(model_id, hashes)
+        except sqlite3.Error as e:
+            print(f"⚠️  Embedding cache read failed ({embedding_cache.path}): {e}")
+    missing = {}
+    for h, text in zip(hashes, texts):
+        if h not in vectors and h not in missing:
+            missing[h] = text
+    if missing:
+        encoded = get_model(model_id).encode(list(missing.values()))
+        new_vectors = dict(zip(missing.keys(), encoded))
+        if embedding_cache:
+            try:
+                embedding_cache.put_many(model_id, new_vectors)
+            except sqlite3.Error as e:
+                print(f"⚠️  Embedding cache write failed ({embedding_cache.path}): {e}")
+        vectors.update(new_vectors)
+    return [np.asarray(vectors[h], dtype=np.float32).tolist() for h in hashes]
+
 def load_resume(resume_file='resume.json'):
     """Load resume data."""
     resume_path = Path(resume_file)
@@ -93,14 +211,15 @@ def embed_resume_free(resume_text):
     if not USE_SENTENCE_TRANSFORMERS:
         return None
     
-    # Use a good free model (no API needed!)
-    model = SentenceTransformer('all-MiniLM-L6-v2')  # Free, fast, good quality
-    embedding = model.encode(resume_text)
+    # Use a good free model (no API needed!); loaded once, results cached on disk
+    hits = embedding_cache.hits if embedding_cache else 0
+    embedding = embed_texts([resume_text])[0]
+    cached = embedding_cache is not None and embedding_cache.hits > hits
     
-    print(f"✅ Embedded resume using sentence-transformers (free, local)")
+    print(f"✅ Embedded resume using sentence-transformers (free, local{', cached' if cached else ''})")
     print(f"   Embedding dimension: {len(embedding)}")
     
-    return embedding.tolist()
+    return embedding
 
 def embed_resume_gemini(resume_text):
     """Embed resume using Gemini API (free tier)."""
@@ -144,7 +263,7 @@ def embed_resume(resume_file='resume.json', use_free=True):
             return {
                 'embedding': embedding,
                 'method': 'sentence-transformers',
-                'model': 'all-MiniLM-L6-v2',
+                'model': EMBED_MODEL,
                 'cost': 'FREE (local)'
             }
     
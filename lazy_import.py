@@ -0,0 +1,41 @@
+"""
+Deferred imports for Resume MCP
+- LazyModule("pandas") stands in for a module and imports it on first
+  attribute access
+- A custom loader can build the module instead (e.g. exec a file by path)
+- Keeps pandas and the ranking modules off the cold-start path of requests
+  that never use them (tools/list, resume info, health checks)
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Callable, Optional
+
+
+class LazyModule:
+    """Module proxy that loads the real module the first time it's used."""
+
+    def __init__(self, name: str, loader: Optional[Callable[[], ModuleType]] = None):
+        self._name = name
+        self._loader = loader or (lambda: importlib.import_module(name))
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        """Import (or build) the module now and return it."""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = self._loader()
+        return self._module
+
+    def __getattr__(self, attr: str):
+        # Only called for names not set in __init__, i.e. the module's own attributes
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self._name} ({'loaded' if self.loaded else 'not loaded'})>"
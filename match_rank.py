@@ -6,16 +6,25 @@ Loads resume.json and rulebook.yaml, filters jobs,
 scores each job, and outputs shortlist.csv + discard.csv.
 """
 
-import pandas as pd
-import json
-import yaml
+import hashlib
+import inspect
 import logging
+import marshal
+import os
 import re
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from collections import Counter
 
+from file_cache import load_cached, read_json, read_yaml
+from lazy_import import LazyModule
+from tracing import span
+
+# Imported on first use so the server can import the loaders without pandas
+pd = LazyModule("pandas")
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,6 +32,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Jobs scored per chunk by iter_match_and_rank
+RANK_CHUNK_SIZE = int(os.getenv("RANK_CHUNK_SIZE", "200"))
+
+# Second-stage reranker for the server's rankings (a RERANKERS name; empty = single stage)
+RANKING_RERANKER = os.getenv("RANKING_RERANKER", "")
+
+# Stage-1 candidates handed to the reranker
+RANKING_TOP_K = int(os.getenv("RANKING_TOP_K", "50"))
+
+# Also rerank every candidate to report recall@top_n of the pipeline (diagnostic, costs a full rerank)
+RANKING_MEASURE_RECALL = int(os.getenv("RANKING_MEASURE_RECALL", "0"))
+
 def load_resume(resume_file='resume.json'):
     """Load resume data from JSON."""
     resume_path = Path(resume_file)
@@ -30,8 +51,7 @@ def load_resume(resume_file='resume.json'):
         logger.error(f"Resume file not found: {resume_file}")
         return None
     
-    with open(resume_path, 'r') as f:
-        return json.load(f)
+    return load_cached(resume_path, read_json)
 
 def load_rulebook(rulebook_file='rulebook.yaml'):
     """Load rulebook from YAML."""
@@ -40,8 +60,107 @@ def load_rulebook(rulebook_file='rulebook.yaml'):
         logger.error(f"Rulebook file not found: {rulebook_file}")
         return None
     
-    with open(rulebook_path, 'r') as f:
-        return yaml.safe_load(f)
+    return load_cached(rulebook_path, read_yaml)
+
+def load_jobs(jobs_file='jobs_clean.csv'):
+    """Load the job index (cleaned jobs CSV) as a DataFrame."""
+    return load_cached(jobs_file, pd.read_csv)
+
+# Compiled matchers keyed by the identity of the resume/rulebook they came from
+_compiled: Dict[Tuple[str, int], Tuple[Any, Dict]] = {}
+
+def _memo_compile(obj, compile_fn):
+    key = (compile_fn.__name__, id(obj))
+    entry = _compiled.get(key)
+    if entry is not None and entry[0] is obj:
+        return entry[1]
+    compiled = compile_fn(obj)
+    if len(_compiled) > 32:
+        _compiled.clear()
+    _compiled[key] = (obj, compiled)
+    return compiled
+
+def _compile_rulebook(rulebook):
+    return {
+        'positive': [kw.lower() for kw in rulebook.get('positive_keywords', [])],
+        'negative': [kw.lower() for kw in rulebook.get('negative_keywords', [])],
+        'min_positive': rulebook.get('min_positive_matches', 1),
+        'max_negative': rulebook.get('max_negative_matches', 0),
+    }
+
+def _compile_resume(resume):
+    skills = [(skill, skill.lower(), weight) for skill, weight in resume['skills'].items()]
+    projects = [
+        (project['name'], project['name'].lower(), [tech.lower() for tech in project.get('tech', [])], project.get('weight', 5))
+        for project in resume['projects']
+    ]
+    return {
+        'skills': skills,
+        'skill_weight': sum(weight for _, _, weight in skills),
+        'projects': projects,
+        'project_weight': sum(weight for _, _, _, weight in projects),
+    }
+
+def matcher_version():
+    """
+    Hash of the code that compiles the resume and rulebook matchers.
+    
+    Pickled matchers (the data snapshot) are only reused under the same
+    version, so editing the compile code retires old snapshots by itself.
+    """
+    digest = hashlib.sha256()
+    for compile_fn in (_compile_resume, _compile_rulebook):
+        try:
+            code = inspect.getsource(compile_fn).encode()
+        except (OSError, TypeError):
+            # Source not shipped: the bytecode changes with the code too
+            code = marshal.dumps(compile_fn.__code__)
+        digest.update(compile_fn.__name__.encode() + b"\0" + code + b"\0")
+    return digest.hexdigest()[:16]
+
+def _order_newest_first(df):
+    if 'published' not in df.columns:
+        return None
+    published = pd.to_datetime(df['published'], errors='coerce', utc=True).reset_index(drop=True)
+    # Stable, so jobs published at the same time keep corpus order; undated jobs go last
+    return published.sort_values(ascending=False, kind='mergesort', na_position='last').index.to_numpy()
+
+def newest_first_order(df):
+    """Row positions of df by published date, newest first (None without a published column; computed once per DataFrame)."""
+    return _memo_compile(df, _order_newest_first)
+
+def compiled_rulebook(rulebook):
+    """Lowercased keyword lists and thresholds for a rulebook (compiled once per object)."""
+    return _memo_compile(rulebook, _compile_rulebook)
+
+def compiled_resume(resume):
+    """Lowercased skills/projects with total weights for a resume (compiled once per object)."""
+    return _memo_compile(resume, _compile_resume)
+
+def seed_compiled(kind, obj, compiled):
+    """Register an already-compiled matcher ('resume' or 'rulebook') for obj, e.g. from the data snapshot."""
+    compile_fn = {'resume': _compile_resume, 'rulebook': _compile_rulebook}[kind]
+    _compiled[(compile_fn.__name__, id(obj))] = (obj, compiled)
+
+def preload(jobs_file='jobs_clean.csv', resume_file='resume.json', rulebook_file='rulebook.yaml'):
+    """
+    Load the job index, resume and rulebook and compile their matchers.
+    
+    Later rankings reuse everything loaded here; called before forking
+    workers, the data is shared with them copy-on-write.
+    """
+    resume = load_resume(resume_file)
+    rulebook = load_rulebook(rulebook_file)
+    jobs = load_jobs(jobs_file) if Path(jobs_file).exists() else None
+    if resume:
+        compiled_resume(resume)
+    if rulebook:
+        compiled_rulebook(rulebook)
+    return {
+        'jobs': 0 if jobs is None else len(jobs),
+        'resume': bool(resume),
+        'rulebook': bool(rulebook),
+    }
 
 def extract_keywords(text):
     """Extract keywords from text (lowercase, alphanumeric)."""
@@ -131,30 +250,63 @@ def calculate_project_score(job_text, resume_projects):
     score = (matched_weight / total_weight) * 100
     return score, matched_projects
 
+def _column(df, name):
+    """Column values as a list ('' for every row if the column is missing)."""
+    if name in df.columns:
+        return df[name].tolist()
+    return [''] * len(df)
+
+def _skill_score(job_text_lower, matcher):
+    """calculate_skill_score() against a compiled resume and pre-lowercased text."""
+    total_weight = matcher['skill_weight']
+    if total_weight == 0:
+        return 0, []
+    matched_skills = []
+    matched_weight = 0
+    for skill, skill_lower, weight in matcher['skills']:
+        if skill_lower in job_text_lower:
+            matched_skills.append(skill)
+            matched_weight += weight
+    return (matched_weight / total_weight) * 100, matched_skills
+
+def _project_score(job_text_lower, matcher):
+    """calculate_project_score() against a compiled resume and pre-lowercased text."""
+    total_weight = matcher['project_weight']
+    if total_weight == 0:
+        return 0, []
+    matched_projects = []
+    matched_weight = 0
+    for name, name_lower, techs, weight in matcher['projects']:
+        if name_lower in job_text_lower or any(tech in job_text_lower for tech in techs):
+            matched_projects.append(name)
+            matched_weight += weight
+    return (matched_weight / total_weight) * 100, matched_projects
+
 def filter_jobs(df, rulebook):
     """
     Filter jobs using positive/negative keywords.
     
     Returns: (filtered_df, discarded_df)
     """
-    positive_keywords = rulebook.get('positive_keywords', [])
-    negative_keywords = rulebook.get('negative_keywords', [])
-    min_positive = rulebook.get('min_positive_matches', 1)
-    max_negative = rulebook.get('max_negative_matches', 0)
+    matcher = compiled_rulebook(rulebook)
+    positive_keywords = matcher['positive']
+    negative_keywords = matcher['negative']
+    min_positive = matcher['min_positive']
+    max_negative = matcher['max_negative']
     
     filtered_indices = []
     discarded_indices = []
     discard_reasons = []
     
-    for idx, row in df.iterrows():
+    for idx, title, company in zip(df.index, _column(df, 'title'), _column(df, 'company')):
         # Combine title and company for keyword matching
-        job_text = f"{row['title']} {row.get('company', '')}".lower()
+        job_text = f"{title} {company}".lower()
         
         # Check positive keywords
-        positive_matches = sum(1 for kw in positive_keywords if kw.lower() in job_text)
+        positive_matches = sum(1 for kw in positive_keywords if kw in job_text)
         
         # Check negative keywords
-        negative_matches = sum(1 for kw in negative_keywords if kw.lower() in job_text)
+        negative_matches = sum(1 for kw in negative_keywords if kw in job_text)
         
         # Apply filters
         if positive_matches >= min_positive and negative_matches <= max_negative:
@@ -181,21 +333,22 @@ def rank_jobs(df, resume, rulebook):
     Returns: DataFrame with match_score, matched_skills, matched_projects columns
     """
     results = []
+    resume_matcher = compiled_resume(resume)
+    positive_keywords = compiled_rulebook(rulebook)['positive']
     
-    for idx, row in df.iterrows():
+    for title, company, description in zip(_column(df, 'title'), _column(df, 'company'), _column(df, 'description')):
         # Combine all text fields for matching
-        job_text = f"{row['title']} {row.get('company', '')} {row.get('description', '')}"
+        job_text = f"{title} {company} {description}".lower()
         
         # Calculate scores
-        skill_score, matched_skills = calculate_skill_score(job_text, resume['skills'])
-        project_score, matched_projects = calculate_project_score(job_text, resume['projects'])
+        skill_score, matched_skills = _skill_score(job_text, resume_matcher)
+        project_score, matched_projects = _project_score(job_text, resume_matcher)
         
         # Combined score (weighted average)
         combined_score = (skill_score * 0.6) + (project_score * 0.4)
         
         # Count positive keyword matches (bonus)
-        positive_keywords = rulebook.get('positive_keywords', [])
-        positive_matches, matched_pos_keywords = count_keyword_matches(job_text, positive_keywords)
+        positive_matches = sum(1 for kw in positive_keywords if kw in job_text)
         keyword_bonus = min(positive_matches * 2, 10)  # Max 10 point bonus
         
         final_score = combined_score + keyword_bonus
@@ -212,20 +365,167 @@ def rank_jobs(df, resume, rulebook):
         df[col] = [r[col] for r in results]
     
     # Sort by match score descending
-    df = df.sort_values('match_score', ascending=False)
+    df = df.sort_values('match_score', ascending=False, kind='mergesort')
     
     return df
 
+def score_chunk(df, resume, rulebook):
+    """
+    filter_jobs then rank_jobs for one chunk of the job index.
+    
+    Returns (ranked_df, discarded_df); ranked_df is None when no job passed.
+    """
+    with span("filter_jobs", jobs=len(df)):
+        filtered_df, discarded_df = filter_jobs(df, rulebook)
+    if len(filtered_df) == 0:
+        return None, discarded_df
+    with span("rank_jobs", jobs=len(filtered_df)):
+        return rank_jobs(filtered_df, resume, rulebook), discarded_df
+
+def _compile_patterns(resume):
+    def pattern(term):
+        return re.compile(r'(?<!\w)' + re.escape(term.lower()) + r'(?!\w)')
+    return {
+        'skills': [(skill, pattern(skill), weight) for skill, weight in resume['skills'].items()],
+        'projects': [
+            (project['name'], [pattern(project['name'])] + [pattern(tech) for tech in project.get('tech', [])], project.get('weight', 5))
+            for project in resume['projects']
+        ],
+    }
+
+def _compile_keyword_patterns(rulebook):
+    return [re.compile(r'(?<!\w)' + re.escape(kw) + r'(?!\w)') for kw in compiled_rulebook(rulebook)['positive']]
+
+def word_boundary_rerank(df, resume, rulebook):
+    """
+    Second-stage scorer: the rank_jobs formula with whole-word matches only.
+    
+    Substring matching lets short skills hit inside other words ("Go" in
+    "Google", "AI" in "maintain"); this checks word boundaries with one regex
+    per skill and tech, which is too slow for the whole corpus but fine for
+    the top K candidates.
+    """
+    patterns = _memo_compile(resume, _compile_patterns)
+    keyword_patterns = _memo_compile(rulebook, _compile_keyword_patterns)
+    resume_matcher = compiled_resume(resume)
+    skill_weight = resume_matcher['skill_weight']
+    project_weight = resume_matcher['project_weight']
+    
+    scores, skills_col, projects_col, keywords_col = [], [], [], []
+    for title, company, description in zip(_column(df, 'title'), _column(df, 'company'), _column(df, 'description')):
+        job_text = f"{title} {company} {description}".lower()
+        matched_skills, matched_skill_weight = [], 0
+        for skill, pattern, weight in patterns['skills']:
+            if pattern.search(job_text):
+                matched_skills.append(skill)
+                matched_skill_weight += weight
+        matched_projects, matched_project_weight = [], 0
+        for name, project_patterns, weight in patterns['projects']:
+            if any(pattern.search(job_text) for pattern in project_patterns):
+                matched_projects.append(name)
+                matched_project_weight += weight
+        skill_score = (matched_skill_weight / skill_weight) * 100 if skill_weight else 0
+        project_score = (matched_project_weight / project_weight) * 100 if project_weight else 0
+        positive_matches = sum(1 for pattern in keyword_patterns if pattern.search(job_text))
+        scores.append(round((skill_score * 0.6) + (project_score * 0.4) + min(positive_matches * 2, 10), 2))
+        skills_col.append(', '.join(matched_skills[:5]))
+        projects_col.append(', '.join(matched_projects[:3]))
+        keywords_col.append(positive_matches)
+    
+    df['match_score'] = scores
+    df['matched_skills'] = skills_col
+    df['matched_projects'] = projects_col
+    df['positive_keyword_matches'] = keywords_col
+    return df.sort_values('match_score', ascending=False, kind='mergesort')
+
+# Second-stage rerankers by name: fn(candidates_df, resume, rulebook) -> reordered df, best first
+RERANKERS = {
+    'word_boundary': word_boundary_rerank,
+}
+
+def register_reranker(name, rerank):
+    """Make a reranker available to RankingPipeline / RANKING_RERANKER under name."""
+    RERANKERS[name] = rerank
+
+class RankingPipeline:
+    """
+    Two-stage ranking: a cheap first stage over the whole corpus, then an
+    expensive rerank of the top K candidates only.
+    
+    Stage 1 is filter_jobs plus the rank_jobs keyword score; its K best jobs
+    go to the reranker. With measure_recall, every stage-1 candidate is also
+    reranked, to report how many of the full rerank's top N the pipeline kept.
+    """
+    
+    def __init__(self, reranker='word_boundary', top_k=RANKING_TOP_K, measure_recall=False):
+        if reranker not in RERANKERS:
+            raise ValueError(f"Unknown reranker: {reranker!r} (expected one of {', '.join(sorted(RERANKERS))})")
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        self.reranker = reranker
+        self.top_k = top_k
+        self.measure_recall = measure_recall
+    
+    def rerank(self, candidates, resume, rulebook, top_n, scored=None):
+        """
+        Rerank stage-1 candidates (best first, at most top_k are used).
+        
+        scored is every stage-1 job, needed for the recall measurement.
+        Returns (reranked_df, report) with rerank latency and recall@top_n.
+        """
+        candidates = candidates.head(self.top_k)
+        rerank = RERANKERS[self.reranker]
+        start = time.perf_counter()
+        with span("rerank", jobs=len(candidates)):
+            reranked = rerank(candidates.copy(), resume, rulebook)
+        report = {
+            'reranker': self.reranker,
+            'top_k': self.top_k,
+            'candidates': len(candidates),
+            'rerank_ms': round((time.perf_counter() - start) * 1000, 3),
+            'recall': None,
+        }
+        if self.measure_recall and scored is not None:
+            with span("rerank_recall", jobs=len(scored)):
+                expected = set(rerank(scored.copy(), resume, rulebook).head(top_n).index)
+            kept = set(reranked.head(top_n).index)
+            report['recall'] = round(len(expected & kept) / len(expected), 4) if expected else 1.0
+        return reranked, report
+    
+    def run(self, df, resume, rulebook, top_n=5):
+        """Both stages over a whole DataFrame; returns (reranked_df, discarded_df, report)."""
+        start = time.perf_counter()
+        with span("filter_jobs", jobs=len(df)):
+            filtered_df, discarded_df = filter_jobs(df, rulebook)
+        with span("rank_jobs", jobs=len(filtered_df)):
+            scored = rank_jobs(filtered_df, resume, rulebook)
+        prefilter_ms = round((time.perf_counter() - start) * 1000, 3)
+        reranked, report = self.rerank(scored, resume, rulebook, top_n, scored if self.measure_recall else None)
+        return reranked, discarded_df, {'passed': len(scored), 'prefilter_ms': prefilter_ms, **report}
+
+def default_pipeline():
+    """The pipeline configured by RANKING_RERANKER / RANKING_TOP_K / RANKING_MEASURE_RECALL, or None."""
+    if not RANKING_RERANKER:
+        return None
+    return RankingPipeline(RANKING_RERANKER, RANKING_TOP_K, bool(RANKING_MEASURE_RECALL))
+
 def match_and_rank(
     jobs_file='jobs_clean.csv',
     resume_file='resume.json',
     rulebook_file='rulebook.yaml',
     shortlist_file='shortlist.csv',
     discard_file='discard.csv',
-    top_n=5
+    top_n=5,
+    store=None,
+    pipeline=None
 ):
     """
     Main matching and ranking function.
+    
+    The shortlist and discarded jobs are written to shortlist_file and
+    discard_file (pass None to skip either) and, when a result store is
+    given, put into it as "shortlist" and "discard". With a RankingPipeline
+    only its top K candidates are reranked (see its report in the log).
     """
     # Load data
     logger.info(f"Loading jobs from {jobs_file}...")
@@ -234,42 +534,191 @@ def match_and_rank(
         logger.info("Run etl_clean.py first to generate jobs_clean.csv")
         return False
     
-    df = pd.read_csv(jobs_file)
+    with span("read_csv"):
+        df = load_jobs(jobs_file)
     logger.info(f"Loaded {len(df)} jobs")
     
     logger.info(f"Loading resume from {resume_file}...")
-    resume = load_resume(resume_file)
+    with span("load_resume"):
+        resume = load_resume(resume_file)
     if not resume:
         return False
     
     logger.info(f"Loading rulebook from {rulebook_file}...")
-    rulebook = load_rulebook(rulebook_file)
+    with span("load_rulebook"):
+        rulebook = load_rulebook(rulebook_file)
     if not rulebook:
         return False
     
-    # Filter jobs
-    logger.info("Filtering jobs using rulebook...")
-    filtered_df, discarded_df = filter_jobs(df, rulebook)
-    logger.info(f"Filtered: {len(filtered_df)} passed, {len(discarded_df)} discarded")
-    
-    # Rank filtered jobs
-    logger.info("Ranking jobs...")
-    ranked_df = rank_jobs(filtered_df, resume, rulebook)
+    if pipeline is not None:
+        logger.info(f"Ranking with {pipeline.reranker} rerank of the top {pipeline.top_k}...")
+        ranked_df, discarded_df, report = pipeline.run(df, resume, rulebook, top_n)
+        logger.info(f"Pipeline: {report}")
+    else:
+        # Filter jobs
+        logger.info("Filtering jobs using rulebook...")
+        with span("filter_jobs", jobs=len(df)):
+            filtered_df, discarded_df = filter_jobs(df, rulebook)
+        logger.info(f"Filtered: {len(filtered_df)} passed, {len(discarded_df)} discarded")
+        
+        # Rank filtered jobs
+        logger.info("Ranking jobs...")
+        with span("rank_jobs", jobs=len(filtered_df)):
+            ranked_df = rank_jobs(filtered_df, resume, rulebook)
     
     # Get top N
     shortlist_df = ranked_df.head(top_n).copy()
     logger.info(f"Top {top_n} jobs selected for shortlist")
     
     # Save outputs
-    logger.info(f"Writing shortlist to {shortlist_file}...")
-    shortlist_df.to_csv(shortlist_file, index=False)
+    if store is not None:
+        with span("store_results"):
+            store.put('shortlist', shortlist_df)
+            store.put('discard', discarded_df)
     
-    logger.info(f"Writing discarded jobs to {discard_file}...")
-    discarded_df.to_csv(discard_file, index=False)
+    if shortlist_file:
+        logger.info(f"Writing shortlist to {shortlist_file}...")
+        with span("write_shortlist"):
+            shortlist_df.to_csv(shortlist_file, index=False)
+    
+    if discard_file:
+        logger.info(f"Writing discarded jobs to {discard_file}...")
+        with span("write_discards"):
+            discarded_df.to_csv(discard_file, index=False)
     
     logger.info("✓ Matching and ranking complete!")
     return True, shortlist_df, ranked_df
 
+def iter_match_and_rank(
+    jobs_file='jobs_clean.csv',
+    resume_file='resume.json',
+    rulebook_file='rulebook.yaml',
+    shortlist_file='shortlist.csv',
+    discard_file='discard.csv',
+    top_n=5,
+    chunk_size=RANK_CHUNK_SIZE,
+    store=None,
+    deadline: Optional[float] = None,
+    pipeline=None,
+    pool=None
+):
+    """
+    Incremental version of match_and_rank.
+
+    Scores the corpus chunk by chunk and yields events as it goes:
+        {"event": "progress", "scanned", "total", "passed"}  after every chunk
+        {"event": "partial", "top": [...]}                   when the top N changes
+        {"event": "result", "shortlist": [...], "count", "total",
+         "scanned", "scanned_fraction", "partial"}           once at the end
+
+    With a deadline (a time.monotonic() value) jobs are scanned newest first
+    and no chunk is started once it has passed; the result is then the best
+    top N of what was scanned, with partial=True. At least one chunk is
+    always scored.
+
+    With a RankingPipeline the running stage-1 top K is kept instead of the
+    top N and reranked once scanning ends; the result then has a "pipeline"
+    report (candidates, prefilter_ms, rerank_ms, recall).
+
+    With a pool (rank_pool.RankPool) each chunk is filtered and scored by
+    pool.score() in another process; only row positions are sent, and the
+    running top N, events and deadline checks stay here.
+
+    Discarded jobs are appended to discard_file per chunk and the final
+    shortlist is written to shortlist_file, so the full ranking is never held.
+    Either file can be None; with a result store the shortlist and the
+    collected discards are put into it at the end instead (complete scans
+    only).
+    Raises FileNotFoundError / ValueError if inputs are missing.
+    """
+    if not Path(jobs_file).exists():
+        raise FileNotFoundError(f"Jobs file not found: {jobs_file}")
+
+    with span("read_csv"):
+        df = load_jobs(jobs_file)
+    with span("load_resume"):
+        resume = load_resume(resume_file)
+    with span("load_rulebook"):
+        rulebook = load_rulebook(rulebook_file)
+    if not resume or not rulebook:
+        raise ValueError("Resume or rulebook not found")
+
+    total = len(df)
+    passed = 0
+    scanned = 0
+    top_df = None
+    wrote_discards = False
+    discarded_chunks = []
+    order = newest_first_order(df) if deadline is not None else None
+    keep = top_n if pipeline is None else max(top_n, pipeline.top_k)
+    prefilter_seconds = 0.0
+    scored_chunks = [] if pipeline is not None and pipeline.measure_recall else None
+
+    for start in range(0, total, chunk_size):
+        if deadline is not None and start > 0 and time.monotonic() >= deadline:
+            break
+        positions = slice(start, start + chunk_size) if order is None else order[start:start + chunk_size]
+        chunk_start = time.perf_counter()
+        if pool is not None:
+            with span("score_chunk", jobs=min(chunk_size, total - start)):
+                ranked_chunk, discarded_df = pool.score(jobs_file, resume_file, rulebook_file, positions)
+        else:
+            ranked_chunk, discarded_df = score_chunk(df.iloc[positions], resume, rulebook)
+        prefilter_seconds += time.perf_counter() - chunk_start
+
+        if len(discarded_df) > 0:
+            if discard_file:
+                with span("write_discards"):
+                    discarded_df.to_csv(discard_file, index=False, mode='a' if wrote_discards else 'w', header=not wrote_discards)
+                wrote_discards = True
+            if store is not None:
+                discarded_chunks.append(discarded_df)
+
+        if ranked_chunk is not None:
+            passed += len(ranked_chunk)
+            if scored_chunks is not None:
+                scored_chunks.append(ranked_chunk)
+            candidates = ranked_chunk if top_df is None else pd.concat([top_df, ranked_chunk])
+            new_top = candidates.sort_values('match_score', ascending=False, kind='mergesort').head(keep)
+            changed = top_df is None or not new_top.index[:top_n].equals(top_df.index[:top_n])
+            top_df = new_top
+            if changed:
+                yield {"event": "partial", "top": top_df.head(top_n).to_dict(orient="records")}
+
+        scanned = min(start + chunk_size, total)
+        yield {"event": "progress", "scanned": scanned, "total": total, "passed": passed}
+
+    report = None
+    if pipeline is not None and top_df is not None:
+        scored = pd.concat(scored_chunks) if scored_chunks else None
+        top_df, report = pipeline.rerank(top_df, resume, rulebook, top_n, scored)
+        report = {'passed': passed, 'prefilter_ms': round(prefilter_seconds * 1000, 3), **report}
+    shortlist_df = top_df.head(top_n) if top_df is not None else df.head(0)
+    # A partial scan never replaces a stored complete ranking
+    if store is not None and scanned == total:
+        with span("store_results"):
+            store.put('shortlist', shortlist_df)
+            store.put('discard', pd.concat(discarded_chunks) if discarded_chunks else df.head(0))
+    if shortlist_file:
+        with span("write_shortlist"):
+            shortlist_df.to_csv(shortlist_file, index=False)
+    if discard_file and not wrote_discards:
+        df.head(0).to_csv(discard_file, index=False)
+
+    shortlist = shortlist_df.to_dict(orient="records")
+    result = {
+        "event": "result",
+        "shortlist": shortlist,
+        "count": len(shortlist),
+        "total": total,
+        "scanned": scanned,
+        "scanned_fraction": round(scanned / total, 4) if total else 1.0,
+        "partial": scanned < total,
+    }
+    if report is not None:
+        result["pipeline"] = report
+    yield result
+
 def print_preview(shortlist_df):
     """Print a pretty preview table of top matches."""
     print("\n" + "="*80)
@@ -295,9 +744,13 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Match and rank jobs against resume')
     parser.add_argument('--preview', action='store_true', help='Print preview table')
     parser.add_argument('--top-n', type=int, default=5, help='Number of top jobs (default: 5)')
+    parser.add_argument('--rerank', choices=sorted(RERANKERS), default=RANKING_RERANKER or None, help='Rerank the top K keyword matches with this scorer')
+    parser.add_argument('--top-k', type=int, default=RANKING_TOP_K, help=f'Candidates passed to the reranker (default: {RANKING_TOP_K})')
+    parser.add_argument('--recall', action='store_true', help='Also rerank every candidate and log the recall of the top K cut')
     args = parser.parse_args()
     
-    result = match_and_rank(top_n=args.top_n)
+    pipeline = RankingPipeline(args.rerank, args.top_k, args.recall) if args.rerank else None
+    result = match_and_rank(top_n=args.top_n, pipeline=pipeline)
     
     if isinstance(result, tuple):
         success, shortlist_df, ranked_df = result
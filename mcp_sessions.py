@@ -0,0 +1,160 @@
+"""
+MCP SSE session transport for Resume MCP
+- GET /sse opens an event stream and announces a per-session message endpoint
+- Clients POST JSON-RPC messages to that endpoint; replies arrive on the stream
+- Bounded per-session queues apply backpressure to slow readers
+- Sessions with no client activity are expired
+- Keepalives come from the shared heartbeat in sse_heartbeat
+"""
+import asyncio
+import os
+import secrets
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import Request
+
+from sse_heartbeat import heartbeat, HEARTBEAT_FRAME
+from fast_json import dumps
+
+# Max frames buffered per session before senders have to wait
+SESSION_QUEUE_SIZE = int(os.getenv("SSE_SESSION_QUEUE_SIZE", "64"))
+
+# How long a sender waits on a full queue before the reader is considered stuck
+SESSION_SEND_TIMEOUT = float(os.getenv("SSE_SEND_TIMEOUT", "10"))
+
+# Sessions with no client messages for this long are closed
+SESSION_IDLE_TIMEOUT = float(os.getenv("SSE_SESSION_IDLE_TIMEOUT", "900"))
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"
+}
+
+class SessionClosed(Exception):
+    """Raised when sending to a session whose stream has gone away."""
+
+
+def format_sse(data: str, event: Optional[str] = None) -> str:
+    """Encode one Server-Sent Event frame."""
+    frame = f"event: {event}\n" if event else ""
+    for line in data.splitlines() or [""]:
+        frame += f"data: {line}\n"
+    return frame + "\n"
+
+
+class MCPSession:
+    """One open SSE stream and the queue of frames waiting to be written to it."""
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SESSION_QUEUE_SIZE)
+        self.created_at = time.monotonic()
+        self.last_activity = self.created_at
+        self.closed = False
+        # Protocol version agreed in initialize (drives structuredContent support)
+        self.protocol_version: Optional[str] = None
+        # Who this session's tool calls are charged to (rate limiting)
+        self.principal: Optional[str] = None
+        # Handler tasks spawned for this session's messages (kept referenced until done)
+        self.tasks = set()
+
+    def touch(self):
+        """Record client activity so the session is not expired."""
+        self.last_activity = time.monotonic()
+
+    def is_idle(self, now: Optional[float] = None) -> bool:
+        """Check whether the session has been inactive past the idle timeout."""
+        now = time.monotonic() if now is None else now
+        return now - self.last_activity > SESSION_IDLE_TIMEOUT
+
+    async def send(self, message: Any, event: str = "message"):
+        """
+        Queue a JSON-RPC message for delivery on the stream.
+
+        Waits while the queue is full; if the reader does not drain it within
+        SESSION_SEND_TIMEOUT the session is closed and SessionClosed is raised.
+        """
+        if self.closed:
+            raise SessionClosed(f"Session {self.id} is closed")
+        frame = format_sse(dumps(message), event)
+        try:
+            await asyncio.wait_for(self.queue.put(frame), SESSION_SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.close()
+            raise SessionClosed(f"Session {self.id} reader is not keeping up")
+
+    def close(self):
+        """Close the session and wake the stream so it can finish."""
+        if self.closed:
+            return
+        self.closed = True
+        current = asyncio.current_task()
+        for task in list(self.tasks):
+            if task is not current:
+                task.cancel()
+        # Drop undelivered frames so the sentinel always fits
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def stream(self, request: Request, endpoint: str) -> AsyncIterator[str]:
+        """Yield SSE frames until the client disconnects or the session closes."""
+        heartbeat.subscribe(self.queue)
+        try:
+            # First event tells the client where to POST its messages
+            yield format_sse(endpoint, "endpoint")
+            while True:
+                frame = await self.queue.get()
+                if frame is None:
+                    break
+                if frame is HEARTBEAT_FRAME and (self.is_idle() or await request.is_disconnected()):
+                    break
+                yield frame
+        finally:
+            heartbeat.unsubscribe(self.queue)
+            sessions.remove(self.id)
+
+
+class SessionManager:
+    """Registry of open MCP sessions keyed by session id."""
+
+    def __init__(self):
+        self._sessions: Dict[str, MCPSession] = {}
+
+    def create(self) -> MCPSession:
+        """Open a new session (expiring idle ones first)."""
+        self.expire_idle()
+        session = MCPSession(secrets.token_urlsafe(16))
+        self._sessions[session.id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[MCPSession]:
+        """Look up a live session."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if session.closed or session.is_idle():
+            self.remove(session_id)
+            return None
+        return session
+
+    def remove(self, session_id: str):
+        """Close and forget a session."""
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+
+    def expire_idle(self):
+        """Close every session that has been idle past the timeout."""
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            if session.closed or session.is_idle(now):
+                self.remove(session_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+sessions = SessionManager()
@@ -0,0 +1,274 @@
+"""
+Prometheus-style metrics for Resume MCP
+- In-process counters, gauges and histograms (no client library needed)
+- Per-route and per-tool request counts, errors, latency and in-flight calls
+- Gauges read at scrape time: caches, scheduler queues, SSE connections,
+  corpus size
+- Rendered in the Prometheus text exposition format by GET /metrics
+"""
+import bisect
+import csv
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from http_cache import file_version
+
+# Latency buckets in seconds; rankings can take several seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base for labelled metrics; one lock per metric keeps updates cheap."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, values)} {_format_value(value)}"
+            for values, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, values)} {_format_value(value)}"
+            for values, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(values, list(counts), total[0]) for values, (counts, total) in self._values.items()]
+        lines = self.header()
+        for values, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], callback: Callable[[], Iterable[Tuple[LabelValues, float]]], kind: str = "gauge"):
+        super().__init__(name, help_text, labels)
+        self.kind = kind
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, values)} {_format_value(value)}"
+            for values, value in self.callback()
+        ]
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                # A failing collector must not break the whole scrape
+                continue
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "resume_mcp_http_requests_total", "HTTP requests by route, method and status class",
+    ("route", "method", "status")))
+http_latency = registry.register(Histogram(
+    "resume_mcp_http_request_duration_seconds", "HTTP request latency (full body for streams)",
+    ("route", "method")))
+http_in_flight = registry.register(Gauge(
+    "resume_mcp_http_requests_in_flight", "HTTP requests currently being served", ("route",)))
+
+tool_calls = registry.register(Counter(
+    "resume_mcp_tool_calls_total", "Tool calls by tool and outcome", ("tool", "outcome")))
+tool_latency = registry.register(Histogram(
+    "resume_mcp_tool_duration_seconds", "Tool call latency, including scheduler queue wait", ("tool",)))
+tool_in_flight = registry.register(Gauge(
+    "resume_mcp_tool_calls_in_flight", "Tool calls currently running or queued", ("tool",)))
+
+
+class _ToolTimer:
+    """Context manager that records one tool call."""
+
+    __slots__ = ("tool", "start")
+
+    def __init__(self, tool: str):
+        self.tool = tool
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        tool_in_flight.inc(self.tool)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        tool_latency.observe(time.perf_counter() - self.start, self.tool)
+        tool_in_flight.dec(self.tool)
+        tool_calls.inc(self.tool, "error" if exc_type else "ok")
+        return False
+
+
+def track_tool(tool_name: str, known_tools: Optional[Iterable[str]] = None) -> _ToolTimer:
+    """Time a tool call; unknown names share one label to bound cardinality."""
+    if known_tools is not None and tool_name not in known_tools:
+        tool_name = "unknown"
+    return _ToolTimer(tool_name)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route counts, latency and in-flight requests.
+
+    route_paths returns the app's route paths; anything else is labelled
+    "unmatched" so scanners can't blow up label cardinality.
+    """
+
+    def __init__(self, app, route_paths: Callable[[], Iterable[str]]):
+        self.app = app
+        self.route_paths = route_paths
+        self._paths: Optional[frozenset] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._paths is None:
+            self._paths = frozenset(self.route_paths())
+        route = scope["path"] if scope["path"] in self._paths else "unmatched"
+        method = scope["method"]
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        http_in_flight.inc(route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec(route)
+            http_requests.inc(route, method, f"{status[0] // 100}xx")
+            http_latency.observe(time.perf_counter() - start, route, method)
+
+
+_corpus_cache: Dict[str, Tuple[str, int]] = {}
+
+
+def corpus_size(path: str) -> int:
+    """Number of job records in a CSV, recounted only when the file changes."""
+    version = file_version(path)
+    cached = _corpus_cache.get(path)
+    if cached and cached[0] == version:
+        return cached[1]
+    count = 0
+    if version != "missing":
+        with open(path, newline="", encoding="utf-8") as f:
+            count = max(0, sum(1 for _ in csv.reader(f)) - 1)
+    _corpus_cache[path] = (version, count)
+    return count
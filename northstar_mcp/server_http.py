@@ -13,6 +13,7 @@ import json
 import asyncio
 from pathlib import Path
 from typing import Any, Optional
+from sse_heartbeat import HeartbeatScheduler
 
 # Load projects data
 PROJECTS_FILE = Path(__file__).parent / "projects.json"
@@ -22,6 +23,12 @@ def load_projects():
     with open(PROJECTS_FILE, 'r') as f:
         return json.load(f)
 
+# Pre-encoded SSE frames, shared by every connection
+CONNECTED_FRAME = f"data: {json.dumps({'type': 'connection', 'status': 'connected'})}\n\n"
+PING_FRAME = f"data: {json.dumps({'type': 'ping'})}\n\n"
+
+heartbeat = HeartbeatScheduler(frame=PING_FRAME)
+
 # Create FastAPI app
 http_app = FastAPI(title="Northstar MCP Server", version="1.0.0")
 
@@ -47,7 +54,8 @@ async def root():
             "sse": "/sse",
             "tools": "/tools",
             "call": "/call"
-        }
+        },
+        "sse": heartbeat.stats()
     }
 
 @http_app.get("/mcp")
@@ -77,13 +85,18 @@ async def sse_endpoint(request: Request):
     SSE endpoint for OpenAI connector.
     """
     async def event_stream():
+        # Keepalives come from the shared heartbeat ticker instead of a per-connection loop
+        queue = asyncio.Queue(maxsize=1)
+        heartbeat.subscribe(queue)
         try:
-            yield f"data: {json.dumps({'type': 'connection', 'status': 'connected'})}\n\n"
+            yield CONNECTED_FRAME
             while True:
-                await asyncio.sleep(1)
-                yield f"data: {json.dumps({'type': 'ping'})}\n\n"
-        except asyncio.CancelledError:
-            yield f"data: {json.dumps({'type': 'connection', 'status': 'disconnected'})}\n\n"
+                frame = await queue.get()
+                if await request.is_disconnected():
+                    break
+                yield frame
+        finally:
+            heartbeat.unsubscribe(queue)
     
     return StreamingResponse(
         event_stream(),
@@ -0,0 +1,186 @@
+"""
+Cursor pagination and field projection for Resume MCP list results
+- `fields` keeps only the named keys of each record
+- `limit` caps the page size; `next_cursor` continues where the page ended
+- Results are cached on the first page so later pages don't recompute them;
+  a cursor only works for the tool that issued it and keeps the first page's
+  fields projection
+"""
+import base64
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tracing import annotate
+
+# How long a paged result stays available for follow-up cursors (seconds)
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "600"))
+
+# Max number of paged results kept at once
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "64"))
+
+# JSON schema fragments for tool inputs
+FIELDS_PROPERTY = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only return these fields (projection)",
+    },
+}
+
+PAGINATION_PROPERTIES = {
+    **FIELDS_PROPERTY,
+    "limit": {
+        "type": "integer",
+        "description": "Maximum number of records to return",
+    },
+    "cursor": {
+        "type": "string",
+        "description": "Opaque next_cursor from a previous page",
+    },
+}
+
+
+class PaginationError(ValueError):
+    """Invalid pagination arguments or an expired cursor."""
+
+
+class ResultCache:
+    """LRU of computed results (records plus page context) with a TTL, addressed by opaque keys."""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, entry: Dict[str, Any]) -> str:
+        """Store a result entry ({"records", ...}) and return its key."""
+        key = secrets.token_urlsafe(9)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, entry)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Fetch a live result entry, or None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                annotate("cache.result", "miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        annotate("cache.result", "hit")
+        return entry[1]
+
+
+result_cache = ResultCache()
+
+
+def encode_cursor(key: str, offset: int) -> str:
+    """Encode a cache key and offset as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{key}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor produced by encode_cursor()."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, _, offset = base64.urlsafe_b64decode(padded.encode()).decode().rpartition(":")
+        return key, int(offset)
+    except Exception:
+        raise PaginationError("Invalid cursor")
+
+
+def parse_fields(fields: Any) -> Optional[List[str]]:
+    """Accept fields as a list or a comma-separated string."""
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if not isinstance(fields, list):
+        raise PaginationError("fields must be a list of field names")
+    return [str(field).strip() for field in fields if str(field).strip()]
+
+
+def project(record: Any, fields: Optional[List[str]]) -> Any:
+    """Keep only the requested keys of a dict record."""
+    if not fields or not isinstance(record, dict):
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def paginate(
+    list_key: str,
+    compute: Callable[[], List[Any]],
+    fields: Any = None,
+    limit: Any = None,
+    cursor: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+    scope: str = ""
+) -> Dict[str, Any]:
+    """
+    Build one page of a list result.
+
+    compute() runs only for the first page; later pages are sliced from the
+    cached list named by the cursor. The cached entry remembers scope (the
+    tool name), list_key, fields and extra: a cursor from another scope is
+    rejected, and later pages keep the first page's projection unless fields
+    is given again. Without limit/cursor the whole list is returned in the
+    same shape as before ({list_key: [...], "count": n}).
+    """
+    fields = parse_fields(fields)
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise PaginationError("limit must be an integer")
+        if limit < 1:
+            raise PaginationError("limit must be at least 1")
+
+    key = None
+    offset = 0
+    if cursor:
+        key, offset = decode_cursor(cursor)
+        entry = result_cache.get(key)
+        if entry is None:
+            raise PaginationError("Cursor expired or unknown; repeat the call without a cursor")
+        if entry["scope"] != scope or entry["list_key"] != list_key:
+            raise PaginationError("Cursor belongs to another tool; pass it back to the tool that returned it")
+        records = entry["records"]
+        if fields is None:
+            fields = entry["fields"]
+        extra = {**entry["extra"], **(extra or {})}
+    else:
+        records = compute()
+
+    end = len(records) if limit is None else offset + limit
+    page = [project(record, fields) for record in records[offset:end]]
+    result = {list_key: page, "count": len(page)}
+    if extra:
+        result.update(extra)
+
+    if limit is not None or cursor:
+        result["total"] = len(records)
+        next_cursor = None
+        if end < len(records):
+            if key is None:
+                key = result_cache.put({
+                    "records": records,
+                    "scope": scope,
+                    "list_key": list_key,
+                    "fields": fields,
+                    "extra": dict(extra or {}),
+                })
+            next_cursor = encode_cursor(key, end)
+        result["next_cursor"] = next_cursor
+    return result
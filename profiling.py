@@ -0,0 +1,148 @@
+"""
+Owner-only on-demand request profiling for Resume MCP
+- Add `X-Profile: 1` or `?profile=1` to a /mcp, /call or /api request
+- Only honoured for the owner API key (auth_middleware.is_owner_key); public
+  keys and spoofable SSO headers are ignored
+- The request runs under cProfile, including the scheduler's worker threads,
+  and a .pstats file plus a text summary are stored under PROFILE_DIR
+  (the event-loop profiler also sees other requests interleaved with it)
+- Requests without the flag skip all of this after a prefix/bytes check
+"""
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from fastapi import Request
+
+from auth_middleware import is_owner_key
+
+# Where profiles are written (the newest PROFILE_KEEP are kept)
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "/tmp/resume-mcp-profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+
+# Rows in the text summary
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "40"))
+
+PROFILED_PREFIXES = ("/mcp", "/call", "/api")
+
+_active: ContextVar[Optional["ProfileRun"]] = ContextVar("resume_mcp_profile", default=None)
+
+# cProfile allows one active profiler per thread, so profiled requests run one at a time
+_lock = threading.Lock()
+
+
+class ProfileRun:
+    """Profilers collected for one request (event loop + worker threads)."""
+
+    def __init__(self, profile_id: str):
+        self.profile_id = profile_id
+        self.profiles: List[cProfile.Profile] = []
+
+    def save(self) -> Path:
+        """Merge all profilers and write <id>.pstats and <id>.txt."""
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(self.profiles[0])
+        for profile in self.profiles[1:]:
+            stats.add(profile)
+        path = PROFILE_DIR / f"{self.profile_id}.pstats"
+        stats.dump_stats(str(path))
+
+        summary = io.StringIO()
+        pstats.Stats(str(path), stream=summary).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        path.with_suffix(".txt").write_text(summary.getvalue())
+        _prune()
+        return path
+
+
+def _prune():
+    """Keep only the newest PROFILE_KEEP profiles."""
+    profiles = sorted(PROFILE_DIR.glob("*.pstats"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in profiles[PROFILE_KEEP:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".txt").unlink(missing_ok=True)
+
+
+def call(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run fn(*args), under its own profiler if the calling request is being profiled.
+
+    Used by the scheduler so work on its worker threads shows up in the profile.
+    """
+    run = _active.get()
+    if run is None:
+        return fn(*args)
+    profile = cProfile.Profile()
+    run.profiles.append(profile)
+    return profile.runcall(fn, *args)
+
+
+def profile_path(profile_id: str, suffix: str = ".txt") -> Optional[Path]:
+    """Path of a stored profile, or None (ids are checked so paths can't escape PROFILE_DIR)."""
+    if not profile_id.replace("-", "").replace("_", "").isalnum():
+        return None
+    path = PROFILE_DIR / f"{profile_id}{suffix}"
+    return path if path.exists() else None
+
+
+def _flag_present(scope) -> bool:
+    if b"profile=" in scope.get("query_string", b""):
+        return True
+    return any(key == b"x-profile" for key, _ in scope.get("headers", []))
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles flagged owner requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(PROFILED_PREFIXES) or not _flag_present(scope):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        flag = request.headers.get("x-profile") or request.query_params.get("profile", "")
+        if flag.lower() in ("", "0", "false") or not is_owner_key(request):
+            # Public callers can't trigger profiling; the flag is simply ignored
+            await self.app(scope, receive, send)
+            return
+
+        if not _lock.acquire(blocking=False):
+            await self.app(scope, receive, _with_header(send, b"busy"))
+            return
+
+        request_id = scope.get("state", {}).get("request_id") or f"{time.time_ns():x}"
+        run = ProfileRun(re.sub(r"[^\w-]", "_", request_id))
+        token = _active.set(run)
+        profile = cProfile.Profile()
+        run.profiles.append(profile)
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, _with_header(send, run.profile_id.encode("latin-1")))
+            finally:
+                profile.disable()
+        finally:
+            _active.reset(token)
+            _lock.release()
+        await asyncio.get_running_loop().run_in_executor(None, run.save)
+
+
+def _with_header(send, value: bytes):
+    """Wrap send to add an X-Profile-Id header to the response."""
+
+    async def send_wrapper(message):
+        if message["type"] == "http.response.start":
+            message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", value)]
+        await send(message)
+
+    return send_wrapper
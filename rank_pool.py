@@ -0,0 +1,112 @@
+"""
+Process pool for ranking chunks in Resume MCP
+- The server runs one event-loop process, so /sse sessions, cursors, ranking
+  jobs and cancellation tokens stay in one place; the CPU-bound part of a
+  ranking (filtering and scoring a chunk of jobs) runs on RANK_PROCESSES
+  worker processes instead, so concurrent rankings use every core
+- The pool is forked once the data is loaded, so the children inherit the
+  job index and compiled matchers copy-on-write and only row positions and
+  scored rows cross the process boundary
+- Scheduler threads wait on their chunk with the GIL released; priorities,
+  queue limits, deadlines and cancellation work as before (between chunks)
+- RANK_PROCESSES=0, a platform without fork, or a pool that fails to start
+  or breaks scores chunks on the calling thread instead
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import match_rank
+
+logger = logging.getLogger(__name__)
+
+# Processes scoring ranking chunks (default one per CPU; 0 scores on the calling thread)
+RANK_PROCESSES = int(os.getenv("RANK_PROCESSES") or os.cpu_count() or 1)
+
+Positions = Union[slice, Sequence[int]]
+
+
+def score_rows(jobs_file: str, resume_file: str, rulebook_file: str, positions: Positions) -> Tuple[Any, Any]:
+    """Filter and score the given rows of the job index; returns match_rank.score_chunk's (ranked, discarded)."""
+    jobs = match_rank.load_jobs(jobs_file)
+    resume = match_rank.load_resume(resume_file)
+    rulebook = match_rank.load_rulebook(rulebook_file)
+    if not resume or not rulebook:
+        raise ValueError("Resume or rulebook not found")
+    return match_rank.score_chunk(jobs.iloc[positions], resume, rulebook)
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+class RankPool:
+    """Forked worker processes that score ranking chunks, with an in-thread fallback."""
+
+    def __init__(self, processes: int = RANK_PROCESSES):
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.chunks = 0
+        self.fallbacks = 0
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self):
+        """
+        Fork the worker processes (once; call after the data is loaded).
+
+        Does nothing with processes < 1; a failure to start is logged and
+        chunks keep running on the calling thread.
+        """
+        if self._executor is not None or self.processes < 1:
+            return
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            logger.warning("Ranking process pool needs fork; scoring chunks on threads")
+            return
+        try:
+            executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=context)
+            # With fork every process is started on the first submit: do that now, not mid-request
+            executor.submit(_pid).result(timeout=60)
+        except Exception as e:
+            logger.warning("Ranking process pool failed to start (%s); scoring chunks on threads", e)
+            return
+        self._executor = executor
+
+    def shutdown(self):
+        """Stop the worker processes; later chunks run on the calling thread."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def score(self, jobs_file: str, resume_file: str, rulebook_file: str, positions: Positions) -> Tuple[Any, Any]:
+        """score_rows() in a pool process, or on this thread if the pool isn't running."""
+        executor = self._executor
+        if executor is not None:
+            try:
+                result = executor.submit(score_rows, jobs_file, resume_file, rulebook_file, positions).result()
+                self.chunks += 1
+                return result
+            except BrokenProcessPool as e:
+                # A child died (e.g. OOM-killed); don't keep sending work to a dead pool
+                logger.warning("Ranking process pool broke (%s); scoring chunks on threads", e)
+                if self._executor is executor:
+                    self.shutdown()
+        self.fallbacks += 1
+        return score_rows(jobs_file, resume_file, rulebook_file, positions)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "processes": self.processes if self.running else 0,
+            "chunks": self.chunks,
+            "fallbacks": self.fallbacks,
+        }
+
+
+rank_pool = RankPool()
@@ -0,0 +1,163 @@
+"""
+Background ranking jobs for Resume MCP
+- match_jobs with async: true submits a job and returns its id immediately;
+  the ranking then runs chunk by chunk on the priority scheduler
+- get_ranking_status reports state and progress, get_ranking_result returns
+  the shortlist once the job is done
+- Jobs live in process memory (per worker); finished jobs are kept for
+  RANKING_JOB_TTL seconds and at most RANKING_JOB_MAX jobs are held at once,
+  oldest finished evicted first
+"""
+import asyncio
+import contextvars
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# How long a finished job (and its result) stays available (seconds)
+RANKING_JOB_TTL = float(os.getenv("RANKING_JOB_TTL", "900"))
+
+# Max jobs held at once, queued + running + finished
+RANKING_JOB_MAX = int(os.getenv("RANKING_JOB_MAX", "50"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobLimitReached(Exception):
+    """Raised when every slot is taken by a job that hasn't finished yet."""
+
+
+class JobNotFound(Exception):
+    """Raised for unknown or expired job ids."""
+
+
+class RankingJob:
+    """State of one background ranking."""
+
+    def __init__(self, arguments: Dict[str, Any]):
+        # Unguessable, like pagination cursors: knowing the id is what grants access
+        self.id = secrets.token_urlsafe(12)
+        self.arguments = arguments
+        self.state = QUEUED
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.progress: Dict[str, Any] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def mark_running(self):
+        """Record that the ranking got a scheduler slot (call from the scheduled work itself)."""
+        if self.state == QUEUED:
+            self.started = time.time()
+            self.state = RUNNING
+
+    @property
+    def done(self) -> bool:
+        return self.state in (DONE, FAILED)
+
+    def status(self) -> Dict[str, Any]:
+        """Everything but the result, for get_ranking_status."""
+        status = {
+            "job_id": self.id,
+            "state": self.state,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "progress": self.progress,
+        }
+        if self.error is not None:
+            status["error"] = self.error
+        if self.finished is not None:
+            status["expires_in"] = max(0, round(self.finished + RANKING_JOB_TTL - time.time()))
+        return status
+
+
+class RankingJobs:
+    """Registry of background jobs, bounded by count and TTL."""
+
+    def __init__(self, max_jobs: int = RANKING_JOB_MAX, ttl: float = RANKING_JOB_TTL):
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._jobs: "OrderedDict[str, RankingJob]" = OrderedDict()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _evict(self):
+        now = time.time()
+        for job in list(self._jobs.values()):
+            if job.finished is not None and now - job.finished > self.ttl:
+                del self._jobs[job.id]
+                self.evicted += 1
+        if len(self._jobs) < self.max_jobs:
+            return
+        finished = sorted((job for job in self._jobs.values() if job.finished is not None), key=lambda job: job.finished)
+        while len(self._jobs) >= self.max_jobs and finished:
+            del self._jobs[finished.pop(0).id]
+            self.evicted += 1
+
+    def submit(self, arguments: Dict[str, Any], runner: Callable[[RankingJob], Awaitable[Any]]) -> RankingJob:
+        """
+        Start runner(job) as a task on the running loop and return the job.
+
+        The runner calls job.mark_running() once its work actually starts,
+        reports progress by updating job.progress and returns the result; an
+        exception marks the job failed with its message.
+        """
+        self._evict()
+        if len(self._jobs) >= self.max_jobs:
+            raise JobLimitReached(f"Too many ranking jobs in progress ({self.max_jobs}), retry shortly")
+        job = RankingJob(arguments)
+        self._jobs[job.id] = job
+        self.submitted += 1
+        # A fresh context so the job doesn't report into the submitting request's trace
+        job.task = contextvars.Context().run(asyncio.get_running_loop().create_task, self._execute(job, runner))
+        return job
+
+    async def _execute(self, job: RankingJob, runner: Callable[[RankingJob], Awaitable[Any]]):
+        try:
+            job.result = await runner(job)
+            job.state = DONE
+            self.completed += 1
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.state = FAILED
+            self.failed += 1
+        finally:
+            job.finished = time.time()
+            job.task = None
+
+    def get(self, job_id: Any) -> RankingJob:
+        """The job with this id; raises JobNotFound if unknown or expired."""
+        self._evict()
+        job = self._jobs.get(job_id) if isinstance(job_id, str) else None
+        if job is None:
+            raise JobNotFound(f"Unknown or expired ranking job: {job_id}")
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        states = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in self._jobs.values():
+            states[job.state] += 1
+        return {
+            "held": len(self._jobs),
+            "states": states,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "evicted": self.evicted,
+        }
+
+
+ranking_jobs = RankingJobs()
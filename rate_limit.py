@@ -0,0 +1,227 @@
+"""
+Per-principal token-bucket rate limiting for Resume MCP
+- Each caller (owner, API key, or client IP) gets its own bucket
+- Tools cost different amounts: cheap reads cost 1, a full ranking much more
+- Buckets live in memory, or in Redis when RATE_LIMIT_REDIS_URL is set so all
+  workers share them
+- The owner is exempt by default, so a noisy public client can't starve it
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request
+
+from auth_middleware import get_auth_token, verify_owner_token
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Set to 0 to turn rate limiting off
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+
+# Bucket size (burst) and refill speed (tokens per second)
+RATE_LIMIT_CAPACITY = float(os.getenv("RATE_LIMIT_CAPACITY", "60"))
+RATE_LIMIT_REFILL_RATE = float(os.getenv("RATE_LIMIT_REFILL_RATE", "0.5"))
+
+# Owner requests are never throttled unless this is 0
+RATE_LIMIT_OWNER_EXEMPT = os.getenv("RATE_LIMIT_OWNER_EXEMPT", "1") == "1"
+
+# Max principals tracked in memory (least recently seen are dropped)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+
+# Proxies in front of the app that append to X-Forwarded-For (e.g. 1 behind
+# Vercel/Render/Railway); 0 keys anonymous callers on the socket peer address
+RATE_LIMIT_TRUSTED_PROXY_HOPS = int(os.getenv("RATE_LIMIT_TRUSTED_PROXY_HOPS", "0"))
+
+# Shared bucket storage across workers/instances (optional, needs `pip install redis`)
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+
+# Cost of one call per tool; anything not listed costs DEFAULT_TOOL_COST.
+# A ranking scores the whole job corpus; get_shortlist only reads its stored result.
+DEFAULT_TOOL_COST = 1
+TOOL_COSTS = {
+    "match_jobs": 20,
+    "check_job_match": 3,
+    "check_b_past_life_job_match": 3,
+}
+
+# Override costs with e.g. RATE_LIMIT_TOOL_COSTS="match_jobs=30,check_job_match=5"
+for _item in os.getenv("RATE_LIMIT_TOOL_COSTS", "").split(","):
+    _name, _, _cost = _item.partition("=")
+    if _name.strip() and _cost.strip():
+        TOOL_COSTS[_name.strip()] = float(_cost)
+
+OWNER_PRINCIPAL = "owner"
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a principal doesn't have enough tokens for a call."""
+
+    def __init__(self, principal: str, cost: float, retry_after: float):
+        super().__init__(f"Rate limit exceeded; retry in {math.ceil(retry_after)}s")
+        self.principal = principal
+        self.cost = cost
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After value (whole seconds, at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def request_principal(request: Request) -> str:
+    """
+    Identify who a request is charged to.
+
+    Only the owner API key maps to the owner principal (headers such as
+    x-vercel-user can be sent by anyone); other API keys are charged per key
+    (hashed, so raw keys never reach shared storage); anonymous callers per
+    client IP.
+    """
+    token = get_auth_token(request)
+    if token and verify_owner_token(token):
+        return OWNER_PRINCIPAL
+    if token:
+        return "key:" + hashlib.sha256(token.encode()).hexdigest()[:16]
+    return "ip:" + client_ip(request)
+
+
+def client_ip(request: Request) -> str:
+    """
+    Address of the caller.
+
+    X-Forwarded-For entries are client-controlled except the ones appended by
+    our own proxies, so only the entry RATE_LIMIT_TRUSTED_PROXY_HOPS from the
+    right is used; without trusted proxies it's the socket peer.
+    """
+    if RATE_LIMIT_TRUSTED_PROXY_HOPS > 0:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(hops) >= RATE_LIMIT_TRUSTED_PROXY_HOPS:
+            return hops[-RATE_LIMIT_TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+def tool_cost(tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> float:
+    """
+    Tokens one call of a tool costs.
+
+    Follow-up pages (a cursor) are served from the result cache, so they cost
+    the same as a cheap read regardless of the tool.
+    """
+    if arguments and arguments.get("cursor"):
+        return DEFAULT_TOOL_COST
+    return TOOL_COSTS.get(tool_name, DEFAULT_TOOL_COST)
+
+
+class MemoryBucketStore:
+    """Token buckets in this process, LRU-bounded by number of principals."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        """Take cost tokens if available; returns (allowed, seconds until they would be)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                allowed, wait = True, 0.0
+                tokens -= cost
+            else:
+                allowed, wait = False, (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, wait
+
+
+class RedisBucketStore:
+    """Token buckets in Redis, updated atomically by a Lua script."""
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    allowed = 1
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+    def __init__(self, url: str, prefix: str = "resume-mcp:ratelimit:"):
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(self.SCRIPT)
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        """Take cost tokens if available; returns (allowed, seconds until they would be)."""
+        allowed, wait = self._take(keys=[self.prefix + key], args=[capacity, rate, time.time(), cost])
+        return bool(allowed), float(wait)
+
+
+class RateLimiter:
+    """Charges tool calls against per-principal token buckets."""
+
+    def __init__(self, store=None, capacity: float = RATE_LIMIT_CAPACITY, rate: float = RATE_LIMIT_REFILL_RATE):
+        self.capacity = capacity
+        self.rate = rate
+        self.fallback = MemoryBucketStore()
+        self.store = store or self.fallback
+        self.limited = 0
+
+    def charge(self, principal: Optional[str], tool_name: str, arguments: Optional[Dict[str, Any]] = None):
+        """Charge a tool call to a principal; raises RateLimitExceeded when over the limit."""
+        if not RATE_LIMIT_ENABLED or principal is None:
+            return
+        if principal == OWNER_PRINCIPAL and RATE_LIMIT_OWNER_EXEMPT:
+            return
+        # A call costing more than the bucket holds would never be allowed
+        cost = min(tool_cost(tool_name, arguments), self.capacity)
+        try:
+            allowed, wait = self.store.take(principal, cost, self.capacity, self.rate)
+        except Exception as e:
+            # Shared storage down: keep limiting per process rather than failing calls
+            logger.warning("Rate limit store error, using in-memory buckets: %s", e)
+            allowed, wait = self.fallback.take(principal, cost, self.capacity, self.rate)
+        if not allowed:
+            self.limited += 1
+            raise RateLimitExceeded(principal, cost, wait)
+
+
+def _create_store():
+    """Redis store when configured and importable, else in-memory."""
+    if RATE_LIMIT_REDIS_URL:
+        if redis is None:
+            logger.warning("RATE_LIMIT_REDIS_URL is set but redis is not installed; using in-memory buckets")
+        else:
+            return RedisBucketStore(RATE_LIMIT_REDIS_URL)
+    return None
+
+
+rate_limiter = RateLimiter(_create_store())
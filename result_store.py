@@ -0,0 +1,291 @@
+"""
+Ranking result store for Resume MCP
+- The server keeps the latest shortlist and discards in a ResultStore instead
+  of writing shortlist.csv / discard.csv into the working directory
+- Backends (RESULT_STORE): memory (default, no filesystem writes), file (one
+  JSON file per result under RESULT_STORE_PATH) or sqlite (one database,
+  shared by every worker on the host)
+- CSV export is an opt-in sink (RESULT_CSV_EXPORT=1); the match_rank CLI
+  keeps writing its CSVs as before
+- Writes to the file/sqlite backends and sinks happen behind the request on a
+  background thread (temp file + rename); a newer result for the same name
+  replaces a queued one, and reads see pending results immediately. Failures
+  are logged and counted, never raised to the caller
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from file_cache import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+# memory | file | sqlite
+RESULT_STORE = os.getenv("RESULT_STORE", "memory").lower()
+
+# Directory (file) or database path (sqlite); defaults live under /tmp
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", "")
+
+# Also write shortlist.csv / discard.csv into RESULT_CSV_DIR after each ranking
+RESULT_CSV_EXPORT = int(os.getenv("RESULT_CSV_EXPORT", "0"))
+RESULT_CSV_DIR = os.getenv("RESULT_CSV_DIR", ".")
+
+# Persist on a background writer thread (0 writes inline, before the tool returns)
+RESULT_WRITE_BEHIND = int(os.getenv("RESULT_WRITE_BEHIND", "1"))
+
+SHORTLIST = "shortlist"
+DISCARD = "discard"
+
+Records = List[Dict[str, Any]]
+
+
+def _records(df) -> Records:
+    # to_json turns NaN into null, so stored records are plain JSON
+    return json.loads(df.to_json(orient="records"))
+
+
+class MemoryBackend:
+    """Latest results in process memory (per worker)."""
+
+    persistent = False
+
+    def __init__(self):
+        self._frames: Dict[str, Any] = {}
+
+    def put(self, name: str, df):
+        self._frames[name] = df
+
+    def get(self, name: str) -> Optional[Records]:
+        df = self._frames.get(name)
+        return None if df is None else _records(df)
+
+
+class FileBackend:
+    """One <name>.json per result, replaced atomically."""
+
+    persistent = True
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def put(self, name: str, df):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.directory / f"{name}.json", df.to_json(orient="records").encode("utf-8"))
+
+    def get(self, name: str) -> Optional[Records]:
+        try:
+            return json.loads((self.directory / f"{name}.json").read_bytes())
+        except FileNotFoundError:
+            return None
+
+
+class SQLiteBackend:
+    """Results as JSON rows in one SQLite database."""
+
+    persistent = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            with self._lock:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results (name TEXT PRIMARY KEY, updated REAL NOT NULL, records TEXT NOT NULL)"
+                )
+                conn.commit()
+                self._ready = True
+        return conn
+
+    def put(self, name: str, df):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (name, updated, records) VALUES (?, ?, ?)",
+                    (name, time.time(), df.to_json(orient="records")),
+                )
+        finally:
+            conn.close()
+
+    def get(self, name: str) -> Optional[Records]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT records FROM results WHERE name = ?", (name,)).fetchone()
+        finally:
+            conn.close()
+        return None if row is None else json.loads(row[0])
+
+
+class CsvExportSink:
+    """Opt-in export of each result to <directory>/<name>.csv, replaced atomically."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def put(self, name: str, df):
+        atomic_write_bytes(self.directory / f"{name}.csv", df.to_csv(index=False).encode("utf-8"))
+
+
+class BackgroundWriter:
+    """
+    One thread running queued writes, latest-wins per key.
+
+    submit() never blocks on I/O: a key already queued just gets its write
+    replaced, so the queue holds at most one write per result name.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, Callable[[], None]] = {}
+        self._keys: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def queued(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, key: str, write: Callable[[], None]):
+        with self._lock:
+            if self._thread is None:
+                # Started on first use so importing (or forking) never spawns a thread
+                self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            if key in self._tasks:
+                self.coalesced += 1
+            else:
+                self._keys.put(key)
+            self._tasks[key] = write
+
+    def _run(self):
+        while True:
+            key = self._keys.get()
+            with self._lock:
+                write = self._tasks.pop(key)
+                self._busy = True
+            try:
+                write()
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning("Result write %r failed: %s", key, e)
+            finally:
+                with self._lock:
+                    self._busy = False
+                    self._idle.notify_all()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until queued writes are done; False if timeout ran out first."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while self._tasks or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "written": self.written,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "last_error": self.last_error,
+        }
+
+
+class ResultStore:
+    """A backend for reads plus any export sinks written alongside it."""
+
+    def __init__(self, backend, sinks: Optional[List[Any]] = None, write_behind: bool = True):
+        self.backend = backend
+        self.sinks = list(sinks or [])
+        self.writer = BackgroundWriter() if write_behind else None
+        # Results handed to the writer but not yet persisted, so reads stay current
+        self._pending: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _targets(self) -> List[Any]:
+        return ([self.backend] if self.backend.persistent else []) + self.sinks
+
+    def put(self, name: str, df):
+        """Store a ranking output (a DataFrame) under name."""
+        if not self.backend.persistent:
+            self.backend.put(name, df)
+        targets = self._targets()
+        if not targets:
+            return
+        if self.writer is None:
+            for target in targets:
+                target.put(name, df)
+            return
+        with self._lock:
+            self._pending[name] = df
+        self.writer.submit(name, lambda: self._persist(name, df, targets))
+
+    def _persist(self, name: str, df, targets: List[Any]):
+        try:
+            errors = []
+            for target in targets:
+                try:
+                    target.put(name, df)
+                except Exception as e:
+                    errors.append(f"{type(target).__name__}: {e}")
+            if errors:
+                raise RuntimeError("; ".join(errors))
+        finally:
+            with self._lock:
+                if self._pending.get(name) is df:
+                    del self._pending[name]
+
+    def get(self, name: str) -> Optional[Records]:
+        """Records of the latest result stored under name, or None."""
+        with self._lock:
+            pending = self._pending.get(name)
+        if pending is not None and self.backend.persistent:
+            return _records(pending)
+        return self.backend.get(name)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait for background writes to finish (e.g. at shutdown)."""
+        return self.writer.flush(timeout) if self.writer is not None else True
+
+    def stats(self) -> Dict[str, Any]:
+        return self.writer.stats() if self.writer is not None else {"queued": 0, "written": 0, "failed": 0, "coalesced": 0, "last_error": None}
+
+
+def create_store(kind: str = RESULT_STORE, path: str = RESULT_STORE_PATH) -> ResultStore:
+    """Build the store configured by RESULT_STORE / RESULT_STORE_PATH / RESULT_CSV_EXPORT."""
+    if kind == "file":
+        backend = FileBackend(path or "/tmp/resume-mcp-results")
+    elif kind == "sqlite":
+        backend = SQLiteBackend(path or "/tmp/resume-mcp-results.db")
+    elif kind == "memory":
+        backend = MemoryBackend()
+    else:
+        raise ValueError(f"Unknown RESULT_STORE: {kind!r} (expected memory, file or sqlite)")
+    sinks = [CsvExportSink(RESULT_CSV_DIR)] if RESULT_CSV_EXPORT else []
+    return ResultStore(backend, sinks, write_behind=bool(RESULT_WRITE_BEHIND))
+
+
+results = create_store()
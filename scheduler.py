@@ -0,0 +1,139 @@
+"""
+Priority scheduling for CPU-bound tool calls in Resume MCP
+- Three classes: owner, public, and batch (JSON-RPC batches / background work)
+- Each class has its own worker threads, a concurrency limit and a bounded
+  wait queue, so a public traffic spike can't delay the owner's rankings
+- Cheap calls never enter the scheduler; they run immediately
+- Queue wait time is tracked per class
+"""
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import profiling
+from rate_limit import OWNER_PRINCIPAL
+from tracing import span
+
+OWNER_PRIORITY = "owner"
+PUBLIC_PRIORITY = "public"
+BATCH_PRIORITY = "batch"
+
+# Concurrent heavy calls per class
+SCHEDULER_OWNER_CONCURRENCY = int(os.getenv("SCHEDULER_OWNER_CONCURRENCY", "2"))
+SCHEDULER_PUBLIC_CONCURRENCY = int(os.getenv("SCHEDULER_PUBLIC_CONCURRENCY", "2"))
+SCHEDULER_BATCH_CONCURRENCY = int(os.getenv("SCHEDULER_BATCH_CONCURRENCY", "2"))
+
+# Calls allowed to wait per class before new ones are rejected
+SCHEDULER_OWNER_QUEUE = int(os.getenv("SCHEDULER_OWNER_QUEUE", "16"))
+SCHEDULER_PUBLIC_QUEUE = int(os.getenv("SCHEDULER_PUBLIC_QUEUE", "32"))
+SCHEDULER_BATCH_QUEUE = int(os.getenv("SCHEDULER_BATCH_QUEUE", "8"))
+
+
+class SchedulerBusy(Exception):
+    """Raised when a class's wait queue is full."""
+
+
+class PriorityClass:
+    """Concurrency limit, bounded wait queue and worker threads for one class."""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"sched-{name}")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def capacity(self) -> int:
+        """Calls this class can hold at once without rejecting: running plus queued."""
+        return self.concurrency + self.max_queue
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        # Created on first use so it binds to the serving event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        return self._slots
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Wait for a slot, then run fn(*args) on this class's threads."""
+        if self.slots.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise SchedulerBusy(f"Server busy: {self.name} queue is full, retry shortly")
+
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            with span("queue_wait", priority=self.name):
+                await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - queued_at
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+        self.running += 1
+        try:
+            # Copy the context so tracing spans (and an owner's profiler) follow fn onto the thread
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(self.executor, context.run, profiling.call, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait times for this class."""
+        started = self.completed + self.running
+        return {
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "queued": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_avg_ms": round(self.wait_total / started * 1000, 2) if started else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 2),
+        }
+
+
+class PriorityScheduler:
+    """Routes heavy calls to their class."""
+
+    def __init__(self):
+        self.classes = {
+            OWNER_PRIORITY: PriorityClass(OWNER_PRIORITY, SCHEDULER_OWNER_CONCURRENCY, SCHEDULER_OWNER_QUEUE),
+            PUBLIC_PRIORITY: PriorityClass(PUBLIC_PRIORITY, SCHEDULER_PUBLIC_CONCURRENCY, SCHEDULER_PUBLIC_QUEUE),
+            BATCH_PRIORITY: PriorityClass(BATCH_PRIORITY, SCHEDULER_BATCH_CONCURRENCY, SCHEDULER_BATCH_QUEUE),
+        }
+
+    def get(self, priority: str) -> PriorityClass:
+        """The class for a priority (unknown classes count as public)."""
+        return self.classes.get(priority, self.classes[PUBLIC_PRIORITY])
+
+    async def run(self, priority: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) in the given class (unknown classes count as public)."""
+        return await self.get(priority).run(fn, *args)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-class stats."""
+        return {name: cls.stats() for name, cls in self.classes.items()}
+
+
+def priority_for(principal: Optional[str], background: bool = False) -> str:
+    """Pick the class for a caller; the owner always gets its own class."""
+    if principal == OWNER_PRINCIPAL:
+        return OWNER_PRIORITY
+    return BATCH_PRIORITY if background else PUBLIC_PRIORITY
+
+
+scheduler = PriorityScheduler()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Build Snapshot - Precompile the server's data files into one artifact.
+
+Parses resume.json, rulebook.yaml, the B Past Life resume/rulebook,
+northstar_mcp/projects.json and jobs_clean.csv, compiles the resume and
+rulebook matchers, and writes data_snapshot.pkl. The server loads it in a
+single read at startup and falls back to the source files for anything that
+changed after the build, so rebuild whenever the data files change.
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import snapshot
+from file_cache import atomic_write_bytes
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def build_snapshot(output_file=snapshot.SNAPSHOT_FILE):
+    """Build the snapshot from the project root and write it atomically."""
+    if not output_file:
+        logger.error("SNAPSHOT_FILE is empty; nothing to build")
+        return False
+    
+    # Source paths are relative to the project root, like the server's
+    os.chdir(PROJECT_ROOT)
+    data = snapshot.build(PROJECT_ROOT)
+    atomic_write_bytes(output_file, data)
+    
+    contents = snapshot.read_snapshot(output_file)
+    logger.info(f"✓ Wrote {output_file} ({len(data) / 1024:.0f} KB)")
+    for rel, entry in contents["entries"].items():
+        logger.info(f"  {rel} ({entry['size']} bytes{', matcher' if 'matcher' in entry else ''})")
+    missing = [rel for rel in snapshot.SOURCES if rel not in contents["entries"]]
+    if missing:
+        logger.warning(f"Not found (loaded from source at runtime if added later): {', '.join(missing)}")
+    return True
+
+if __name__ == '__main__':
+    output_file = sys.argv[1] if len(sys.argv) > 1 else snapshot.SNAPSHOT_FILE
+    success = build_snapshot(output_file)
+    sys.exit(0 if success else 1)
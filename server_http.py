@@ -7,62 +7,89 @@ for OpenAI's connector interface.
 """
 
 from fastapi import FastAPI, Request, Depends
-from fastapi.responses import StreamingResponse, JSONResponse, HTMLResponse
+from fastapi.responses import StreamingResponse, HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-import json
+import os
 import asyncio
-from typing import Any, Dict
+import re
+import secrets
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
 from pathlib import Path
-from auth_middleware import require_auth, is_owner, require_owner
+from auth_middleware import require_auth, is_owner, require_owner_key
+from mcp_sessions import sessions, MCPSession, SessionClosed, SSE_HEADERS
+from sse_heartbeat import heartbeat
+from compression_middleware import CompressionMiddleware, body_cache
+from pagination import result_cache, paginate, project, parse_fields, PaginationError, FIELDS_PROPERTY, PAGINATION_PROPERTIES
+from http_cache import source_etag, not_modified, cache_headers
+from rate_limit import rate_limiter, request_principal, RateLimitExceeded
+from scheduler import scheduler, priority_for, SchedulerBusy, PUBLIC_PRIORITY, OWNER_PRIORITY, BATCH_PRIORITY
+from rank_pool import rank_pool
+from fast_json import FastJSONResponse, dumps, dumps_bytes, fragment, MCP_JSON_INDENT
+import metrics
+import tracing
+import profiling
+from slow_log import SlowLog
+from tracing import TIMINGS_PROPERTY
+from file_cache import load_cached, read_json, read_yaml
+from result_store import results, SHORTLIST
+from cancellation import inflight, CancelToken, DuplicateRequestId, RequestCancelled
+from ranking_jobs import ranking_jobs, RankingJob, JobLimitReached, JobNotFound, DONE as JOB_DONE, FAILED as JOB_FAILED
+from lazy_import import LazyModule
+import snapshot
 
-# Import matching functions directly
+# Import matching functions directly (match_rank imports pandas on first use,
+# so cold starts that only list tools or read the resume don't pay for it)
 from match_rank import (
     load_resume,
     load_rulebook,
-    match_and_rank,
+    iter_match_and_rank,
     filter_jobs,
-    rank_jobs
+    rank_jobs,
+    default_pipeline,
+    preload as preload_match_data
 )
-import pandas as pd
+pd = LazyModule("pandas")
 
-# Import B Past Life MCP functions
-import sys
+# Two-stage ranking (RANKING_RERANKER / RANKING_TOP_K), or None for plain keyword ranking
+ranking_pipeline = default_pipeline()
+
+# B Past Life MCP functions (b_past_life_mcp/match_rank.py, loaded on first use)
 B_PAST_LIFE_DIR = Path(__file__).parent / "b_past_life_mcp"
 B_PAST_LIFE_RESUME_FILE = B_PAST_LIFE_DIR / "resume.json"
 B_PAST_LIFE_RULEBOOK_FILE = B_PAST_LIFE_DIR / "rulebook.yaml"
 
-if str(B_PAST_LIFE_DIR) not in sys.path:
-    sys.path.insert(0, str(B_PAST_LIFE_DIR))
-try:
-    # Import from b_past_life_mcp/match_rank.py
+def _load_b_past_life_match_rank():
     import importlib.util
     spec = importlib.util.spec_from_file_location("b_past_life_match_rank", B_PAST_LIFE_DIR / "match_rank.py")
-    b_past_life_match_rank = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(b_past_life_match_rank)
-    
-    # Create wrapper functions that use absolute paths
-    def load_b_past_life_resume():
-        """Load B Past Life resume from correct path."""
-        with open(B_PAST_LIFE_RESUME_FILE, 'r') as f:
-            return json.load(f)
-    
-    def load_b_past_life_rulebook():
-        """Load B Past Life rulebook from correct path."""
-        import yaml
-        with open(B_PAST_LIFE_RULEBOOK_FILE, 'r') as f:
-            return yaml.safe_load(f)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+b_past_life_match_rank = LazyModule("b_past_life_match_rank", _load_b_past_life_match_rank)
+
+def load_b_past_life_resume():
+    """Load B Past Life resume from correct path."""
+    return load_cached(B_PAST_LIFE_RESUME_FILE, read_json)
+
+def load_b_past_life_rulebook():
+    """Load B Past Life rulebook from correct path."""
+    return load_cached(B_PAST_LIFE_RULEBOOK_FILE, read_yaml)
+
+# Tech resume sources (relative to the working directory, like match_rank's loaders)
+RESUME_FILE = Path("resume.json")
+RULEBOOK_FILE = Path("rulebook.yaml")
+JOBS_FILE = Path("jobs_clean.csv")
+
+def preload():
+    """
+    Load the job index and compile the resume/rulebook matchers.
     
-    b_past_life_match_and_rank = b_past_life_match_rank.match_and_rank
-    b_past_life_filter_jobs = b_past_life_match_rank.filter_jobs
-    b_past_life_rank_jobs = b_past_life_match_rank.rank_jobs
-except Exception as e:
-    print(f"Warning: Could not load B Past Life MCP functions: {e}")
-    import traceback
-    traceback.print_exc()
-    load_b_past_life_resume = None
-    load_b_past_life_rulebook = None
-    b_past_life_filter_jobs = None
-    b_past_life_rank_jobs = None
+    gunicorn.conf.py calls this in the master before forking, so workers
+    share the parsed data copy-on-write instead of each loading their own.
+    """
+    return preload_match_data(JOBS_FILE, RESUME_FILE, RULEBOOK_FILE)
 
 # Load Northstar projects data
 NORTHSTAR_PROJECTS_FILE = Path(__file__).parent / "northstar_mcp" / "projects.json"
@@ -70,12 +97,63 @@ NORTHSTAR_PROJECTS_FILE = Path(__file__).parent / "northstar_mcp" / "projects.js
 def load_northstar_projects():
     """Load Northstar projects data."""
     if NORTHSTAR_PROJECTS_FILE.exists():
-        with open(NORTHSTAR_PROJECTS_FILE, 'r') as f:
-            return json.load(f)
+        return load_cached(NORTHSTAR_PROJECTS_FILE, read_json)
     return None
 
+# Parsed data from data_snapshot.pkl (scripts/build_snapshot.py), one read at
+# startup; anything changed since the build is parsed from source as before
+snapshot.install()
+
+# Startup warmup progress, reported by /readyz
+warmup_state: Dict[str, Any] = {"ready": False, "duration_ms": None, "loaded": {}, "error": None}
+
+def warmup():
+    """
+    Load and compile every data source, then score one dummy job.
+    
+    Runs once per worker at startup so the first real request doesn't pay
+    for parsing the files or for pandas' first-use overhead.
+    """
+    loaded = preload()
+    projects = load_northstar_projects()
+    loaded["projects"] = len(projects["projects"]) if projects else 0
+    loaded["b_past_life"] = bool(load_b_past_life_resume() and load_b_past_life_rulebook())
+    b_past_life_match_rank.load()
+    resume = load_resume()
+    rulebook = load_rulebook()
+    if resume and rulebook:
+        keywords = rulebook.get("positive_keywords") or ["engineer"]
+        _check_job_match(f"{keywords[0]} engineer", "warmup", "", resume, rulebook, filter_jobs, rank_jobs)
+    loaded["snapshot"] = snapshot.status["source"]
+    snapshot.refresh_copy()
+    return loaded
+
+async def _run_warmup():
+    started = time.perf_counter()
+    try:
+        warmup_state["loaded"] = await asyncio.get_running_loop().run_in_executor(None, warmup)
+    except Exception as e:
+        # Stays not-ready: an instance that couldn't load its data shouldn't get traffic
+        warmup_state["error"] = f"{type(e).__name__}: {e}"
+        print(f"Warning: startup warmup failed: {e}")
+    # Forked after the data is loaded so the scoring processes share it copy-on-write
+    rank_pool.start()
+    warmup_state["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    warmup_state["ready"] = warmup_state["error"] is None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the warmup in the background so /healthz answers while it runs; flush result writes on shutdown."""
+    slow_requests.start()
+    task = asyncio.create_task(_run_warmup())
+    yield
+    task.cancel()
+    rank_pool.shutdown()
+    # Let queued result writes land before the worker exits
+    await asyncio.get_running_loop().run_in_executor(None, results.flush)
+
 # Create FastAPI app for HTTP
-http_app = FastAPI(title="Resume MCP HTTP Server", version="1.0.0")
+http_app = FastAPI(title="Resume MCP HTTP Server", version="1.0.0", default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # CORS for OpenAI connector
 http_app.add_middleware(
@@ -84,12 +162,48 @@ http_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Mcp-Session-Id"],
 )
 
+# Negotiated gzip/brotli/zstd for large JSON bodies (streams pass through)
+http_app.add_middleware(CompressionMiddleware)
+
+# Owner-only ?profile=1 / X-Profile: 1 (inside tracing so profiles are named by request id)
+http_app.add_middleware(profiling.ProfilingMiddleware)
+
+# Per-route counters for /metrics (outside CORS, compression and profiling, so latency
+# includes compression; only tracing, added next, wraps it)
+http_app.add_middleware(metrics.MetricsMiddleware, route_paths=lambda: [route.path for route in http_app.routes])
+
+# One trace per request, keyed by X-Request-ID (exported when TRACE_EXPORT is set)
+http_app.add_middleware(tracing.TracingMiddleware)
+
+# Tool calls and requests over SLOW_REQUEST_THRESHOLD_MS, with their stage timings
+slow_requests = SlowLog(corpus_size=lambda: metrics.corpus_size(str(JOBS_FILE)))
+tracing.add_finish_hook(slow_requests.check_request)
+
+@http_app.get("/healthz")
+async def healthz():
+    """Liveness probe: the process is up and its event loop responds (no I/O, no auth)."""
+    return FastJSONResponse({"status": "ok"})
+
+@http_app.get("/readyz")
+async def readyz():
+    """Readiness probe: 503 until the startup warmup has finished, and for good if it failed."""
+    if warmup_state["error"] is not None:
+        return FastJSONResponse({"status": "failed", **warmup_state}, status_code=503)
+    if not warmup_state["ready"]:
+        return FastJSONResponse({"status": "warming"}, status_code=503)
+    return FastJSONResponse({"status": "ready", **warmup_state})
+
 @http_app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     """Recruiter-friendly web interface (public access)."""
     # Public access allowed - no auth required for web UI
+    etag = source_etag([RESUME_FILE], "root")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     resume = load_resume()
     if not resume:
         return HTMLResponse("<h1>Resume not found</h1>", status_code=404)
@@ -304,7 +418,905 @@ async def root(request: Request):
     </body>
     </html>
     """
-    return HTMLResponse(html)
+    return HTMLResponse(html, headers=cache_headers(etag))
+
+# Combined tools from Resume MCP, B Past Life MCP, and Northstar MCP
+MCP_TOOLS = [
+    # Resume MCP tools (Tech Resume)
+    {
+        "name": "get_resume_info",
+        "description": "Get full tech resume information including skills, projects, experience, and target roles",
+        "inputSchema": {
+            "type": "object",
+            "properties": {**FIELDS_PROPERTY},
+        },
+    },
+    {
+        "name": "match_jobs",
+        "description": "Match and rank jobs from jobs_clean.csv against the tech resume. Returns top N matches.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "top_n": {
+                    "type": "integer",
+                    "description": "Number of top jobs to return (default: 5)",
+                    "default": 5,
+                },
+                "stream": {
+                    "type": "boolean",
+                    "description": "Send progress and partial top-N results as notifications/message while scoring (SSE sessions only)",
+                    "default": False,
+                },
+                "deadline_ms": {
+                    "type": "integer",
+                    "description": "Time budget: score the newest jobs first and stop when it runs out, returning the best matches so far with partial: true and scanned_fraction",
+                },
+                "async": {
+                    "type": "boolean",
+                    "description": "Return a job_id immediately and rank in the background; poll get_ranking_status, then fetch get_ranking_result",
+                    "default": False,
+                },
+                **PAGINATION_PROPERTIES,
+                **TIMINGS_PROPERTY,
+            },
+        },
+    },
+    {
+        "name": "get_ranking_status",
+        "description": "State and progress of a background ranking started with match_jobs async: true",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "job_id returned by match_jobs",
+                },
+            },
+            "required": ["job_id"],
+        },
+    },
+    {
+        "name": "get_ranking_result",
+        "description": "Shortlist of a finished background ranking (results expire after a while)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "job_id returned by match_jobs",
+                },
+                **PAGINATION_PROPERTIES,
+            },
+            "required": ["job_id"],
+        },
+    },
+    {
+        "name": "get_shortlist",
+        "description": "Get the latest shortlist from match_jobs (top matched jobs for tech resume)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {**PAGINATION_PROPERTIES, **TIMINGS_PROPERTY},
+        },
+    },
+    {
+        "name": "get_skills",
+        "description": "Get skills from tech resume, optionally filtered by minimum weight",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "min_weight": {
+                    "type": "integer",
+                    "description": "Minimum skill weight to include (1-10)",
+                    "default": 0,
+                },
+            },
+        },
+    },
+    {
+        "name": "check_job_match",
+        "description": "Check how well a specific job description matches the tech resume",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "job_title": {
+                    "type": "string",
+                    "description": "Job title",
+                },
+                "job_description": {
+                    "type": "string",
+                    "description": "Job description text",
+                },
+                "company": {
+                    "type": "string",
+                    "description": "Company name (optional)",
+                    "default": "",
+                },
+                **TIMINGS_PROPERTY,
+            },
+            "required": ["job_title", "job_description"],
+        },
+    },
+    # B Past Life MCP tools (VC/PE/Finance Resume)
+    {
+        "name": "get_b_past_life_resume_info",
+        "description": "Get B's past life resume (VC/PE/Finance) information including experience, skills, and achievements",
+        "inputSchema": {
+            "type": "object",
+            "properties": {**FIELDS_PROPERTY},
+        },
+    },
+    {
+        "name": "check_b_past_life_job_match",
+        "description": "Check how well a job matches B's past life resume (VC/PE/Finance roles)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "job_title": {
+                    "type": "string",
+                    "description": "Job title",
+                },
+                "job_description": {
+                    "type": "string",
+                    "description": "Job description text",
+                },
+                "company": {
+                    "type": "string",
+                    "description": "Company name (optional)",
+                    "default": "",
+                },
+                **TIMINGS_PROPERTY,
+            },
+            "required": ["job_title", "job_description"],
+        },
+    },
+    # Northstar MCP tools (Project Registry)
+    {
+        "name": "get_northstar_info",
+        "description": "Get overview of Northstar suite including brand, mission, and total projects",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+        },
+    },
+    {
+        "name": "list_projects",
+        "description": "List all 5 Northstar projects with basic information",
+        "inputSchema": {
+            "type": "object",
+            "properties": {**PAGINATION_PROPERTIES},
+        },
+    },
+    {
+        "name": "get_project",
+        "description": "Get detailed information about a specific project by ID (1-5)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "project_id": {
+                    "type": "integer",
+                    "description": "Project ID (1-5)",
+                },
+            },
+            "required": ["project_id"],
+        },
+    },
+    {
+        "name": "get_project_by_name",
+        "description": "Get project information by name (e.g., 'Resume MCP', 'Mocktailverse')",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "project_name": {
+                    "type": "string",
+                    "description": "Project name or partial name",
+                },
+            },
+            "required": ["project_name"],
+        },
+    },
+    {
+        "name": "get_shared_assets",
+        "description": "Get list of shared assets across all Northstar projects",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+        },
+    },
+    {
+        "name": "get_ai_agent_plan",
+        "description": "Get AI agent orchestration plan (short-term and long-term)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+        },
+    },
+    {
+        "name": "search_projects",
+        "description": "Search projects by keyword in name, purpose, stack, or MCP role",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "keyword": {
+                    "type": "string",
+                    "description": "Search keyword",
+                },
+                **PAGINATION_PROPERTIES,
+            },
+            "required": ["keyword"],
+        },
+    },
+]
+
+TOOL_NAMES = frozenset(tool["name"] for tool in MCP_TOOLS)
+
+# The tool list only changes with a deploy
+TOOLS_ETAG = source_etag([], "tools", dumps(MCP_TOOLS))
+
+# Tools that parse CSVs or score jobs with pandas; these run on the priority
+# scheduler's threads so they don't block the event loop. Everything else is a
+# cheap lookup that runs inline and never waits behind a ranking.
+CPU_BOUND_TOOLS = {
+    "match_jobs",
+    "get_shortlist",
+    "check_job_match",
+    "check_b_past_life_job_match",
+}
+
+NORTHSTAR_TOOLS = {
+    "get_northstar_info",
+    "list_projects",
+    "get_project",
+    "get_project_by_name",
+    "get_shared_assets",
+    "get_ai_agent_plan",
+    "search_projects",
+}
+
+# Protocol versions this server can speak, newest first
+SUPPORTED_PROTOCOL_VERSIONS = ["2025-06-18", "2025-03-26", "2024-11-05"]
+DEFAULT_PROTOCOL_VERSION = "2024-11-05"
+
+# First protocol version whose clients understand structuredContent in tool results
+STRUCTURED_CONTENT_VERSION = "2025-06-18"
+
+# JSON-RPC error code for tool calls rejected by the rate limiter (server-defined range)
+RATE_LIMIT_ERROR_CODE = -32029
+
+# Upper bound on the number of messages accepted in one JSON-RPC batch
+MCP_MAX_BATCH_SIZE = int(os.getenv("MCP_MAX_BATCH_SIZE", "50"))
+
+class MCPToolError(Exception):
+    """Tool failure reported to the client as a JSON-RPC error (or HTTP status on /call)."""
+
+    def __init__(self, message: str, code: int = -32000, status: int = 500):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+
+def _tool_content(data: Any, structured: bool = False) -> Dict[str, Any]:
+    """
+    Wrap tool output in an MCP text content block.
+    
+    The data is encoded once; with structured=True the same bytes are also
+    embedded as structuredContent (objects only, per the MCP spec).
+    """
+    encoded = dumps_bytes(data, MCP_JSON_INDENT)
+    result = {
+        "content": [
+            {
+                "type": "text",
+                "text": encoded.decode("utf-8")
+            }
+        ]
+    }
+    if structured and isinstance(data, dict):
+        result["structuredContent"] = fragment(encoded)
+    return result
+
+def _check_job_match(job_title, job_description, company, resume, rulebook, filter_fn, rank_fn):
+    """Filter and score a single job description against a resume/rulebook pair."""
+    job_df = pd.DataFrame([{
+        "title": job_title,
+        "company": company,
+        "description": job_description,
+        "url": ""
+    }])
+    
+    with tracing.span("filter_jobs", jobs=1):
+        filtered_df, discarded_df = filter_fn(job_df, rulebook)
+    if len(filtered_df) == 0:
+        return {
+            "match": False,
+            "reason": "Job filtered out by rulebook",
+            "discard_reason": discarded_df.iloc[0].get("discard_reason", "Unknown") if len(discarded_df) > 0 else "No positive keyword matches"
+        }
+    
+    with tracing.span("rank_jobs", jobs=1):
+        ranked_df = rank_fn(filtered_df, resume, rulebook)
+    if len(ranked_df) == 0:
+        raise MCPToolError("Failed to rank job")
+    job_result = ranked_df.iloc[0].to_dict()
+    return {
+        "match": True,
+        "match_score": job_result.get("match_score", 0),
+        "matched_skills": job_result.get("matched_skills", ""),
+        "matched_projects": job_result.get("matched_projects", ""),
+        "positive_keyword_matches": job_result.get("positive_keyword_matches", 0)
+    }
+
+def _paginate(tool_name: str, list_key: str, compute: Callable[[], list], arguments: Dict[str, Any], extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Apply fields/limit/cursor arguments to a list-returning tool (cursors are bound to tool_name)."""
+    try:
+        return paginate(
+            list_key, compute,
+            fields=arguments.get("fields"),
+            limit=arguments.get("limit"),
+            cursor=arguments.get("cursor"),
+            extra=extra,
+            scope=tool_name
+        )
+    except PaginationError as e:
+        raise MCPToolError(str(e), code=-32602, status=400)
+
+def _project_fields(data: Dict[str, Any], arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a fields projection to a single-document tool result."""
+    try:
+        return project(data, parse_fields(arguments.get("fields")))
+    except PaginationError as e:
+        raise MCPToolError(str(e), code=-32602, status=400)
+
+def _rank_shortlist(
+    top_n: int,
+    notify: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    stream: bool = False,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[float] = None,
+    scan: Optional[Dict[str, Any]] = None,
+) -> list:
+    """
+    Run the ranking chunk by chunk and return the shortlist records.
+    
+    progress(scanned, total, message) is called after every chunk; with
+    stream=True, partial results also go out through notify. The cancel token
+    is checked between chunks (RequestCancelled), so an abandoned call stops
+    scoring and frees its scheduler thread. With a deadline the newest jobs
+    are scored first and scoring stops when it passes; scan then receives
+    partial and scanned_fraction.
+    """
+    if cancel is not None:
+        # It may have been cancelled while queued for a scheduler slot
+        cancel.check()
+    shortlist = None
+    try:
+        # Results go to the store; no CSVs are written on the request path (see RESULT_CSV_EXPORT)
+        for event in iter_match_and_rank(top_n=top_n, shortlist_file=None, discard_file=None, store=results, deadline=deadline, pipeline=ranking_pipeline, pool=rank_pool):
+            if event["event"] == "result":
+                shortlist = event["shortlist"]
+                if scan is not None and deadline is not None:
+                    scan.update(partial=event["partial"], scanned_fraction=event["scanned_fraction"])
+                if scan is not None and "pipeline" in event:
+                    scan["pipeline"] = event["pipeline"]
+                break
+            if cancel is not None:
+                cancel.check()
+            if event["event"] == "progress" and progress is not None:
+                progress(event["scanned"], event["total"], f"{event['passed']} jobs passed the rulebook")
+            if stream and notify:
+                notify("notifications/message", {"level": "info", "logger": "match_jobs", "data": event})
+    except (FileNotFoundError, ValueError) as e:
+        raise MCPToolError(f"Failed to match jobs: {e}")
+    if shortlist is None:
+        raise MCPToolError("Failed to match jobs")
+    # Everything is parsed by now; keep a fresh /tmp snapshot for the next cold start
+    snapshot.refresh_copy()
+    return shortlist
+
+def _deadline(arguments: Dict[str, Any], start: float) -> Optional[float]:
+    """time.monotonic() deadline from a deadline_ms argument, counted from start (None without one)."""
+    deadline_ms = arguments.get("deadline_ms")
+    if deadline_ms is None:
+        return None
+    if isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float)) or deadline_ms <= 0:
+        raise MCPToolError("deadline_ms must be a positive number of milliseconds", code=-32602, status=400)
+    return start + deadline_ms / 1000
+
+def _ranking_job(arguments: Dict[str, Any]) -> RankingJob:
+    try:
+        return ranking_jobs.get(arguments.get("job_id"))
+    except JobNotFound as e:
+        raise MCPToolError(str(e), code=-32602, status=404)
+
+def _submit_ranking_job(arguments: Dict[str, Any], session: Optional[MCPSession], priority: str) -> Dict[str, Any]:
+    """
+    Start a match_jobs ranking in the background and return its job status.
+    
+    Chunks are scheduled one at a time like the NDJSON stream, in the batch
+    class (the owner keeps its own), so interactive calls overtake the job.
+    A session that submitted the job gets progress and completion as
+    notifications/message.
+    """
+    top_n = arguments.get("top_n", 5)
+    deadline = _deadline(arguments, time.monotonic())
+    job_priority = priority if priority == OWNER_PRIORITY else BATCH_PRIORITY
+    
+    async def notify(job: RankingJob, data: Dict[str, Any]):
+        if session is None:
+            return
+        try:
+            await session.send({"jsonrpc": "2.0", "method": "notifications/message", "params": {
+                "level": "error" if job.state == JOB_FAILED else "info",
+                "logger": "match_jobs",
+                "data": {"job_id": job.id, **data},
+            }})
+        except SessionClosed:
+            pass
+    
+    def next_chunk(job: RankingJob, events):
+        # Runs on a scheduler thread, so the job only counts as running once it has a slot
+        job.mark_running()
+        return next(events, None)
+
+    async def run(job: RankingJob) -> list:
+        events = iter_match_and_rank(top_n=top_n, shortlist_file=None, discard_file=None, store=results, deadline=deadline, pipeline=ranking_pipeline, pool=rank_pool)
+        while True:
+            event = await scheduler.run(job_priority, next_chunk, job, events)
+            if event is None:
+                raise MCPToolError("Ranking ended without a result")
+            if event["event"] == "result":
+                if deadline is not None:
+                    job.progress = {**job.progress, "partial": event["partial"], "scanned_fraction": event["scanned_fraction"]}
+                if "pipeline" in event:
+                    job.progress = {**job.progress, "pipeline": event["pipeline"]}
+                snapshot.refresh_copy()
+                return event["shortlist"]
+            if event["event"] == "progress":
+                job.progress = {key: event[key] for key in ("scanned", "total", "passed") if key in event}
+            await notify(job, event)
+    
+    async def run_and_report(job: RankingJob) -> list:
+        try:
+            shortlist = await run(job)
+        except Exception as e:
+            job.state = JOB_FAILED
+            await notify(job, {"event": "failed", "error": str(e)})
+            raise
+        await notify(job, {"event": "done", "count": len(shortlist)})
+        return shortlist
+    
+    try:
+        job = ranking_jobs.submit({"top_n": top_n, "deadline_ms": arguments.get("deadline_ms")}, run_and_report)
+    except JobLimitReached as e:
+        raise MCPToolError(str(e), status=503)
+    return job.status()
+
+def run_mcp_tool(
+    tool_name: str,
+    arguments: Dict[str, Any],
+    notify: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[float] = None,
+) -> Any:
+    """
+    Execute an MCP tool synchronously and return its result data.
+    
+    notify(method, params), when given, sends a JSON-RPC notification to the
+    caller's session while the tool is still running; progress reports
+    notifications/progress for the call, and cancel stops long tools early.
+    deadline is when the call's deadline_ms budget runs out.
+    Raises MCPToolError for failures that should be reported to the client,
+    RequestCancelled when the call was cancelled.
+    """
+    if tool_name == "get_resume_info":
+        resume = load_resume()
+        if not resume:
+            raise MCPToolError("Resume file not found", status=404)
+        return _project_fields(resume, arguments)
+    
+    elif tool_name == "get_skills":
+        resume = load_resume()
+        if not resume:
+            raise MCPToolError("Resume file not found", status=404)
+        min_weight = arguments.get("min_weight", 0)
+        skills = {skill: weight for skill, weight in resume.get("skills", {}).items() if weight >= min_weight}
+        return {"skills": skills, "count": len(skills)}
+    
+    elif tool_name == "match_jobs":
+        top_n = arguments.get("top_n", 5)
+        if deadline is None:
+            deadline = _deadline(arguments, time.monotonic())
+        # Filled in by the ranking (first page only), so the page reports partial results
+        scan: Dict[str, Any] = {}
+        return _paginate(
+            tool_name,
+            "shortlist",
+            lambda: _rank_shortlist(top_n, notify, bool(arguments.get("stream")), progress, cancel, deadline, scan),
+            arguments,
+            extra=scan
+        )
+    
+    elif tool_name == "get_shortlist":
+        def read_shortlist():
+            shortlist = results.get(SHORTLIST)
+            if shortlist is not None:
+                return shortlist
+            # Fall back to a shortlist.csv written by the match_rank CLI
+            shortlist_file = Path("shortlist.csv")
+            if not shortlist_file.exists():
+                raise MCPToolError("Shortlist not found. Run match_jobs first.", status=404)
+            return pd.read_csv(shortlist_file).to_dict(orient="records")
+        return _paginate(tool_name, "shortlist", read_shortlist, arguments)
+    
+    elif tool_name == "get_ranking_status":
+        return _ranking_job(arguments).status()
+    
+    elif tool_name == "get_ranking_result":
+        job = _ranking_job(arguments)
+        if job.state == JOB_FAILED:
+            raise MCPToolError(f"Ranking job failed: {job.error}")
+        if job.state != JOB_DONE:
+            raise MCPToolError(f"Ranking job is still {job.state}; poll get_ranking_status", status=409)
+        scan = {key: job.progress[key] for key in ("partial", "scanned_fraction", "pipeline") if key in job.progress}
+        return _paginate(tool_name, "shortlist", lambda: job.result, arguments, extra={"job_id": job.id, **scan})
+    
+    elif tool_name == "check_job_match":
+        resume = load_resume()
+        rulebook = load_rulebook()
+        if not resume or not rulebook:
+            raise MCPToolError("Resume or rulebook not found")
+        return _check_job_match(
+            arguments.get("job_title", ""),
+            arguments.get("job_description", ""),
+            arguments.get("company", ""),
+            resume, rulebook, filter_jobs, rank_jobs
+        )
+    
+    # B Past Life MCP tools
+    elif tool_name == "get_b_past_life_resume_info":
+        resume = load_b_past_life_resume()
+        if not resume:
+            raise MCPToolError("B Past Life resume file not found", status=404)
+        return _project_fields(resume, arguments)
+    
+    elif tool_name == "check_b_past_life_job_match":
+        try:
+            b_past_life_match_rank.load()
+        except Exception as e:
+            print(f"Warning: Could not load B Past Life MCP functions: {e}")
+            raise MCPToolError("B Past Life MCP not available", status=503)
+        resume = load_b_past_life_resume()
+        rulebook = load_b_past_life_rulebook()
+        if not resume or not rulebook:
+            raise MCPToolError("B Past Life resume or rulebook not found")
+        return _check_job_match(
+            arguments.get("job_title", ""),
+            arguments.get("job_description", ""),
+            arguments.get("company", ""),
+            resume, rulebook, b_past_life_match_rank.filter_jobs, b_past_life_match_rank.rank_jobs
+        )
+    
+    # Northstar MCP tools
+    elif tool_name in NORTHSTAR_TOOLS:
+        projects_data = load_northstar_projects()
+        if not projects_data:
+            raise MCPToolError("Northstar projects data not found", status=404)
+        
+        if tool_name == "get_northstar_info":
+            return {
+                "brand": projects_data["brand"],
+                "total_projects": projects_data["total_projects"],
+                "mission": projects_data["mission"],
+                "author": projects_data["meta"]["author"],
+                "tone": projects_data["meta"]["tone"]
+            }
+        
+        elif tool_name == "list_projects":
+            def summarize_projects():
+                return [
+                    {
+                        "id": p["id"],
+                        "name": p["name"],
+                        "purpose": p["purpose"],
+                        "stack": p["stack"],
+                        "mcp_role": p["mcp_role"]
+                    }
+                    for p in projects_data["projects"]
+                ]
+            return _paginate(tool_name, "projects", summarize_projects, arguments)
+        
+        elif tool_name == "get_project":
+            project_id = arguments.get("project_id")
+            if not project_id or project_id < 1 or project_id > 5:
+                raise MCPToolError("project_id must be between 1 and 5", code=-32602, status=400)
+            
+            project = next((p for p in projects_data["projects"] if p["id"] == project_id), None)
+            if not project:
+                raise MCPToolError(f"Project {project_id} not found", status=404)
+            return project
+        
+        elif tool_name == "get_project_by_name":
+            project_name = arguments.get("project_name", "").lower()
+            if not project_name:
+                raise MCPToolError("project_name is required", code=-32602, status=400)
+            
+            matching = [
+                p for p in projects_data["projects"]
+                if project_name in p["name"].lower()
+            ]
+            if not matching:
+                raise MCPToolError(f"No project found matching '{project_name}'", status=404)
+            return matching[0] if len(matching) == 1 else matching
+        
+        elif tool_name == "get_shared_assets":
+            return {
+                "shared_assets": projects_data["shared_assets"],
+                "count": len(projects_data["shared_assets"])
+            }
+        
+        elif tool_name == "get_ai_agent_plan":
+            return projects_data["ai_agent_plan"]
+        
+        elif tool_name == "search_projects":
+            keyword = arguments.get("keyword", "").lower()
+            if not keyword:
+                raise MCPToolError("keyword is required", code=-32602, status=400)
+            
+            def find_projects():
+                matching = []
+                for project in projects_data["projects"]:
+                    search_text = f"{project['name']} {project['purpose']} {' '.join(project['stack'])} {project['mcp_role']}".lower()
+                    if keyword in search_text:
+                        matching.append(project)
+                return matching
+            return _paginate(tool_name, "projects", find_projects, arguments, extra={"keyword": keyword})
+    
+    raise MCPToolError(f"Unknown tool: {tool_name}", code=-32601, status=400)
+
+def _session_notifier(session: MCPSession, loop: asyncio.AbstractEventLoop) -> Callable[[str, Dict[str, Any]], None]:
+    """
+    Build a notify(method, params) callable for tools running on the thread pool.
+    
+    Each call blocks the worker until the session has room for the message, so
+    a slow reader throttles the tool instead of growing a buffer.
+    """
+    def notify(method: str, params: Dict[str, Any]):
+        future = asyncio.run_coroutine_threadsafe(
+            session.send({"jsonrpc": "2.0", "method": method, "params": params}), loop
+        )
+        try:
+            future.result()
+        except SessionClosed:
+            pass
+    return notify
+
+def _progress_notifier(notify: Callable[[str, Dict[str, Any]], None], progress_token: Any) -> Callable[[int, int, str], None]:
+    """Build a progress(done, total, message) callable sending notifications/progress for progress_token."""
+    def progress(done: int, total: int, message: str):
+        notify("notifications/progress", {"progressToken": progress_token, "progress": done, "total": total, "message": message})
+    return progress
+
+async def call_mcp_tool(
+    tool_name: str,
+    arguments: Dict[str, Any],
+    session: Optional[MCPSession] = None,
+    priority: str = PUBLIC_PRIORITY,
+    progress_token: Any = None,
+    cancel: Optional[CancelToken] = None,
+) -> Any:
+    """
+    Run a tool on the event loop, or through the priority scheduler if it is CPU-bound.
+    
+    Follow-up pages (a cursor) are slices of a cached result, so they skip the
+    scheduler queue even for heavy tools. With arguments["timings"], a dict
+    result gets a per-stage timing breakdown from the tool's trace span.
+    progress_token (from params._meta) turns on notifications/progress on the
+    caller's session. If the awaiting task is cancelled (e.g. the session
+    closed), the tool's cancel token is tripped so its thread stops too.
+    """
+    tool_span = None
+    cancel = cancel or CancelToken()
+    # The deadline_ms budget includes time spent waiting for a scheduler slot
+    deadline = _deadline(arguments, time.monotonic()) if tool_name == "match_jobs" else None
+    try:
+        with metrics.track_tool(tool_name, TOOL_NAMES), tracing.span(f"tool {tool_name}", tool=tool_name) as tool_span:
+            if tool_name == "match_jobs" and arguments.get("async"):
+                result = _submit_ranking_job(arguments, session, priority)
+            elif tool_name in CPU_BOUND_TOOLS and not arguments.get("cursor"):
+                notify = _session_notifier(session, asyncio.get_running_loop()) if session is not None else None
+                progress = _progress_notifier(notify, progress_token) if notify is not None and progress_token is not None else None
+                try:
+                    result = await scheduler.run(priority, run_mcp_tool, tool_name, arguments, notify, progress, cancel, deadline)
+                except SchedulerBusy as e:
+                    raise MCPToolError(str(e), status=503)
+                except asyncio.CancelledError:
+                    cancel.cancel("Caller went away")
+                    raise
+            else:
+                result = run_mcp_tool(tool_name, arguments)
+    finally:
+        slow_requests.check_tool(tool_name, arguments, tool_span)
+    if arguments.get("timings") and tool_span is not None and isinstance(result, dict):
+        result = {**result, "timings": tool_span.timings()}
+    return result
+
+def _rpc_error(request_id: Any, code: int, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a JSON-RPC error response."""
+    error = {
+        "code": code,
+        "message": message
+    }
+    if data is not None:
+        error["data"] = data
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": error
+    }
+
+def _rate_limited_response(e: RateLimitExceeded) -> FastJSONResponse:
+    """HTTP 429 for a rate-limited REST call."""
+    return FastJSONResponse(
+        {"error": str(e), "retry_after": int(e.retry_after_header)},
+        status_code=429,
+        headers={"Retry-After": e.retry_after_header}
+    )
+
+@http_app.exception_handler(RateLimitExceeded)
+async def rate_limit_exception_handler(request: Request, e: RateLimitExceeded):
+    return _rate_limited_response(e)
+
+def _cancel_scope(session: Optional[MCPSession], connection: Any) -> Any:
+    """Request ids are only unique per client: per session on /sse, per Mcp-Session-Id on /mcp."""
+    return ("session", session.id) if session is not None else ("connection", connection)
+
+# Mcp-Session-Id values are visible ASCII (Streamable HTTP transport)
+_MCP_SESSION_ID = re.compile(r"^[\x21-\x7e]{1,128}$")
+
+def _initializes(body: Any) -> bool:
+    """True if a /mcp payload (message or batch) contains an initialize request."""
+    messages = body if isinstance(body, list) else [body]
+    return any(isinstance(message, dict) and message.get("method") == "initialize" for message in messages)
+
+def mcp_connection(principal: Optional[str], session_id: Optional[str]) -> Any:
+    """
+    Cancellation scope for a /mcp POST.
+    
+    Request ids are scoped to the Mcp-Session-Id issued on initialize plus
+    the principal, so a notifications/cancelled sent as a separate request
+    (on any connection, through any proxy) reaches the call it names, and
+    callers sharing an API key can't cancel each other. Without a session id
+    nothing outside the payload can name its calls, so it gets its own scope.
+    """
+    if session_id:
+        return ("mcp-session", principal, session_id)
+    return ("mcp-request", object())
+
+async def handle_mcp_message(message: Any, session: Optional[MCPSession] = None, protocol_version: Optional[str] = None, principal: Optional[str] = None, background: bool = False, connection: Any = None) -> Optional[Dict[str, Any]]:
+    """
+    Handle a single JSON-RPC message.
+    
+    session is the SSE session the message arrived on, if any; protocol_version
+    is the version the client negotiated (session or MCP-Protocol-Version header).
+    principal is who tool calls are charged to for rate limiting; background
+    marks calls from a batch, which are scheduled behind interactive ones.
+    connection scopes request ids for cancellation on /mcp (see mcp_connection).
+    Returns the response object, or None for notifications (messages without an id).
+    """
+    if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+        return _rpc_error(None, -32600, "Invalid Request")
+    
+    method = message["method"]
+    request_id = message.get("id")
+    is_notification = "id" not in message
+    
+    if session is not None:
+        protocol_version = session.protocol_version or protocol_version
+        principal = session.principal
+    
+    # Handle initialize request (no auth needed for handshake)
+    if method == "initialize":
+        requested = (message.get("params") or {}).get("protocolVersion")
+        negotiated = requested if requested in SUPPORTED_PROTOCOL_VERSIONS else DEFAULT_PROTOCOL_VERSION
+        if session is not None:
+            session.protocol_version = negotiated
+        result = {
+            "protocolVersion": negotiated,
+            "capabilities": {
+                "tools": {
+                    "listChanged": True
+                }
+            },
+            "serverInfo": {
+                "name": "resume-mcp",
+                "version": "1.0.0"
+            }
+        }
+    
+    # Handle tools/list request (no auth needed)
+    elif method == "tools/list":
+        result = {"tools": MCP_TOOLS}
+    
+    # Handle tools/call request (no auth needed for ChatGPT connector)
+    elif method == "tools/call":
+        params = message.get("params") or {}
+        tool_name = params.get("name")
+        arguments = params.get("arguments") or {}
+        
+        if not tool_name:
+            return _rpc_error(request_id, -32602, "Invalid params: tool name required")
+        
+        structured = (protocol_version or DEFAULT_PROTOCOL_VERSION) >= STRUCTURED_CONTENT_VERSION
+        progress_token = (params.get("_meta") or {}).get("progressToken")
+        try:
+            rate_limiter.charge(principal, tool_name, arguments)
+        except RateLimitExceeded as e:
+            return _rpc_error(request_id, RATE_LIMIT_ERROR_CODE, str(e), {"retryAfter": int(e.retry_after_header)})
+        try:
+            priority = priority_for(principal, background)
+            with inflight.track(_cancel_scope(session, connection), request_id) as cancel:
+                result = _tool_content(await call_mcp_tool(tool_name, arguments, session, priority, progress_token, cancel), structured)
+        except DuplicateRequestId as e:
+            return _rpc_error(request_id, -32600, f"Invalid Request: {e}")
+        except RequestCancelled:
+            # The client asked us to stop; per MCP no response is sent for a cancelled request
+            return None
+        except MCPToolError as e:
+            return _rpc_error(request_id, e.code, str(e))
+        except Exception as e:
+            return _rpc_error(request_id, -32000, f"Tool execution error: {str(e)}")
+    
+    elif method == "notifications/cancelled":
+        params = message.get("params") or {}
+        inflight.cancel(_cancel_scope(session, connection), params.get("requestId"), params.get("reason"))
+        return None
+    
+    elif is_notification:
+        # Client notifications (e.g. notifications/initialized) need no reply
+        return None
+    
+    else:
+        return _rpc_error(request_id, -32601, "Method not found")
+    
+    if is_notification:
+        return None
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": result
+    }
+
+async def handle_mcp_payload(body: Any, session: Optional[MCPSession] = None, protocol_version: Optional[str] = None, principal: Optional[str] = None, connection: Any = None) -> Tuple[Any, int]:
+    """
+    Handle a JSON-RPC payload: a single message or a batch (array).
+    
+    Batched calls run concurrently (in the batch scheduling class), at most as
+    many at once as that class can run or queue, so a large batch waits for
+    its own earlier calls instead of being rejected as busy; responses keep
+    request order.
+    Returns (response, status_code); response is None when nothing needs a reply.
+    """
+    if isinstance(body, list):
+        if not body:
+            return _rpc_error(None, -32600, "Invalid Request: empty batch"), 400
+        if len(body) > MCP_MAX_BATCH_SIZE:
+            return _rpc_error(None, -32600, f"Invalid Request: batch exceeds {MCP_MAX_BATCH_SIZE} messages"), 400
+        background = len(body) > 1
+        caller = session.principal if session is not None else principal
+        in_flight = asyncio.Semaphore(scheduler.get(priority_for(caller, background)).capacity)
+        
+        async def handle(message: Any) -> Optional[Dict[str, Any]]:
+            async with in_flight:
+                return await handle_mcp_message(message, session, protocol_version, principal, background, connection)
+        
+        responses = await asyncio.gather(*(handle(message) for message in body))
+        responses = [response for response in responses if response is not None]
+        return (responses or None), 200
+    
+    response = await handle_mcp_message(body, session, protocol_version, principal, connection=connection)
+    if response is not None and response.get("error", {}).get("code") == RATE_LIMIT_ERROR_CODE:
+        return response, 429
+    return response, 200
 
 @http_app.get("/mcp")
 @http_app.post("/mcp")
@@ -313,10 +1325,14 @@ async def mcp_endpoint(request: Request):
     MCP endpoint for OpenAI Connector handshake.
     Handles both GET (health check) and POST (JSON-RPC) requests.
     Initialize and tools/list work without auth; tools/call requires auth.
+    
+    POST accepts a single JSON-RPC message or a batch (array). A payload
+    with initialize gets an Mcp-Session-Id response header; clients send it
+    back on later requests so they can cancel their calls.
     """
     if request.method == "GET":
         # Health check - return server info (no auth needed)
-        return JSONResponse({
+        return FastJSONResponse({
             "protocol": "mcp",
             "version": "2024-11-05",
             "capabilities": {
@@ -327,795 +1343,214 @@ async def mcp_endpoint(request: Request):
             "serverInfo": {
                 "name": "resume-mcp",
                 "version": "1.0.0"
-            }
+            },
+            "sse": {**heartbeat.stats(), "sessions": len(sessions)},
+            "scheduler": scheduler.stats(),
+            "rank_pool": rank_pool.stats()
         })
     
     # POST request - handle JSON-RPC
     try:
         body = await request.json()
-        
-        # Handle initialize request (no auth needed for handshake)
-        if body.get("method") == "initialize":
-            return JSONResponse({
-                "jsonrpc": "2.0",
-                "id": body.get("id"),
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {
-                            "listChanged": True
-                        }
-                    },
-                    "serverInfo": {
-                        "name": "resume-mcp",
-                        "version": "1.0.0"
-                    }
-                }
-            })
-        
-        # Handle tools/list request (no auth needed)
-        elif body.get("method") == "tools/list":
-            # Combined tools from Resume MCP, B Past Life MCP, and Northstar MCP
-            tools_list = [
-                # Resume MCP tools (Tech Resume)
-                {
-                    "name": "get_resume_info",
-                    "description": "Get full tech resume information including skills, projects, experience, and target roles",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                    },
-                },
-                {
-                    "name": "match_jobs",
-                    "description": "Match and rank jobs from jobs_clean.csv against the tech resume. Returns top N matches.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "top_n": {
-                                "type": "integer",
-                                "description": "Number of top jobs to return (default: 5)",
-                                "default": 5,
-                            },
-                        },
-                    },
-                },
-                {
-                    "name": "get_shortlist",
-                    "description": "Get the current shortlist.csv (top matched jobs for tech resume)",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                    },
-                },
-                {
-                    "name": "get_skills",
-                    "description": "Get skills from tech resume, optionally filtered by minimum weight",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "min_weight": {
-                                "type": "integer",
-                                "description": "Minimum skill weight to include (1-10)",
-                                "default": 0,
-                            },
-                        },
-                    },
-                },
-                {
-                    "name": "check_job_match",
-                    "description": "Check how well a specific job description matches the tech resume",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "job_title": {
-                                "type": "string",
-                                "description": "Job title",
-                            },
-                            "job_description": {
-                                "type": "string",
-                                "description": "Job description text",
-                            },
-                            "company": {
-                                "type": "string",
-                                "description": "Company name (optional)",
-                                "default": "",
-                            },
-                        },
-                        "required": ["job_title", "job_description"],
-                    },
-                },
-                # B Past Life MCP tools (VC/PE/Finance Resume)
-                {
-                    "name": "get_b_past_life_resume_info",
-                    "description": "Get B's past life resume (VC/PE/Finance) information including experience, skills, and achievements",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                    },
-                },
-                {
-                    "name": "check_b_past_life_job_match",
-                    "description": "Check how well a job matches B's past life resume (VC/PE/Finance roles)",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "job_title": {
-                                "type": "string",
-                                "description": "Job title",
-                            },
-                            "job_description": {
-                                "type": "string",
-                                "description": "Job description text",
-                            },
-                            "company": {
-                                "type": "string",
-                                "description": "Company name (optional)",
-                                "default": "",
-                            },
-                        },
-                        "required": ["job_title", "job_description"],
-                    },
-                },
-                # Northstar MCP tools (Project Registry)
-                {
-                    "name": "get_northstar_info",
-                    "description": "Get overview of Northstar suite including brand, mission, and total projects",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                    },
-                },
-                {
-                    "name": "list_projects",
-                    "description": "List all 5 Northstar projects with basic information",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                    },
-                },
-                {
-                    "name": "get_project",
-                    "description": "Get detailed information about a specific project by ID (1-5)",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "project_id": {
-                                "type": "integer",
-                                "description": "Project ID (1-5)",
-                            },
-                        },
-                        "required": ["project_id"],
-                    },
-                },
-                {
-                    "name": "get_project_by_name",
-                    "description": "Get project information by name (e.g., 'Resume MCP', 'Mocktailverse')",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "project_name": {
-                                "type": "string",
-                                "description": "Project name or partial name",
-                            },
-                        },
-                        "required": ["project_name"],
-                    },
-                },
-                {
-                    "name": "get_shared_assets",
-                    "description": "Get list of shared assets across all Northstar projects",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                    },
-                },
-                {
-                    "name": "get_ai_agent_plan",
-                    "description": "Get AI agent orchestration plan (short-term and long-term)",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                    },
-                },
-                {
-                    "name": "search_projects",
-                    "description": "Search projects by keyword in name, purpose, stack, or MCP role",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "keyword": {
-                                "type": "string",
-                                "description": "Search keyword",
-                            },
-                        },
-                        "required": ["keyword"],
-                    },
-                },
-            ]
-            return JSONResponse({
-                "jsonrpc": "2.0",
-                "id": body.get("id"),
-                "result": {
-                    "tools": tools_list
-                }
-            })
-        
-        # Handle tools/call request (no auth needed for ChatGPT connector)
-        elif body.get("method") == "tools/call":
-            
-            params = body.get("params", {})
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            if not tool_name:
-                return JSONResponse({
-                    "jsonrpc": "2.0",
-                    "id": body.get("id"),
-                    "error": {
-                        "code": -32602,
-                        "message": "Invalid params: tool name required"
-                    }
-                })
-            
-            # Call the tool using the same logic as /call endpoint
-            try:
-                if tool_name == "get_resume_info":
-                    resume = load_resume()
-                    if not resume:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Resume file not found"}
-                        })
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps(resume, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "get_skills":
-                    resume = load_resume()
-                    if not resume:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Resume file not found"}
-                        })
-                    min_weight = arguments.get("min_weight", 0)
-                    skills = {skill: weight for skill, weight in resume.get("skills", {}).items() if weight >= min_weight}
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps({"skills": skills, "count": len(skills)}, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "match_jobs":
-                    top_n = arguments.get("top_n", 5)
-                    result = match_and_rank(top_n=top_n)
-                    if isinstance(result, tuple):
-                        success, shortlist_df, ranked_df = result
-                        if success and shortlist_df is not None:
-                            shortlist = shortlist_df.to_dict(orient="records")
-                            return JSONResponse({
-                                "jsonrpc": "2.0",
-                                "id": body.get("id"),
-                                "result": {
-                                    "content": [
-                                        {
-                                            "type": "text",
-                                            "text": json.dumps({"shortlist": shortlist, "count": len(shortlist)}, indent=2)
-                                        }
-                                    ]
-                                }
-                            })
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "error": {"code": -32000, "message": "Failed to match jobs"}
-                    })
-                
-                elif tool_name == "get_shortlist":
-                    shortlist_file = Path("shortlist.csv")
-                    if not shortlist_file.exists():
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Shortlist not found. Run match_jobs first."}
-                        })
-                    df = pd.read_csv(shortlist_file)
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps({"shortlist": df.to_dict(orient="records"), "count": len(df)}, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "check_job_match":
-                    resume = load_resume()
-                    rulebook = load_rulebook()
-                    if not resume or not rulebook:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Resume or rulebook not found"}
-                        })
-                    
-                    job_df = pd.DataFrame([{
-                        "title": arguments.get("job_title", ""),
-                        "company": arguments.get("company", ""),
-                        "description": arguments.get("job_description", ""),
-                        "url": ""
-                    }])
-                    
-                    filtered_df, discarded_df = filter_jobs(job_df, rulebook)
-                    if len(filtered_df) == 0:
-                        result_data = {
-                            "match": False,
-                            "reason": "Job filtered out by rulebook",
-                            "discard_reason": discarded_df.iloc[0].get("discard_reason", "Unknown") if len(discarded_df) > 0 else "No positive keyword matches"
-                        }
-                    else:
-                        ranked_df = rank_jobs(filtered_df, resume, rulebook)
-                        if len(ranked_df) > 0:
-                            job_result = ranked_df.iloc[0].to_dict()
-                            result_data = {
-                                "match": True,
-                                "match_score": job_result.get("match_score", 0),
-                                "matched_skills": job_result.get("matched_skills", ""),
-                                "matched_projects": job_result.get("matched_projects", ""),
-                                "positive_keyword_matches": job_result.get("positive_keyword_matches", 0)
-                            }
-                        else:
-                            return JSONResponse({
-                                "jsonrpc": "2.0",
-                                "id": body.get("id"),
-                                "error": {"code": -32000, "message": "Failed to rank job"}
-                            })
-                    
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps(result_data, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                # B Past Life MCP tools
-                elif tool_name == "get_b_past_life_resume_info":
-                    resume = load_b_past_life_resume()
-                    if not resume:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "B Past Life resume file not found"}
-                        })
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps(resume, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "check_b_past_life_job_match":
-                    resume = load_b_past_life_resume()
-                    rulebook = load_b_past_life_rulebook()
-                    if not resume or not rulebook:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "B Past Life resume or rulebook not found"}
-                        })
-                    
-                    job_df = pd.DataFrame([{
-                        "title": arguments.get("job_title", ""),
-                        "company": arguments.get("company", ""),
-                        "description": arguments.get("job_description", ""),
-                        "url": ""
-                    }])
-                    
-                    filtered_df, discarded_df = b_past_life_filter_jobs(job_df, rulebook)
-                    if len(filtered_df) == 0:
-                        result_data = {
-                            "match": False,
-                            "reason": "Job filtered out by rulebook",
-                            "discard_reason": discarded_df.iloc[0].get("discard_reason", "Unknown") if len(discarded_df) > 0 else "No positive keyword matches"
-                        }
-                    else:
-                        ranked_df = b_past_life_rank_jobs(filtered_df, resume, rulebook)
-                        if len(ranked_df) > 0:
-                            job_result = ranked_df.iloc[0].to_dict()
-                            result_data = {
-                                "match": True,
-                                "match_score": job_result.get("match_score", 0),
-                                "matched_skills": job_result.get("matched_skills", ""),
-                                "matched_projects": job_result.get("matched_projects", ""),
-                                "positive_keyword_matches": job_result.get("positive_keyword_matches", 0)
-                            }
-                        else:
-                            return JSONResponse({
-                                "jsonrpc": "2.0",
-                                "id": body.get("id"),
-                                "error": {"code": -32000, "message": "Failed to rank job"}
-                            })
-                    
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps(result_data, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                # Northstar MCP tools
-                elif tool_name == "get_northstar_info":
-                    projects_data = load_northstar_projects()
-                    if not projects_data:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Northstar projects data not found"}
-                        })
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps({
-                                        "brand": projects_data["brand"],
-                                        "total_projects": projects_data["total_projects"],
-                                        "mission": projects_data["mission"],
-                                        "author": projects_data["meta"]["author"],
-                                        "tone": projects_data["meta"]["tone"]
-                                    }, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "list_projects":
-                    projects_data = load_northstar_projects()
-                    if not projects_data:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Northstar projects data not found"}
-                        })
-                    projects_list = [
-                        {
-                            "id": p["id"],
-                            "name": p["name"],
-                            "purpose": p["purpose"],
-                            "stack": p["stack"],
-                            "mcp_role": p["mcp_role"]
-                        }
-                        for p in projects_data["projects"]
-                    ]
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps({"projects": projects_list, "count": len(projects_list)}, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "get_project":
-                    projects_data = load_northstar_projects()
-                    if not projects_data:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Northstar projects data not found"}
-                        })
-                    project_id = arguments.get("project_id")
-                    if not project_id or project_id < 1 or project_id > 5:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32602, "message": "project_id must be between 1 and 5"}
-                        })
-                    
-                    project = next((p for p in projects_data["projects"] if p["id"] == project_id), None)
-                    if not project:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": f"Project {project_id} not found"}
-                        })
-                    
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps(project, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "get_project_by_name":
-                    projects_data = load_northstar_projects()
-                    if not projects_data:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Northstar projects data not found"}
-                        })
-                    project_name = arguments.get("project_name", "").lower()
-                    if not project_name:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32602, "message": "project_name is required"}
-                        })
-                    
-                    matching = [
-                        p for p in projects_data["projects"]
-                        if project_name in p["name"].lower()
-                    ]
-                    
-                    if not matching:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": f"No project found matching '{project_name}'"}
-                        })
-                    
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps(matching[0] if len(matching) == 1 else matching, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "get_shared_assets":
-                    projects_data = load_northstar_projects()
-                    if not projects_data:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Northstar projects data not found"}
-                        })
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps({
-                                        "shared_assets": projects_data["shared_assets"],
-                                        "count": len(projects_data["shared_assets"])
-                                    }, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "get_ai_agent_plan":
-                    projects_data = load_northstar_projects()
-                    if not projects_data:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Northstar projects data not found"}
-                        })
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps(projects_data["ai_agent_plan"], indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                elif tool_name == "search_projects":
-                    projects_data = load_northstar_projects()
-                    if not projects_data:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32000, "message": "Northstar projects data not found"}
-                        })
-                    keyword = arguments.get("keyword", "").lower()
-                    if not keyword:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id"),
-                            "error": {"code": -32602, "message": "keyword is required"}
-                        })
-                    
-                    matching = []
-                    for project in projects_data["projects"]:
-                        search_text = f"{project['name']} {project['purpose']} {' '.join(project['stack'])} {project['mcp_role']}".lower()
-                        if keyword in search_text:
-                            matching.append(project)
-                    
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": json.dumps({
-                                        "projects": matching,
-                                        "count": len(matching),
-                                        "keyword": keyword
-                                    }, indent=2)
-                                }
-                            ]
-                        }
-                    })
-                
-                else:
-                    return JSONResponse({
-                        "jsonrpc": "2.0",
-                        "id": body.get("id"),
-                        "error": {
-                            "code": -32601,
-                            "message": f"Unknown tool: {tool_name}"
-                        }
-                    })
-            
-            except Exception as e:
-                return JSONResponse({
-                    "jsonrpc": "2.0",
-                    "id": body.get("id"),
-                    "error": {
-                        "code": -32000,
-                        "message": f"Tool execution error: {str(e)}"
-                    }
-                })
-        
-        # Default response for other methods
-        return JSONResponse({
-            "jsonrpc": "2.0",
-            "id": body.get("id"),
-            "error": {
-                "code": -32601,
-                "message": "Method not found"
-            }
-        })
-        
     except Exception as e:
-        return JSONResponse({
-            "jsonrpc": "2.0",
-            "id": None,
-            "error": {
-                "code": -32700,
-                "message": f"Parse error: {str(e)}"
-            }
-        }, status_code=400)
+        return FastJSONResponse(_rpc_error(None, -32700, f"Parse error: {str(e)}"), status_code=400)
+    
+    session_id = request.headers.get("mcp-session-id")
+    if session_id is not None and not _MCP_SESSION_ID.match(session_id):
+        return FastJSONResponse(_rpc_error(None, -32600, "Invalid Mcp-Session-Id header"), status_code=400)
+    if session_id is None and _initializes(body):
+        session_id = secrets.token_urlsafe(24)
+    
+    principal = request_principal(request)
+    response, status_code = await handle_mcp_payload(
+        body,
+        protocol_version=request.headers.get("mcp-protocol-version"),
+        principal=principal,
+        connection=mcp_connection(principal, session_id)
+    )
+    headers = {"Mcp-Session-Id": session_id} if session_id else {}
+    if response is None:
+        return Response(status_code=202, headers=headers)
+    if status_code == 429:
+        headers["Retry-After"] = str(response["error"]["data"]["retryAfter"])
+    return FastJSONResponse(response, status_code=status_code, headers=headers)
 
 @http_app.get("/sse")
 async def sse_endpoint(request: Request):
     """
     SSE endpoint for OpenAI connector.
-    This is the main endpoint OpenAI will connect to.
+    Opens an MCP session: the first event names the message endpoint, and
+    responses to messages POSTed there are delivered on this stream.
     """
-    async def event_stream():
-        try:
-            # Send initial connection message
-            yield f"data: {json.dumps({'type': 'connection', 'status': 'connected'})}\n\n"
-            
-            # Keep connection alive and handle requests
-            while True:
-                # In a real implementation, you'd parse SSE messages from the client
-                # For now, we'll keep the connection alive
-                await asyncio.sleep(1)
-                yield f"data: {json.dumps({'type': 'ping'})}\n\n"
-                
-        except asyncio.CancelledError:
-            yield f"data: {json.dumps({'type': 'connection', 'status': 'disconnected'})}\n\n"
-    
+    session = sessions.create()
+    session.principal = request_principal(request)
+    endpoint = f"/messages?session_id={session.id}"
     return StreamingResponse(
-        event_stream(),
+        session.stream(request, endpoint),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
+        headers=SSE_HEADERS
     )
 
+async def _dispatch_session_payload(session: MCPSession, body: Any, request_id: str):
+    """Handle a payload received for a session and send the reply on its stream."""
+    # Runs after the POST has returned, so it gets its own trace under the same request id
+    with tracing.trace("session message", request_id, **{"session.id": session.id}):
+        response, _ = await handle_mcp_payload(body, session)
+    if response is not None:
+        try:
+            await session.send(response)
+        except SessionClosed:
+            pass
+
+@http_app.post("/messages")
+async def sse_message_endpoint(request: Request, session_id: str):
+    """
+    Message endpoint for SSE sessions.
+    Accepts JSON-RPC messages (or batches) and replies on the session's stream.
+    """
+    session = sessions.get(session_id)
+    if session is None:
+        return FastJSONResponse({"error": "Session not found or expired"}, status_code=404)
+    session.touch()
+    
+    try:
+        body = await request.json()
+    except Exception as e:
+        error = _rpc_error(None, -32700, f"Parse error: {str(e)}")
+        try:
+            await session.send(error)
+        except SessionClosed:
+            pass
+        return FastJSONResponse(error, status_code=400)
+    
+    task = asyncio.create_task(_dispatch_session_payload(session, body, request.state.request_id))
+    session.tasks.add(task)
+    task.add_done_callback(session.tasks.discard)
+    return FastJSONResponse({"status": "accepted"}, status_code=202)
+
 @http_app.get("/api/get_resume_info")
-async def api_get_resume_info(request: Request):
+async def api_get_resume_info(request: Request, fields: Optional[str] = None):
     """API endpoint for full resume (for web UI). Requires auth (owner has automatic)."""
     require_auth(request, allow_public=False)
+    etag = source_etag([RESUME_FILE], "get_resume_info", fields)
+    cached = not_modified(request, etag, private=True)
+    if cached:
+        return cached
+    rate_limiter.charge(request_principal(request), "get_resume_info")
     resume = load_resume()
     if not resume:
-        return JSONResponse({"error": "Resume not found"}, status_code=404)
-    return JSONResponse(resume)
+        return FastJSONResponse({"error": "Resume not found"}, status_code=404)
+    try:
+        return FastJSONResponse(project(resume, parse_fields(fields)), headers=cache_headers(etag, private=True))
+    except PaginationError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=400)
 
 @http_app.get("/api/get_skills")
 async def api_get_skills(request: Request, min_weight: int = 0):
     """API endpoint for skills (for web UI). Requires auth (owner has automatic)."""
     require_auth(request, allow_public=False)
+    etag = source_etag([RESUME_FILE], "get_skills", min_weight)
+    cached = not_modified(request, etag, private=True)
+    if cached:
+        return cached
+    rate_limiter.charge(request_principal(request), "get_skills")
     resume = load_resume()
     if not resume:
-        return JSONResponse({"error": "Resume not found"}, status_code=404)
+        return FastJSONResponse({"error": "Resume not found"}, status_code=404)
     skills = resume.get('skills', {})
     filtered = {k: v for k, v in skills.items() if v >= min_weight}
-    return JSONResponse({"skills": filtered, "count": len(filtered)})
+    return FastJSONResponse({"skills": filtered, "count": len(filtered)}, headers=cache_headers(etag, private=True))
+
+@http_app.get("/api/list_projects")
+async def api_list_projects(request: Request, fields: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None):
+    """API endpoint for Northstar projects. Requires auth (owner has automatic)."""
+    require_auth(request, allow_public=False)
+    # Pages carry a one-off next_cursor that expires, so only the full list is revalidated
+    paginated = limit is not None or cursor is not None
+    etag = None if paginated else source_etag([NORTHSTAR_PROJECTS_FILE], "list_projects", fields)
+    cached = not_modified(request, etag, private=True) if etag else None
+    if cached:
+        return cached
+    rate_limiter.charge(request_principal(request), "list_projects")
+    try:
+        result = await call_mcp_tool("list_projects", {"fields": fields, "limit": limit, "cursor": cursor})
+    except MCPToolError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=e.status)
+    headers = {"Cache-Control": "no-store"} if paginated else cache_headers(etag, private=True)
+    return FastJSONResponse(result, headers=headers)
+
+@http_app.get("/api/get_project")
+async def api_get_project(request: Request, project_id: int):
+    """API endpoint for one Northstar project. Requires auth (owner has automatic)."""
+    require_auth(request, allow_public=False)
+    etag = source_etag([NORTHSTAR_PROJECTS_FILE], "get_project", project_id)
+    cached = not_modified(request, etag, private=True)
+    if cached:
+        return cached
+    rate_limiter.charge(request_principal(request), "get_project")
+    try:
+        result = await call_mcp_tool("get_project", {"project_id": project_id})
+    except MCPToolError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=e.status)
+    return FastJSONResponse(result, headers=cache_headers(etag, private=True))
 
 @http_app.get("/api/get_shortlist")
-async def api_get_shortlist(request: Request):
+async def api_get_shortlist(request: Request, fields: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None):
     """API endpoint for job shortlist (for web UI). Requires auth (owner has automatic)."""
     require_auth(request, allow_public=False)
+    arguments = {"top_n": 5, "fields": fields, "limit": limit, "cursor": cursor}
+    principal = request_principal(request)
+    rate_limiter.charge(principal, "match_jobs", arguments)
     try:
-        result = match_and_rank(top_n=5)
-        if isinstance(result, tuple):
-            success, shortlist_df, ranked_df = result
-            if success and shortlist_df is not None:
-                return JSONResponse({
-                    "shortlist": shortlist_df.to_dict(orient="records"),
-                    "count": len(shortlist_df)
-                })
-        return JSONResponse({"error": "No shortlist available"}, status_code=404)
+        return FastJSONResponse(await call_mcp_tool("match_jobs", arguments, priority=priority_for(principal)))
+    except MCPToolError as e:
+        if e.status in (400, 503):
+            return FastJSONResponse({"error": str(e)}, status_code=e.status)
+        return FastJSONResponse({"error": "No shortlist available"}, status_code=404)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
+
+@http_app.get("/api/match_jobs/stream")
+async def api_match_jobs_stream(request: Request, top_n: int = 5, deadline_ms: Optional[int] = None):
+    """
+    Stream a ranking as NDJSON: progress and partial top-N events while chunks
+    are scored, then a final result line. deadline_ms bounds the scan (newest
+    jobs first; the result line says partial and scanned_fraction).
+    Requires auth (owner has automatic).
+    """
+    require_auth(request, allow_public=False)
+    try:
+        deadline = _deadline({"deadline_ms": deadline_ms}, time.monotonic())
+    except MCPToolError as e:
+        return FastJSONResponse({"error": str(e)}, status_code=e.status)
+    principal = request_principal(request)
+    rate_limiter.charge(principal, "match_jobs")
+    priority = priority_for(principal)
+    
+    async def ndjson_stream():
+        events = iter_match_and_rank(top_n=top_n, shortlist_file=None, discard_file=None, store=results, deadline=deadline, pipeline=ranking_pipeline, pool=rank_pool)
+        while True:
+            try:
+                # Each chunk is scheduled separately so higher-priority calls can interleave
+                event = await scheduler.run(priority, next, events, None)
+            except Exception as e:
+                yield dumps({"event": "error", "error": str(e)}) + "\n"
+                return
+            if event is None:
+                return
+            yield dumps(event) + "\n"
+    
+    return StreamingResponse(
+        ndjson_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @http_app.post("/api/check_job_match")
 async def api_check_job_match(request: Request):
     """API endpoint for job matching (for web UI). Requires auth (owner has automatic)."""
     require_auth(request, allow_public=False)
+    rate_limiter.charge(request_principal(request), "check_job_match")
     try:
         data = await request.json()
         job_df = pd.DataFrame([{
@@ -1128,7 +1563,7 @@ async def api_check_job_match(request: Request):
         rulebook = load_rulebook()
         filtered_df, discarded_df = filter_jobs(job_df, rulebook)
         if len(filtered_df) == 0:
-            return JSONResponse({
+            return FastJSONResponse({
                 "match": False,
                 "reason": "Job filtered out by rulebook"
             })
@@ -1137,145 +1572,83 @@ async def api_check_job_match(request: Request):
         ranked_df = rank_jobs(filtered_df, resume, rulebook)
         if len(ranked_df) > 0:
             job_result = ranked_df.iloc[0].to_dict()
-            return JSONResponse({
+            return FastJSONResponse({
                 "match": True,
                 "match_score": job_result.get("match_score", 0),
                 "matched_skills": job_result.get("matched_skills", ""),
                 "matched_projects": job_result.get("matched_projects", "")
             })
         
-        return JSONResponse({"error": "Failed to rank job"}, status_code=500)
+        return FastJSONResponse({"error": "Failed to rank job"}, status_code=500)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
 
 @http_app.get("/tools")
 async def get_tools(request: Request):
     """Get list of available MCP tools (combined from all MCPs). Requires auth (owner has automatic)."""
     require_auth(request, allow_public=False)
-    # Combined tools from Resume MCP, B Past Life MCP, and Northstar MCP
-    tools_list = [
-        # Resume MCP tools (Tech Resume)
-        {
-            "name": "get_resume_info",
-            "description": "Get full tech resume information including skills, projects, experience, and target roles",
-            "inputSchema": {"type": "object", "properties": {}},
-        },
-        {
-            "name": "match_jobs",
-            "description": "Match and rank jobs from jobs_clean.csv against the tech resume. Returns top N matches.",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "top_n": {"type": "integer", "description": "Number of top jobs to return (default: 5)", "default": 5},
-                },
-            },
-        },
-        {
-            "name": "get_shortlist",
-            "description": "Get the current shortlist.csv (top matched jobs for tech resume)",
-            "inputSchema": {"type": "object", "properties": {}},
-        },
-        {
-            "name": "get_skills",
-            "description": "Get skills from tech resume, optionally filtered by minimum weight",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "min_weight": {"type": "integer", "description": "Minimum skill weight to include (1-10)", "default": 0},
-                },
-            },
-        },
-        {
-            "name": "check_job_match",
-            "description": "Check how well a specific job description matches the tech resume",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "job_title": {"type": "string", "description": "Job title"},
-                    "job_description": {"type": "string", "description": "Job description text"},
-                    "company": {"type": "string", "description": "Company name (optional)", "default": ""},
-                },
-                "required": ["job_title", "job_description"],
-            },
-        },
-        # B Past Life MCP tools
-        {
-            "name": "get_b_past_life_resume_info",
-            "description": "Get B's past life resume (VC/PE/Finance) information including experience, skills, and achievements",
-            "inputSchema": {"type": "object", "properties": {}},
-        },
-        {
-            "name": "check_b_past_life_job_match",
-            "description": "Check how well a job matches B's past life resume (VC/PE/Finance roles)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "job_title": {"type": "string", "description": "Job title"},
-                    "job_description": {"type": "string", "description": "Job description text"},
-                    "company": {"type": "string", "description": "Company name (optional)", "default": ""},
-                },
-                "required": ["job_title", "job_description"],
-            },
-        },
-        # Northstar MCP tools
-        {
-            "name": "get_northstar_info",
-            "description": "Get overview of Northstar suite including brand, mission, and total projects",
-            "inputSchema": {"type": "object", "properties": {}},
-        },
-        {
-            "name": "list_projects",
-            "description": "List all 5 Northstar projects with basic information",
-            "inputSchema": {"type": "object", "properties": {}},
-        },
-        {
-            "name": "get_project",
-            "description": "Get detailed information about a specific project by ID (1-5)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "project_id": {"type": "integer", "description": "Project ID (1-5)"},
-                },
-                "required": ["project_id"],
-            },
-        },
-        {
-            "name": "get_project_by_name",
-            "description": "Get project information by name (e.g., 'Resume MCP', 'Mocktailverse')",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "project_name": {"type": "string", "description": "Project name or partial name"},
-                },
-                "required": ["project_name"],
-            },
-        },
-        {
-            "name": "get_shared_assets",
-            "description": "Get list of shared assets across all Northstar projects",
-            "inputSchema": {"type": "object", "properties": {}},
-        },
-        {
-            "name": "get_ai_agent_plan",
-            "description": "Get AI agent orchestration plan (short-term and long-term)",
-            "inputSchema": {"type": "object", "properties": {}},
-        },
-        {
-            "name": "search_projects",
-            "description": "Search projects by keyword in name, purpose, stack, or MCP role",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "keyword": {"type": "string", "description": "Search keyword"},
-                },
-                "required": ["keyword"],
-            },
-        },
-    ]
-    return JSONResponse({
-        "tools": tools_list,
-        "count": len(tools_list)
-    })
+    cached = not_modified(request, TOOLS_ETAG, private=True)
+    if cached:
+        return cached
+    return FastJSONResponse({
+        "tools": MCP_TOOLS,
+        "count": len(MCP_TOOLS)
+    }, headers=cache_headers(TOOLS_ETAG, private=True))
+
+def _cache_samples():
+    for name, cache in (("result_cache", result_cache), ("compression", body_cache)):
+        yield (name, "hit"), cache.hits
+        yield (name, "miss"), cache.misses
+
+def _cache_ratio_samples():
+    for name, cache in (("result_cache", result_cache), ("compression", body_cache)):
+        lookups = cache.hits + cache.misses
+        yield (name,), (cache.hits / lookups) if lookups else 0.0
+
+def _scheduler_samples(key: str):
+    def samples():
+        for name, stats in scheduler.stats().items():
+            yield (name,), stats[key]
+    return samples
+
+for _metric in (
+    metrics.CallbackGauge("resume_mcp_cache_lookups_total", "Cache lookups by cache and result", ("cache", "result"), _cache_samples, kind="counter"),
+    metrics.CallbackGauge("resume_mcp_cache_hit_ratio", "Cache hit ratio since start", ("cache",), _cache_ratio_samples),
+    metrics.CallbackGauge("resume_mcp_scheduler_queue_depth", "Heavy calls waiting for a slot", ("class",), _scheduler_samples("queued")),
+    metrics.CallbackGauge("resume_mcp_scheduler_running", "Heavy calls running", ("class",), _scheduler_samples("running")),
+    metrics.CallbackGauge("resume_mcp_scheduler_rejected_total", "Heavy calls rejected with a full queue", ("class",), _scheduler_samples("rejected"), kind="counter"),
+    metrics.CallbackGauge("resume_mcp_rank_pool_processes", "Ranking worker processes running", (), lambda: [((), rank_pool.stats()["processes"])]),
+    metrics.CallbackGauge("resume_mcp_rank_pool_chunks_total", "Ranking chunks scored, by where they ran", ("where",), lambda: [(("process",), rank_pool.chunks), (("thread",), rank_pool.fallbacks)], kind="counter"),
+    metrics.CallbackGauge("resume_mcp_scheduler_wait_max_seconds", "Longest queue wait seen", ("class",), lambda: (((name,), stats["wait_max_ms"] / 1000) for name, stats in scheduler.stats().items())),
+    metrics.CallbackGauge("resume_mcp_rate_limited_total", "Calls rejected by the rate limiter", (), lambda: [((), rate_limiter.limited)], kind="counter"),
+    metrics.CallbackGauge("resume_mcp_sse_connections", "Open SSE connections", (), lambda: [((), heartbeat.connections)]),
+    metrics.CallbackGauge("resume_mcp_sse_sessions", "Open MCP SSE sessions", (), lambda: [((), len(sessions))]),
+    metrics.CallbackGauge("resume_mcp_corpus_jobs", "Jobs in the cleaned corpus", (), lambda: [((), metrics.corpus_size(str(JOBS_FILE)))]),
+    metrics.CallbackGauge("resume_mcp_result_writes_total", "Background result writes by outcome", ("outcome",), lambda: [((outcome,), results.stats()[key]) for outcome, key in (("ok", "written"), ("error", "failed"), ("coalesced", "coalesced"))], kind="counter"),
+    metrics.CallbackGauge("resume_mcp_tool_calls_cancelled_total", "Tool calls stopped by notifications/cancelled", (), lambda: [((), inflight.cancelled)], kind="counter"),
+    metrics.CallbackGauge("resume_mcp_ranking_jobs", "Background ranking jobs held, by state", ("state",), lambda: [((state,), count) for state, count in ranking_jobs.stats()["states"].items()]),
+    metrics.CallbackGauge("resume_mcp_ranking_jobs_evicted_total", "Finished ranking jobs dropped by TTL or size bound", (), lambda: [((), ranking_jobs.evicted)], kind="counter"),
+    metrics.CallbackGauge("resume_mcp_result_write_queue", "Result writes waiting for the background writer", (), lambda: [((), results.stats()["queued"])]),
+):
+    metrics.registry.register(_metric)
+
+@http_app.get("/api/profile")
+async def api_get_profile(request: Request, profile_id: str, format: str = "text"):
+    """Fetch a stored request profile (text summary or raw .pstats). Owner API key only."""
+    require_owner_key(request)
+    path = profiling.profile_path(profile_id, ".pstats" if format == "pstats" else ".txt")
+    if path is None:
+        return FastJSONResponse({"error": "Profile not found"}, status_code=404)
+    if format == "pstats":
+        return Response(path.read_bytes(), media_type="application/octet-stream",
+                        headers={"Content-Disposition": f'attachment; filename="{path.name}"'})
+    return Response(path.read_text(), media_type="text/plain; charset=utf-8")
+
+@http_app.get("/metrics")
+async def metrics_endpoint(request: Request):
+    """Prometheus metrics (text exposition format). Requires auth (owner has automatic)."""
+    require_auth(request, allow_public=False)
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
 
 @http_app.post("/call")
 async def call_tool_endpoint(request: Request):
@@ -1285,246 +1658,33 @@ async def call_tool_endpoint(request: Request):
     try:
         body = await request.json()
         tool_name = body.get("name")
-        arguments = body.get("arguments", {})
+        arguments = body.get("arguments") or {}
         
         if not tool_name:
-            return JSONResponse(
+            return FastJSONResponse(
                 {"error": "Tool name is required"},
                 status_code=400
             )
         
-        # Call the appropriate tool
-        if tool_name == "get_resume_info":
-            resume = load_resume()
-            if not resume:
-                return JSONResponse({"error": "Resume file not found"}, status_code=404)
-            return JSONResponse({"result": resume})
-        
-        elif tool_name == "match_jobs":
-            top_n = arguments.get("top_n", 5)
-            result = match_and_rank(top_n=top_n)
-            if isinstance(result, tuple):
-                success, shortlist_df, ranked_df = result
-                if success and shortlist_df is not None:
-                    shortlist = shortlist_df.to_dict(orient="records")
-                    return JSONResponse({"result": {"shortlist": shortlist, "count": len(shortlist)}})
-            return JSONResponse({"error": "Failed to match jobs"}, status_code=500)
-        
-        elif tool_name == "get_shortlist":
-            shortlist_file = Path("shortlist.csv")
-            if not shortlist_file.exists():
-                return JSONResponse({"error": "Shortlist not found. Run match_jobs first."}, status_code=404)
-            df = pd.read_csv(shortlist_file)
-            return JSONResponse({"result": {"shortlist": df.to_dict(orient="records"), "count": len(df)}})
-        
-        elif tool_name == "get_skills":
-            resume = load_resume()
-            if not resume:
-                return JSONResponse({"error": "Resume file not found"}, status_code=404)
-            min_weight = arguments.get("min_weight", 0)
-            skills = {skill: weight for skill, weight in resume.get("skills", {}).items() if weight >= min_weight}
-            return JSONResponse({"result": {"skills": skills, "count": len(skills)}})
-        
-        elif tool_name == "check_job_match":
-            resume = load_resume()
-            rulebook = load_rulebook()
-            if not resume or not rulebook:
-                return JSONResponse({"error": "Resume or rulebook not found"}, status_code=500)
-            
-            job_df = pd.DataFrame([{
-                "title": arguments.get("job_title", ""),
-                "company": arguments.get("company", ""),
-                "description": arguments.get("job_description", ""),
-                "url": ""
-            }])
-            
-            filtered_df, discarded_df = filter_jobs(job_df, rulebook)
-            if len(filtered_df) == 0:
-                return JSONResponse({
-                    "result": {
-                        "match": False,
-                        "reason": "Job filtered out by rulebook",
-                        "discard_reason": discarded_df.iloc[0].get("discard_reason", "Unknown") if len(discarded_df) > 0 else "No positive keyword matches"
-                    }
-                })
-            
-            ranked_df = rank_jobs(filtered_df, resume, rulebook)
-            if len(ranked_df) > 0:
-                job_result = ranked_df.iloc[0].to_dict()
-                return JSONResponse({
-                    "result": {
-                        "match": True,
-                        "match_score": job_result.get("match_score", 0),
-                        "matched_skills": job_result.get("matched_skills", ""),
-                        "matched_projects": job_result.get("matched_projects", ""),
-                        "positive_keyword_matches": job_result.get("positive_keyword_matches", 0)
-                    }
-                })
-            return JSONResponse({"error": "Failed to rank job"}, status_code=500)
-        
-        # B Past Life MCP tools
-        elif tool_name == "get_b_past_life_resume_info":
-            if not load_b_past_life_resume:
-                return JSONResponse({"error": "B Past Life MCP not available"}, status_code=503)
-            resume = load_b_past_life_resume()
-            if not resume:
-                return JSONResponse({"error": "B Past Life resume file not found"}, status_code=404)
-            return JSONResponse({"result": resume})
-        
-        elif tool_name == "check_b_past_life_job_match":
-            if not load_b_past_life_resume or not load_b_past_life_rulebook:
-                return JSONResponse({"error": "B Past Life MCP not available"}, status_code=503)
-            resume = load_b_past_life_resume()
-            rulebook = load_b_past_life_rulebook()
-            if not resume or not rulebook:
-                return JSONResponse({"error": "B Past Life resume or rulebook not found"}, status_code=500)
-            
-            job_df = pd.DataFrame([{
-                "title": arguments.get("job_title", ""),
-                "company": arguments.get("company", ""),
-                "description": arguments.get("job_description", ""),
-                "url": ""
-            }])
-            
-            filtered_df, discarded_df = b_past_life_filter_jobs(job_df, rulebook)
-            if len(filtered_df) == 0:
-                return JSONResponse({
-                    "result": {
-                        "match": False,
-                        "reason": "Job filtered out by rulebook",
-                        "discard_reason": discarded_df.iloc[0].get("discard_reason", "Unknown") if len(discarded_df) > 0 else "No positive keyword matches"
-                    }
-                })
-            
-            ranked_df = b_past_life_rank_jobs(filtered_df, resume, rulebook)
-            if len(ranked_df) > 0:
-                job_result = ranked_df.iloc[0].to_dict()
-                return JSONResponse({
-                    "result": {
-                        "match": True,
-                        "match_score": job_result.get("match_score", 0),
-                        "matched_skills": job_result.get("matched_skills", ""),
-                        "matched_projects": job_result.get("matched_projects", ""),
-                        "positive_keyword_matches": job_result.get("positive_keyword_matches", 0)
-                    }
-                })
-            return JSONResponse({"error": "Failed to rank job"}, status_code=500)
-        
-        # Northstar MCP tools
-        elif tool_name == "get_northstar_info":
-            projects_data = load_northstar_projects()
-            if not projects_data:
-                return JSONResponse({"error": "Northstar projects data not found"}, status_code=404)
-            return JSONResponse({
-                "result": {
-                    "brand": projects_data["brand"],
-                    "total_projects": projects_data["total_projects"],
-                    "mission": projects_data["mission"],
-                    "author": projects_data["meta"]["author"],
-                    "tone": projects_data["meta"]["tone"]
-                }
-            })
-        
-        elif tool_name == "list_projects":
-            projects_data = load_northstar_projects()
-            if not projects_data:
-                return JSONResponse({"error": "Northstar projects data not found"}, status_code=404)
-            projects_list = [
-                {
-                    "id": p["id"],
-                    "name": p["name"],
-                    "purpose": p["purpose"],
-                    "stack": p["stack"],
-                    "mcp_role": p["mcp_role"]
-                }
-                for p in projects_data["projects"]
-            ]
-            return JSONResponse({
-                "result": {
-                    "projects": projects_list,
-                    "count": len(projects_list)
-                }
-            })
-        
-        elif tool_name == "get_project":
-            projects_data = load_northstar_projects()
-            if not projects_data:
-                return JSONResponse({"error": "Northstar projects data not found"}, status_code=404)
-            project_id = arguments.get("project_id")
-            if not project_id or project_id < 1 or project_id > 5:
-                return JSONResponse({"error": "project_id must be between 1 and 5"}, status_code=400)
-            
-            project = next((p for p in projects_data["projects"] if p["id"] == project_id), None)
-            if not project:
-                return JSONResponse({"error": f"Project {project_id} not found"}, status_code=404)
-            
-            return JSONResponse({"result": project})
-        
-        elif tool_name == "get_project_by_name":
-            projects_data = load_northstar_projects()
-            if not projects_data:
-                return JSONResponse({"error": "Northstar projects data not found"}, status_code=404)
-            project_name = arguments.get("project_name", "").lower()
-            if not project_name:
-                return JSONResponse({"error": "project_name is required"}, status_code=400)
-            
-            matching = [
-                p for p in projects_data["projects"]
-                if project_name in p["name"].lower()
-            ]
-            
-            if not matching:
-                return JSONResponse({"error": f"No project found matching '{project_name}'"}, status_code=404)
-            
-            return JSONResponse({
-                "result": matching[0] if len(matching) == 1 else matching,
-                "count": len(matching)
-            })
-        
-        elif tool_name == "get_shared_assets":
-            projects_data = load_northstar_projects()
-            if not projects_data:
-                return JSONResponse({"error": "Northstar projects data not found"}, status_code=404)
-            return JSONResponse({
-                "result": {
-                    "shared_assets": projects_data["shared_assets"],
-                    "count": len(projects_data["shared_assets"])
-                }
-            })
-        
-        elif tool_name == "get_ai_agent_plan":
-            projects_data = load_northstar_projects()
-            if not projects_data:
-                return JSONResponse({"error": "Northstar projects data not found"}, status_code=404)
-            return JSONResponse({"result": projects_data["ai_agent_plan"]})
+        # Same tool implementations as /mcp, with plain JSON results and HTTP status codes
+        try:
+            principal = request_principal(request)
+            rate_limiter.charge(principal, tool_name, arguments)
+            result = await call_mcp_tool(tool_name, arguments, priority=priority_for(principal))
+        except MCPToolError as e:
+            return FastJSONResponse({"error": str(e)}, status_code=e.status)
+        except RateLimitExceeded as e:
+            return _rate_limited_response(e)
         
-        elif tool_name == "search_projects":
-            projects_data = load_northstar_projects()
-            if not projects_data:
-                return JSONResponse({"error": "Northstar projects data not found"}, status_code=404)
-            keyword = arguments.get("keyword", "").lower()
-            if not keyword:
-                return JSONResponse({"error": "keyword is required"}, status_code=400)
-            
-            matching = []
-            for project in projects_data["projects"]:
-                search_text = f"{project['name']} {project['purpose']} {' '.join(project['stack'])} {project['mcp_role']}".lower()
-                if keyword in search_text:
-                    matching.append(project)
-            
-            return JSONResponse({
-                "result": {
-                    "projects": matching,
-                    "count": len(matching),
-                    "keyword": keyword
-                }
+        if tool_name == "get_project_by_name":
+            return FastJSONResponse({
+                "result": result,
+                "count": len(result) if isinstance(result, list) else 1
             })
-        
-        else:
-            return JSONResponse({"error": f"Unknown tool: {tool_name}"}, status_code=400)
+        return FastJSONResponse({"result": result})
         
     except Exception as e:
-        return JSONResponse(
+        return FastJSONResponse(
             {"error": str(e)},
             status_code=500
         )
@@ -1539,5 +1699,6 @@ if __name__ == "__main__":
     print("   ngrok http 8000")
     print("\n📋 For OpenAI Connector, use:")
     print("   https://YOUR-NGROK-URL.ngrok-free.app/mcp")
-    uvicorn.run(http_app, host="0.0.0.0", port=8000)
+    print("\n🏭 Production: gunicorn -c gunicorn.conf.py server_http:http_app")
+    uvicorn.run(http_app, host="0.0.0.0", port=int(os.getenv("PORT", "8000")))
 
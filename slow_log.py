@@ -0,0 +1,171 @@
+"""
+Slow-request log for Resume MCP
+- Tool calls and HTTP requests slower than SLOW_REQUEST_THRESHOLD_MS are
+  written as one JSON line each
+- Entries carry the tool name, sanitized arguments, corpus size, cache
+  hits/misses and per-stage timings from the request's trace
+- Records go through a QueueHandler; a QueueListener thread does the file
+  I/O, so the request path never waits on the log
+- The destination is opened once at startup; an unwritable SLOW_LOG_FILE
+  falls back to stderr, and logging failures never reach a tool result
+"""
+import atexit
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from fast_json import dumps
+from tracing import Span
+
+# Requests slower than this are logged (0 disables the slow log)
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+
+# Where entries go; empty logs to stderr (the deploy directory may be read-only)
+SLOW_LOG_FILE = os.getenv("SLOW_LOG_FILE", "")
+
+# Long-lived streams are slow by design
+SLOW_LOG_EXCLUDE = tuple(
+    path.strip() for path in os.getenv("SLOW_LOG_EXCLUDE", "/sse,/api/match_jobs/stream").split(",") if path.strip()
+)
+
+# Argument strings longer than this are truncated in the log
+SLOW_LOG_MAX_ARG_CHARS = int(os.getenv("SLOW_LOG_MAX_ARG_CHARS", "200"))
+
+_SECRET_WORDS = ("key", "token", "secret", "password", "auth")
+
+logger = logging.getLogger(__name__)
+
+
+def sanitize(value: Any, depth: int = 0) -> Any:
+    """Redact secret-looking keys and truncate long strings/lists, keeping sizes."""
+    if isinstance(value, str):
+        if len(value) > SLOW_LOG_MAX_ARG_CHARS:
+            return f"{value[:SLOW_LOG_MAX_ARG_CHARS]}... ({len(value)} chars)"
+        return value
+    if depth >= 3:
+        return f"<{type(value).__name__}>"
+    if isinstance(value, dict):
+        return {
+            str(key): "[redacted]" if any(word in str(key).lower() for word in _SECRET_WORDS) else sanitize(item, depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        items = [sanitize(item, depth + 1) for item in value[:20]]
+        if len(value) > 20:
+            items.append(f"... ({len(value)} items)")
+        return items
+    return value
+
+
+def _cache_counts(spans: Iterable[Span]) -> Dict[str, Dict[str, int]]:
+    """Count cache hit/miss annotations (cache.<name>) across spans."""
+    counts: Dict[str, Dict[str, int]] = {}
+    for span in spans:
+        for key, value in span.attributes.items():
+            if key.startswith("cache.") and value in ("hit", "miss"):
+                name = key[len("cache."):]
+                counts.setdefault(name, {"hits": 0, "misses": 0})["hits" if value == "hit" else "misses"] += 1
+    return counts
+
+
+def _open_handler(path: str) -> logging.Handler:
+    """File handler for path, or stderr if path is empty or can't be opened."""
+    if path:
+        try:
+            return logging.FileHandler(path, encoding="utf-8")
+        except OSError as e:
+            logger.warning("Slow log file %s is not writable (%s); logging to stderr", path, e)
+    return logging.StreamHandler(sys.stderr)
+
+
+class SlowLog:
+    """Threshold check plus the queue-backed JSON-lines logger."""
+
+    def __init__(self, corpus_size: Callable[[], int] = lambda: 0, threshold_ms: float = SLOW_REQUEST_THRESHOLD_MS):
+        self.corpus_size = corpus_size
+        self.threshold_ms = threshold_ms
+        self.logged = 0
+        self.logger = logging.getLogger("resume_mcp.slow")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(self._queue))
+        self._listener: Optional[QueueListener] = None
+
+    def is_slow(self, duration_ms: float) -> bool:
+        return 0 < self.threshold_ms <= duration_ms
+
+    def start(self, path: Optional[str] = None):
+        """
+        Open the destination and start the writer thread (once per process).
+
+        Called from the server's startup so importing (or forking) never
+        spawns a thread; hosts that skip startup get it on the first entry.
+        """
+        if self._listener is not None:
+            return
+        handler = _open_handler(SLOW_LOG_FILE if path is None else path)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Write out queued entries and stop the writer thread."""
+        if self._listener is None:
+            return
+        atexit.unregister(self.stop)
+        self._listener.stop()
+        self._listener = None
+
+    def _emit(self, entry: Dict[str, Any]):
+        self.start()
+        self.logged += 1
+        self.logger.info(dumps(entry))
+
+    def _base_entry(self, kind: str, span: Span) -> Dict[str, Any]:
+        spans = [span] + span.descendants()
+        return {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(span.start_ns / 1e9)),
+            "kind": kind,
+            "request_id": span.trace.request_id,
+            "duration_ms": round(span.duration_ms, 3),
+            "threshold_ms": self.threshold_ms,
+            "corpus_size": self.corpus_size(),
+            "cache": _cache_counts(spans),
+            "timings": span.timings()["stages"],
+        }
+
+    def check_tool(self, tool_name: str, arguments: Dict[str, Any], span: Optional[Span]):
+        """Log a finished tool call if it was slow (never raises: the call's result wins)."""
+        if span is None or not self.is_slow(span.duration_ms):
+            return
+        try:
+            entry = self._base_entry("tool", span)
+            entry["tool"] = tool_name
+            entry["arguments"] = sanitize(arguments)
+            entry["error"] = span.attributes.get("error")
+            self._emit(entry)
+        except Exception as e:
+            logger.warning("Slow log entry for %s failed: %s", tool_name, e)
+
+    def check_request(self, root: Span):
+        """Trace finish hook: log a slow HTTP request not already covered by a slow tool entry."""
+        if not self.is_slow(root.duration_ms):
+            return
+        path = root.attributes.get("http.target", "")
+        if path.startswith(SLOW_LOG_EXCLUDE):
+            return
+        spans = root.descendants()
+        if any(span.name.startswith("tool ") and self.is_slow(span.duration_ms) for span in spans):
+            return
+        entry = self._base_entry("request", root)
+        entry["method"] = root.attributes.get("http.method")
+        entry["path"] = path
+        entry["status"] = root.attributes.get("http.status_code")
+        entry["tools"] = [span.attributes.get("tool") for span in spans if span.name.startswith("tool ")]
+        self._emit(entry)
@@ -0,0 +1,219 @@
+"""
+Prebuilt data snapshot for Resume MCP
+- scripts/build_snapshot.py parses the resume, rulebooks, B Past Life
+  profile, Northstar projects and jobs CSV, plus the compiled matchers, into
+  one versioned pickle (data_snapshot.pkl)
+- At startup install() reads it in a single read and offers each entry to
+  file_cache; an entry is only used while its source is unchanged (same size
+  and mtime, or same sha256 when only the mtime moved, e.g. after a copy)
+- The header records match_rank.matcher_version(); a snapshot built by other
+  matcher compile code is ignored, so its pickled matchers are never reused
+- The jobs DataFrame is stored as a nested pickle and decoded (importing
+  pandas) only when the job index is first needed
+- If no fresh snapshot is found, a rebuilt copy is written to
+  SNAPSHOT_TMP_FILE so later cold starts on the same instance load in one read
+"""
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import file_cache
+import match_rank
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout changes; snapshots with another format are ignored
+SNAPSHOT_FORMAT = 1
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Bundled snapshot built by scripts/build_snapshot.py (empty disables snapshots)
+SNAPSHOT_FILE = os.getenv("SNAPSHOT_FILE", str(PROJECT_ROOT / "data_snapshot.pkl"))
+
+# Instance-local copy, rewritten when the bundled snapshot is missing or stale
+SNAPSHOT_TMP_FILE = os.getenv("SNAPSHOT_TMP_FILE", "/tmp/resume-mcp-snapshot.pkl")
+
+# Source files (relative to the project root) and their formats
+SOURCES = {
+    "resume.json": "json",
+    "rulebook.yaml": "yaml",
+    "b_past_life_mcp/resume.json": "json",
+    "b_past_life_mcp/rulebook.yaml": "yaml",
+    "northstar_mcp/projects.json": "json",
+    "jobs_clean.csv": "csv",
+}
+
+# Sources that have a compiled matcher in match_rank
+MATCHERS = {
+    "resume.json": ("resume", match_rank.compiled_resume),
+    "rulebook.yaml": ("rulebook", match_rank.compiled_rulebook),
+}
+
+PARSERS = {
+    "json": file_cache.read_json,
+    "yaml": file_cache.read_yaml,
+    "csv": lambda path: match_rank.pd.read_csv(path),
+}
+
+# What install() found; reported by /readyz
+status: Dict[str, Any] = {"source": None, "entries": 0, "refresh": False, "refreshed": False}
+
+_refresh_lock = threading.Lock()
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build(root: Path = PROJECT_ROOT) -> bytes:
+    """Serialize every source that exists under root (parsed through file_cache)."""
+    entries: Dict[str, Dict[str, Any]] = {}
+    for rel, kind in SOURCES.items():
+        path = root / rel
+        if not path.exists():
+            continue
+        stat = path.stat()
+        value = file_cache.load_cached(path, PARSERS[kind])
+        entry: Dict[str, Any] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _sha256(path)}
+        if kind == "csv":
+            # Nested so reading the snapshot doesn't import pandas
+            entry["pickle"] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            entry["pandas"] = metadata.version("pandas")
+        else:
+            entry["value"] = value
+        if rel in MATCHERS:
+            entry["matcher"] = MATCHERS[rel][1](value)
+        entries[rel] = entry
+    return pickle.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "python": list(sys.version_info[:2]),
+        "matchers": match_rank.matcher_version(),
+        "created": time.time(),
+        "entries": entries,
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_snapshot(path: str, private: bool = False) -> Optional[Dict[str, Any]]:
+    """Load a snapshot file, or None if it's missing, unreadable, another format or built by other matcher code."""
+    try:
+        if private:
+            # /tmp is shared: only trust a copy this user wrote and nobody else can modify
+            stat = os.stat(path)
+            if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+                logger.warning("Ignoring snapshot %s: not owned by this user or writable by others", path)
+                return None
+        with open(path, "rb") as f:
+            snapshot = pickle.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return None
+    if snapshot.get("format") != SNAPSHOT_FORMAT or snapshot.get("python") != list(sys.version_info[:2]):
+        return None
+    if snapshot.get("matchers") != match_rank.matcher_version():
+        logger.info("Ignoring snapshot %s: built by other matcher code; rebuild it with scripts/build_snapshot.py", path)
+        return None
+    return snapshot
+
+
+def _unchanged(entry: Dict[str, Any], stat: os.stat_result) -> bool:
+    return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]
+
+
+def _all_unchanged(snapshot: Dict[str, Any], root: Path) -> bool:
+    for rel in SOURCES:
+        path = root / rel
+        entry = snapshot["entries"].get(rel)
+        if entry is None:
+            if path.exists():
+                return False
+            continue
+        try:
+            if not _unchanged(entry, path.stat()):
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def _produce(rel: str, entry: Dict[str, Any]):
+    def produce():
+        if "pickle" in entry:
+            return pickle.loads(entry["pickle"])
+        value = entry["value"]
+        if rel in MATCHERS:
+            match_rank.seed_compiled(MATCHERS[rel][0], value, entry["matcher"])
+        return value
+
+    return produce
+
+
+def _check(entry: Dict[str, Any]):
+    def check(path: Path, stat: os.stat_result) -> bool:
+        if stat.st_size != entry["size"]:
+            return False
+        if "pandas" in entry and entry["pandas"] != metadata.version("pandas"):
+            return False
+        return stat.st_mtime_ns == entry["mtime_ns"] or _sha256(path) == entry["sha256"]
+
+    return check
+
+
+def install(root: Path = PROJECT_ROOT) -> Dict[str, Any]:
+    """
+    Offer the freshest available snapshot to file_cache.
+
+    The bundled file is preferred; the /tmp copy is read only when the bundled
+    one is missing or some source changed since it was built.
+    """
+    if not SNAPSHOT_FILE:
+        return status
+
+    chosen = None
+    for path, private in ((SNAPSHOT_FILE, False), (SNAPSHOT_TMP_FILE, True)):
+        if not path:
+            continue
+        snapshot = read_snapshot(path, private)
+        if snapshot is None:
+            continue
+        if _all_unchanged(snapshot, root):
+            chosen = (path, snapshot)
+            break
+        if chosen is None:
+            # Usable per entry (checked at load time), but worth refreshing
+            chosen = (path, snapshot)
+
+    if chosen is None:
+        status.update(source=None, entries=0, refresh=bool(SNAPSHOT_TMP_FILE))
+        return status
+
+    path, snapshot = chosen
+    for rel, entry in snapshot["entries"].items():
+        file_cache.offer(root / rel, _produce(rel, entry), _check(entry))
+    status.update(source=path, entries=len(snapshot["entries"]), refresh=bool(SNAPSHOT_TMP_FILE) and not _all_unchanged(snapshot, root))
+    return status
+
+
+def refresh_copy(root: Path = PROJECT_ROOT):
+    """Rewrite SNAPSHOT_TMP_FILE in the background if install() found no fresh snapshot (once per process)."""
+    with _refresh_lock:
+        if not status["refresh"] or status["refreshed"]:
+            return
+        status["refreshed"] = True
+    threading.Thread(target=_write_copy, args=(root,), name="snapshot-refresh", daemon=True).start()
+
+
+def _write_copy(root: Path):
+    try:
+        file_cache.atomic_write_bytes(SNAPSHOT_TMP_FILE, build(root), mode=0o600)
+        logger.info("Wrote data snapshot copy to %s", SNAPSHOT_TMP_FILE)
+    except Exception as e:
+        logger.warning("Could not write data snapshot copy to %s: %s", SNAPSHOT_TMP_FILE, e)
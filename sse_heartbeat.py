@@ -0,0 +1,73 @@
+"""
+Shared SSE heartbeat for the MCP servers in this repo
+- One ticker task per process instead of one sleep loop per connection
+- Broadcasts a pre-encoded keepalive frame to every subscribed stream queue
+- Tracks connection counts for monitoring
+- Vendored into b_past_life_mcp/ and northstar_mcp/ so each server deploys on
+  its own; edit this copy and copy it over (tests/test_sse_heartbeat.py checks
+  the copies match)
+"""
+import asyncio
+import os
+from typing import Any, Dict, Optional, Set
+
+# Seconds between keepalive broadcasts
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+
+# SSE comment line; clients ignore it but proxies see traffic on the socket
+HEARTBEAT_FRAME = ": ping\n\n"
+
+
+class HeartbeatScheduler:
+    """Broadcasts one keepalive frame to all subscribers at a fixed interval."""
+
+    def __init__(self, interval: float = SSE_HEARTBEAT_INTERVAL, frame: str = HEARTBEAT_FRAME):
+        self.interval = interval
+        self.frame = frame
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.total_connections = 0
+        self.ticks = 0
+        self.skipped = 0
+
+    def subscribe(self, queue: asyncio.Queue):
+        """Start delivering heartbeats into a stream's queue."""
+        self._subscribers.add(queue)
+        self.total_connections += 1
+        # Started lazily so the ticker always runs on the serving event loop
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Stop delivering heartbeats to a queue (call when the stream ends)."""
+        self._subscribers.discard(queue)
+
+    async def _run(self):
+        """Tick until the last subscriber leaves."""
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            self.ticks += 1
+            for queue in list(self._subscribers):
+                try:
+                    queue.put_nowait(self.frame)
+                except asyncio.QueueFull:
+                    # Reader already has frames pending; it doesn't need a keepalive
+                    self.skipped += 1
+        self._task = None
+
+    @property
+    def connections(self) -> int:
+        return len(self._subscribers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection and ticker counters."""
+        return {
+            "open_connections": self.connections,
+            "total_connections": self.total_connections,
+            "heartbeat_interval": self.interval,
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+        }
+
+
+heartbeat = HeartbeatScheduler()
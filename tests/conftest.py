@@ -0,0 +1,42 @@
+"""
+Shared pytest setup
+- Makes the project root importable so tests can import server modules
+  directly, however pytest is invoked
+- client: TestClient for server_http; OWNER_HEADERS / PUBLIC_HEADERS auth it
+- Every test starts with empty rate-limit buckets
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from auth_middleware import OWNER_API_KEY, PUBLIC_API_KEY
+
+OWNER_HEADERS = {"Authorization": f"Bearer {OWNER_API_KEY}"}
+PUBLIC_HEADERS = {"Authorization": f"Bearer {PUBLIC_API_KEY}"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient for the main server, with startup (warmup) run once per session."""
+    from fastapi.testclient import TestClient
+    import server_http
+
+    with TestClient(server_http.http_app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limits(monkeypatch):
+    """Give every test empty token buckets so earlier tests can't exhaust them."""
+    from rate_limit import MemoryBucketStore, rate_limiter
+
+    store = MemoryBucketStore()
+    monkeypatch.setattr(rate_limiter, "store", store)
+    monkeypatch.setattr(rate_limiter, "fallback", store)
+    return store
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+MCP cancellation
+
+Checks the in-flight registry (scopes, duplicate ids, cleanup) and that on
+/mcp a notifications/cancelled sent as a separate request, from another
+connection, stops the call in the same Mcp-Session-Id and no other.
+
+Run: python -m pytest tests/test_cancellation.py
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import server_http
+from cancellation import DuplicateRequestId, InFlightRequests, RequestCancelled, inflight
+from conftest import PUBLIC_HEADERS
+
+
+def _call(request_id, name, arguments=None):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": {"name": name, "arguments": arguments or {}}}
+
+
+def _cancel(request_id):
+    return {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": request_id, "reason": "test"}}
+
+
+def test_cancel_only_reaches_its_scope():
+    registry = InFlightRequests()
+    with registry.track("a", 1) as token:
+        assert not registry.cancel("b", 1)
+        assert not token.cancelled
+        assert registry.cancel("a", 1, "stop")
+        assert token.cancelled
+        with pytest.raises(RequestCancelled, match="stop"):
+            token.check()
+    assert len(registry) == 0
+    assert not registry.cancel("a", 1)
+    assert registry.cancelled == 1
+
+
+def test_duplicate_id_in_one_scope_is_rejected():
+    registry = InFlightRequests()
+    with registry.track("a", "x"):
+        with pytest.raises(DuplicateRequestId):
+            with registry.track("a", "x"):
+                pass
+        with registry.track("b", "x"):
+            pass
+    with registry.track("a", "x"):
+        pass
+
+
+@pytest.fixture
+def cancellable_tool(monkeypatch):
+    """Replace heavy tool execution with a loop that polls its cancel token."""
+    state = {"started": 0}
+
+    def run_mcp_tool(tool_name, arguments, notify=None, progress=None, cancel=None, deadline=None):
+        state["started"] += 1
+        stop = time.monotonic() + arguments.get("seconds", 2)
+        while time.monotonic() < stop:
+            cancel.check()
+            time.sleep(0.01)
+        return {"finished": True}
+
+    monkeypatch.setattr(server_http, "run_mcp_tool", run_mcp_tool)
+    return state
+
+
+def _connection(port):
+    transport = httpx.ASGITransport(app=server_http.http_app, client=("10.0.0.1", port))
+    return httpx.AsyncClient(transport=transport, base_url="http://testserver", headers=PUBLIC_HEADERS)
+
+
+async def _session(http):
+    response = await http.post("/mcp", json={"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}})
+    assert response.status_code == 200
+    return response.headers["mcp-session-id"]
+
+
+async def _started(state, count=1):
+    while state["started"] < count:
+        await asyncio.sleep(0.01)
+
+
+def test_initialize_issues_session_id(client):
+    first = client.post("/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}, headers=PUBLIC_HEADERS)
+    second = client.post("/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}, headers=PUBLIC_HEADERS)
+    assert first.headers["mcp-session-id"] != second.headers["mcp-session-id"]
+    echoed = client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "tools/list"}, headers={**PUBLIC_HEADERS, "Mcp-Session-Id": "abc"})
+    assert echoed.headers["mcp-session-id"] == "abc"
+    assert "mcp-session-id" not in client.post("/mcp", json={"jsonrpc": "2.0", "id": 3, "method": "tools/list"}, headers=PUBLIC_HEADERS).headers
+    bad = client.post("/mcp", json={"jsonrpc": "2.0", "id": 4, "method": "tools/list"}, headers={**PUBLIC_HEADERS, "Mcp-Session-Id": "a b"})
+    assert bad.status_code == 400
+
+
+def test_cancel_as_separate_request_stops_call(client, cancellable_tool):
+    async def scenario():
+        async with _connection(1111) as caller, _connection(2222) as canceller:
+            session_id = await _session(caller)
+            call = asyncio.create_task(caller.post("/mcp", json=_call("job", "check_job_match"), headers={"Mcp-Session-Id": session_id}))
+            await _started(cancellable_tool)
+            cancelled = inflight.cancelled
+            response = await canceller.post("/mcp", json=_cancel("job"), headers={"Mcp-Session-Id": session_id})
+            assert response.status_code == 202
+            return await call, inflight.cancelled - cancelled
+
+    started = time.monotonic()
+    response, cancelled = asyncio.run(scenario())
+    assert cancelled == 1
+    # Cancelled requests get no JSON-RPC response
+    assert response.status_code == 202
+    assert time.monotonic() - started < 1.5
+
+
+def test_cancel_from_other_session_is_ignored(client, cancellable_tool):
+    async def scenario():
+        async with _connection(1111) as caller, _connection(2222) as other:
+            session_id = await _session(caller)
+            other_id = await _session(other)
+            call = asyncio.create_task(caller.post("/mcp", json=_call("job", "check_job_match", {"seconds": 0.3}), headers={"Mcp-Session-Id": session_id}))
+            await _started(cancellable_tool)
+            await other.post("/mcp", json=_cancel("job"), headers={"Mcp-Session-Id": other_id})
+            await other.post("/mcp", json=_cancel("job"))
+            return await call
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert "result" in response.json()
+
+
+def test_duplicate_id_in_session_is_rejected(client, cancellable_tool):
+    async def scenario():
+        async with _connection(1111) as caller:
+            session_id = await _session(caller)
+            headers = {"Mcp-Session-Id": session_id}
+            first = asyncio.create_task(caller.post("/mcp", json=_call("job", "check_job_match", {"seconds": 0.3}), headers=headers))
+            await _started(cancellable_tool)
+            second = await caller.post("/mcp", json=_call("job", "check_job_match", {"seconds": 0}), headers=headers)
+            return await first, second
+
+    first, second = asyncio.run(scenario())
+    assert "result" in first.json()
+    assert second.json()["error"]["code"] == -32600
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Response compression middleware
+
+Checks Accept-Encoding negotiation, that compressed responses carry
+Content-Encoding, Vary and a weak ETag, that small and streamed responses
+pass through, and that repeat bodies come from the compressed-body cache.
+
+Run: python -m pytest tests/test_compression.py
+"""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from compression_middleware import CompressedBodyCache, CompressionMiddleware
+
+BIG = b"resume " * 1000
+
+
+@pytest.fixture
+def cache():
+    return CompressedBodyCache()
+
+
+@pytest.fixture
+def app_client(cache):
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return Response(BIG, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return Response(b"{}", media_type="application/json")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BIG]), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, cache=cache)
+    return TestClient(app)
+
+
+def _get(app_client, path, accept_encoding):
+    # Read the raw body so the test client doesn't decode it
+    with app_client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_negotiate_honours_q_values():
+    middleware = CompressionMiddleware(None)
+    assert middleware.negotiate("gzip") == "gzip"
+    assert middleware.negotiate("") is None
+    assert middleware.negotiate("identity") is None
+    assert middleware.negotiate("gzip;q=0") is None
+    assert middleware.negotiate("*;q=0") is None
+    assert middleware.negotiate("*") in middleware.codecs
+    assert middleware.negotiate("deflate, gzip;q=0.5") == "gzip"
+
+
+def test_large_body_is_compressed_with_vary_and_weak_etag(app_client):
+    response, body = _get(app_client, "/big", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"] == 'W/"v1"'
+    assert int(response.headers["content-length"]) == len(body)
+    assert gzip.decompress(body) == BIG
+
+
+def test_identity_small_and_streamed_bodies_pass_through(app_client):
+    response, body = _get(app_client, "/big", "identity")
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+    assert body == BIG
+
+    response, body = _get(app_client, "/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body == b"{}"
+
+    response, body = _get(app_client, "/stream", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body == BIG
+
+
+def test_repeat_body_is_served_from_cache(app_client, cache):
+    _get(app_client, "/big", "gzip")
+    _, body = _get(app_client, "/big", "gzip")
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert gzip.decompress(body) == BIG
+
+
+def test_cache_evicts_to_stay_under_budget():
+    cache = CompressedBodyCache(max_bytes=10)
+    for n in range(5):
+        cache.get_or_compress(bytes([n]) * 4, "x", lambda data: data)
+    assert sum(len(v) for v in cache._entries.values()) <= 10
+    assert cache.get_or_compress(b"\x04" * 4, "x", lambda data: data) == b"\x04" * 4
+    assert cache.hits == 1
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+deadline_ms partial rankings
+
+Checks an expired deadline still scores one chunk, newest jobs first, and
+reports partial: true without replacing the stored ranking; a generous one
+scans everything; and match_jobs validates deadline_ms.
+
+Run: python -m pytest tests/test_deadline.py
+"""
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from conftest import OWNER_HEADERS, PROJECT_ROOT, PUBLIC_HEADERS
+from match_rank import iter_match_and_rank, load_jobs
+from result_store import MemoryBackend, ResultStore
+
+FILES = {
+    "jobs_file": str(PROJECT_ROOT / "jobs_clean.csv"),
+    "resume_file": str(PROJECT_ROOT / "resume.json"),
+    "rulebook_file": str(PROJECT_ROOT / "rulebook.yaml"),
+}
+
+CHUNK = 50
+
+pytestmark = pytest.mark.skipif(not os.path.exists(FILES["jobs_file"]), reason="jobs_clean.csv not built")
+
+
+def _result(**kwargs):
+    events = list(iter_match_and_rank(top_n=5, shortlist_file=None, discard_file=None, chunk_size=CHUNK, **FILES, **kwargs))
+    return events[-1]
+
+
+def test_expired_deadline_scores_newest_chunk():
+    store = ResultStore(MemoryBackend())
+    result = _result(deadline=time.monotonic() - 1, store=store)
+    assert result["scanned"] == min(CHUNK, result["total"])
+    assert result["partial"] == (result["total"] > CHUNK)
+    assert result["scanned_fraction"] == round(result["scanned"] / result["total"], 4)
+    # A partial scan never replaces the stored complete ranking
+    assert store.get("shortlist") is None
+
+    df = load_jobs(FILES["jobs_file"])
+    if "published" in df.columns:
+        published = pd.to_datetime(df["published"], errors="coerce", utc=True)
+        newest = published.sort_values(ascending=False, na_position="last").iloc[CHUNK - 1]
+        for job in result["shortlist"]:
+            assert pd.to_datetime(job["published"], utc=True) >= newest
+
+
+def test_generous_deadline_scans_everything():
+    full = _result()
+    timed = _result(deadline=time.monotonic() + 600)
+    assert not timed["partial"]
+    assert timed["scanned_fraction"] == 1.0
+    assert [job["match_score"] for job in timed["shortlist"]] == [job["match_score"] for job in full["shortlist"]]
+
+
+def test_match_jobs_deadline_ms(client):
+    response = client.post("/call", json={"name": "match_jobs", "arguments": {"deadline_ms": 1}}, headers=PUBLIC_HEADERS)
+    assert response.status_code == 200
+    result = response.json()["result"]
+    assert "partial" in result and 0 < result["scanned_fraction"] <= 1
+    # The owner isn't rate limited, so every bad value reaches validation
+    for bad in (0, -5, "100", True):
+        response = client.post("/call", json={"name": "match_jobs", "arguments": {"deadline_ms": bad}}, headers=OWNER_HEADERS)
+        assert response.status_code == 400
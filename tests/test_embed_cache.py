@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Embedding cache in langchains/resume_embed_chain.py
+
+Checks cached texts are not re-encoded and that an unusable cache database
+falls back to encoding instead of failing the embedding.
+
+Run: python -m pytest tests/test_embed_cache.py
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("dotenv")
+
+from langchains import resume_embed_chain
+
+
+class CountingModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return [np.full(3, len(text), dtype=np.float32) for text in texts]
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = CountingModel()
+    monkeypatch.setattr(resume_embed_chain, "get_model", lambda model_id=None: model)
+    return model
+
+
+def test_cached_texts_are_not_reencoded(tmp_path, monkeypatch, model):
+    monkeypatch.setattr(resume_embed_chain, "embedding_cache", resume_embed_chain.EmbeddingCache(str(tmp_path / "cache.db")))
+    assert resume_embed_chain.embed_texts(["ab", "abc", "ab"]) == [[2.0] * 3, [3.0] * 3, [2.0] * 3]
+    assert resume_embed_chain.embed_texts(["abc", "abcd"]) == [[3.0] * 3, [4.0] * 3]
+    assert model.encoded == ["ab", "abc", "abcd"]
+
+
+def test_unusable_cache_falls_back_to_encoding(tmp_path, monkeypatch, model):
+    # A directory can't be opened as a database: every cache call raises sqlite3.Error
+    monkeypatch.setattr(resume_embed_chain, "embedding_cache", resume_embed_chain.EmbeddingCache(str(tmp_path)))
+    assert resume_embed_chain.embed_texts(["ab", "abc"]) == [[2.0] * 3, [3.0] * 3]
+    assert model.encoded == ["ab", "abc"]
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Fast JSON encoding (fast_json.py)
+
+Checks the orjson and stdlib paths produce the same bytes, including for
+NaN/Infinity and numpy scalars.
+
+Run: python -m pytest tests/test_fast_json.py
+"""
+import json
+
+import pytest
+
+import fast_json
+
+PAYLOAD = {
+    "score": float("nan"),
+    "bounds": [float("inf"), -float("inf"), 1.5],
+    "nested": {"title": "Data Engineer – Remote", "ok": True, "missing": None},
+}
+
+
+@pytest.fixture
+def stdlib_only(monkeypatch):
+    monkeypatch.setattr(fast_json, "orjson", None)
+
+
+def test_stdlib_fallback_writes_null_for_non_finite(stdlib_only):
+    encoded = fast_json.dumps(PAYLOAD)
+    assert json.loads(encoded)["score"] is None
+    assert json.loads(encoded)["bounds"] == [None, None, 1.5]
+    assert "NaN" not in encoded and "Infinity" not in encoded
+
+
+def test_stdlib_fallback_handles_numpy_nan(stdlib_only):
+    np = pytest.importorskip("numpy")
+    assert fast_json.dumps({"score": np.float64("nan"), "rank": np.int64(3)}) == '{"score":null,"rank":3}'
+
+
+def test_both_paths_match():
+    pytest.importorskip("orjson")
+    with_orjson = fast_json.dumps_bytes(PAYLOAD)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(fast_json, "orjson", None)
+        without = fast_json.dumps_bytes(PAYLOAD)
+    assert with_orjson == without
+
+
+def test_indent_keeps_output_parseable(stdlib_only):
+    assert json.loads(fast_json.dumps(PAYLOAD, indent=2))["bounds"][2] == 1.5
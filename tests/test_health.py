@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Liveness and readiness probes (/healthz, /readyz)
+
+Run: python -m pytest tests/test_health.py
+"""
+import asyncio
+import time
+
+import server_http
+from rank_pool import RankPool
+
+
+def _wait_ready(client):
+    for _ in range(100):
+        response = client.get("/readyz")
+        if response.status_code == 200:
+            return response
+        time.sleep(0.1)
+    return response
+
+
+def test_healthz_is_always_ok(client):
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_readyz_reports_loaded_data(client):
+    response = _wait_ready(client)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready" and body["error"] is None
+    assert body["loaded"]["jobs"] > 0
+
+
+def test_failed_warmup_stays_not_ready(client, monkeypatch):
+    def broken_warmup():
+        raise FileNotFoundError("jobs_clean.csv")
+
+    monkeypatch.setattr(server_http, "warmup", broken_warmup)
+    monkeypatch.setattr(server_http, "rank_pool", RankPool(processes=0))
+    monkeypatch.setattr(server_http, "warmup_state", {"ready": False, "duration_ms": None, "loaded": {}, "error": None})
+    asyncio.run(server_http._run_warmup())
+
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "failed"
+    assert body["ready"] is False
+    assert "jobs_clean.csv" in body["error"]
+    assert client.get("/healthz").status_code == 200
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+ETag / If-None-Match revalidation on the read endpoints (http_cache.py)
+
+Run: python -m pytest tests/test_http_cache.py
+"""
+from conftest import PUBLIC_HEADERS
+from http_cache import etag_matches
+
+
+def test_etag_matches_weak_and_lists():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_revalidation_returns_304(client):
+    first = client.get("/api/get_resume_info", headers=PUBLIC_HEADERS)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert "private" in first.headers["cache-control"]
+
+    again = client.get("/api/get_resume_info", headers={**PUBLIC_HEADERS, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+
+def test_etag_varies_with_query(client):
+    full = client.get("/api/get_resume_info", headers=PUBLIC_HEADERS)
+    projected = client.get("/api/get_resume_info", params={"fields": "name"}, headers=PUBLIC_HEADERS)
+    assert full.headers["etag"] != projected.headers["etag"]
+    stale = client.get(
+        "/api/get_resume_info", params={"fields": "name"},
+        headers={**PUBLIC_HEADERS, "If-None-Match": full.headers["etag"]},
+    )
+    assert stale.status_code == 200
+
+
+def test_304_is_not_charged(client, fresh_rate_limits):
+    etag = client.get("/api/get_skills", headers=PUBLIC_HEADERS).headers["etag"]
+    fresh_rate_limits._buckets.clear()
+    cached = client.get("/api/get_skills", headers={**PUBLIC_HEADERS, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert not fresh_rate_limits._buckets
+
+
+def test_full_project_list_revalidates(client):
+    first = client.get("/api/list_projects", headers=PUBLIC_HEADERS)
+    assert first.status_code == 200
+    again = client.get("/api/list_projects", headers={**PUBLIC_HEADERS, "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_paginated_projects_are_not_cached(client):
+    # A 304 would leave the client holding an expired next_cursor
+    page = client.get("/api/list_projects", params={"limit": 1}, headers=PUBLIC_HEADERS)
+    assert page.status_code == 200
+    assert "etag" not in page.headers
+    assert page.headers["cache-control"] == "no-store"
+    assert page.json()["next_cursor"]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget for the Vercel entry point (api/index.py)
+
+Imports api/index.py in fresh interpreters and fails if the import takes
+longer than IMPORT_BUDGET_MS or pulls in modules that should load lazily.
+
+Run: python -m pytest tests/test_import_budget.py
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Best of IMPORT_BUDGET_RUNS cold imports must fit in this budget
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+IMPORT_BUDGET_RUNS = int(os.getenv("IMPORT_BUDGET_RUNS", "3"))
+
+# Loaded on first use, never at import time
+LAZY_MODULES = ("pandas", "yaml")
+
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import api.index
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    "ms": elapsed_ms,
+    "handler": hasattr(api.index, "handler"),
+    "loaded": [name for name in {lazy!r} if name in sys.modules],
+    "b_past_life_loaded": getattr(getattr(sys.modules.get("server_http"), "b_past_life_match_rank", None), "loaded", True),
+}}))
+"""
+
+
+def _cold_import():
+    probe = _PROBE.format(root=str(PROJECT_ROOT), lazy=LAZY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def cold_imports():
+    pytest.importorskip("mangum")
+    return [_cold_import() for _ in range(IMPORT_BUDGET_RUNS)]
+
+
+def test_entry_point_imports_server(cold_imports):
+    # api/index.py swaps in an error app when server_http fails to import
+    assert all(run["handler"] for run in cold_imports)
+
+
+def test_heavy_modules_stay_lazy(cold_imports):
+    assert cold_imports[0]["loaded"] == []
+    assert not cold_imports[0]["b_past_life_loaded"]
+
+
+def test_cold_import_within_budget(cold_imports):
+    fastest = min(run["ms"] for run in cold_imports)
+    assert fastest <= IMPORT_BUDGET_MS, f"cold import took {fastest:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
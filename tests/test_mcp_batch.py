@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+JSON-RPC batches on /mcp
+
+Checks batch responses keep request order, skip notifications, run heavy
+calls concurrently, and that a batch larger than the batch class's queue
+waits for its own calls instead of being rejected as busy.
+
+Run: python -m pytest tests/test_mcp_batch.py
+"""
+import threading
+import time
+
+import pytest
+
+import server_http
+from conftest import PUBLIC_HEADERS
+from scheduler import BATCH_PRIORITY, scheduler
+
+
+def _call(request_id, name, arguments=None):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": {"name": name, "arguments": arguments or {}}}
+
+
+@pytest.fixture
+def slow_heavy_tool(monkeypatch):
+    """Replace heavy tool execution with a short sleep that records peak concurrency."""
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def run_mcp_tool(tool_name, arguments, *args, **kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return {"tool": tool_name, "n": arguments.get("n")}
+
+    monkeypatch.setattr(server_http, "run_mcp_tool", run_mcp_tool)
+    return state
+
+
+def test_batch_keeps_order_and_drops_notifications(client):
+    body = [
+        {"jsonrpc": "2.0", "id": "a", "method": "tools/list"},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        _call("b", "get_skills"),
+        {"jsonrpc": "2.0", "id": "c", "method": "no/such_method"},
+    ]
+    response = client.post("/mcp", json=body, headers=PUBLIC_HEADERS)
+    assert response.status_code == 200
+    replies = response.json()
+    assert [reply["id"] for reply in replies] == ["a", "b", "c"]
+    assert "result" in replies[1]
+    assert replies[2]["error"]["code"] == -32601
+
+
+def test_empty_and_oversized_batches_are_rejected(client):
+    assert client.post("/mcp", json=[], headers=PUBLIC_HEADERS).status_code == 400
+    body = [{"jsonrpc": "2.0", "id": i, "method": "tools/list"} for i in range(server_http.MCP_MAX_BATCH_SIZE + 1)]
+    assert client.post("/mcp", json=body, headers=PUBLIC_HEADERS).status_code == 400
+
+
+def test_batch_runs_heavy_calls_concurrently(client, slow_heavy_tool):
+    body = [_call(i, "check_job_match", {"n": i}) for i in range(4)]
+    replies = client.post("/mcp", json=body, headers=PUBLIC_HEADERS).json()
+    assert [reply["id"] for reply in replies] == list(range(4))
+    assert all("result" in reply for reply in replies)
+    assert slow_heavy_tool["peak"] == min(4, scheduler.get(BATCH_PRIORITY).concurrency)
+    assert slow_heavy_tool["peak"] > 1
+
+
+def test_batch_larger_than_queue_is_not_rejected(client, slow_heavy_tool):
+    size = scheduler.get(BATCH_PRIORITY).capacity + 3
+    rejected = scheduler.get(BATCH_PRIORITY).rejected
+    body = [_call(i, "get_shortlist", {"n": i}) for i in range(size)]
+    replies = client.post("/mcp", json=body, headers=PUBLIC_HEADERS).json()
+    assert len(replies) == size
+    assert [reply.get("error") for reply in replies] == [None] * size
+    assert scheduler.get(BATCH_PRIORITY).rejected == rejected
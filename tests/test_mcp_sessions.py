@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+MCP SSE session transport
+
+Checks messages POSTed to /messages are answered on their own session's
+stream, unknown or idle sessions are rejected, the stream announces its
+endpoint first, and a reader that stops draining is closed.
+
+Run: python -m pytest tests/test_mcp_sessions.py
+"""
+import asyncio
+
+import httpx
+import pytest
+
+import mcp_sessions
+import server_http
+from conftest import PUBLIC_HEADERS
+from mcp_sessions import MCPSession, SessionClosed, format_sse, sessions
+
+
+class OpenRequest:
+    """Stands in for the /sse request: a client that stays connected."""
+
+    async def is_disconnected(self):
+        return False
+
+
+def _client():
+    transport = httpx.ASGITransport(app=server_http.http_app)
+    return httpx.AsyncClient(transport=transport, base_url="http://testserver", headers=PUBLIC_HEADERS)
+
+
+def test_format_sse_splits_lines():
+    assert format_sse("a\nb", "message") == "event: message\ndata: a\ndata: b\n\n"
+    assert format_sse("") == "data: \n\n"
+
+
+def test_reply_goes_to_posting_session(client):
+    async def scenario():
+        first, second = sessions.create(), sessions.create()
+        try:
+            async with _client() as http:
+                response = await http.post(f"/messages?session_id={first.id}", json={"jsonrpc": "2.0", "id": 7, "method": "tools/list"})
+                assert response.status_code == 202
+                frame = await asyncio.wait_for(first.queue.get(), 5)
+            return frame, second.queue.qsize()
+        finally:
+            sessions.remove(first.id)
+            sessions.remove(second.id)
+
+    frame, other_queued = asyncio.run(scenario())
+    assert frame.startswith("event: message\ndata: ")
+    assert '"id":7' in frame.replace(" ", "")
+    assert other_queued == 0
+
+
+def test_unknown_and_idle_sessions_are_rejected(client, monkeypatch):
+    async def scenario():
+        async with _client() as http:
+            missing = await http.post("/messages?session_id=nope", json={"jsonrpc": "2.0", "id": 1, "method": "ping"})
+            session = sessions.create()
+            monkeypatch.setattr(mcp_sessions, "SESSION_IDLE_TIMEOUT", -1)
+            idle = await http.post(f"/messages?session_id={session.id}", json={"jsonrpc": "2.0", "id": 1, "method": "ping"})
+            return missing.status_code, idle.status_code, session.closed
+
+    missing, idle, closed = asyncio.run(scenario())
+    assert missing == 404
+    assert idle == 404
+    assert closed
+
+
+def test_stream_announces_endpoint_then_ends_on_close():
+    async def scenario():
+        session = sessions.create()
+        stream = session.stream(OpenRequest(), f"/messages?session_id={session.id}")
+        first = await stream.__anext__()
+        await session.send({"jsonrpc": "2.0", "id": 1, "result": {}})
+        second = await stream.__anext__()
+        session.close()
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        return session.id, first, second
+
+    session_id, first, second = asyncio.run(scenario())
+    assert first == f"event: endpoint\ndata: /messages?session_id={session_id}\n\n"
+    assert second.startswith("event: message\n")
+    assert sessions.get(session_id) is None
+
+
+def test_stuck_reader_closes_session(monkeypatch):
+    monkeypatch.setattr(mcp_sessions, "SESSION_QUEUE_SIZE", 1)
+    monkeypatch.setattr(mcp_sessions, "SESSION_SEND_TIMEOUT", 0.05)
+
+    async def scenario():
+        session = MCPSession("stuck")
+        await session.send({"n": 1})
+        with pytest.raises(SessionClosed):
+            await session.send({"n": 2})
+        with pytest.raises(SessionClosed):
+            await session.send({"n": 3})
+        return session.closed
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Cursor pagination and field projection
+
+Checks pages walk the whole list computing it once, cursors are bound to
+the tool that issued them and keep its projection, and expired, evicted or
+malformed cursors are rejected.
+
+Run: python -m pytest tests/test_pagination.py
+"""
+import pytest
+
+import pagination
+from pagination import PaginationError, ResultCache, paginate
+
+RECORDS = [{"name": f"p{n}", "n": n, "url": f"/p{n}"} for n in range(5)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = ResultCache()
+    monkeypatch.setattr(pagination, "result_cache", cache)
+    return cache
+
+
+def _compute(calls):
+    def compute():
+        calls.append(1)
+        return RECORDS
+    return compute
+
+
+def test_pages_cover_list_and_compute_once():
+    calls = []
+    page = paginate("projects", _compute(calls), limit=2, scope="list_projects")
+    names = [record["name"] for record in page["projects"]]
+    while page["next_cursor"]:
+        page = paginate("projects", _compute(calls), limit=2, cursor=page["next_cursor"], scope="list_projects")
+        names += [record["name"] for record in page["projects"]]
+    assert names == [record["name"] for record in RECORDS]
+    assert page["total"] == 5
+    assert len(calls) == 1
+
+
+def test_unpaged_result_keeps_old_shape():
+    assert paginate("projects", lambda: RECORDS) == {"projects": RECORDS, "count": 5}
+
+
+def test_cursor_keeps_projection_and_extra():
+    first = paginate("projects", lambda: RECORDS, fields="name", limit=2, extra={"source": "a"}, scope="list_projects")
+    second = paginate("projects", lambda: RECORDS, limit=2, cursor=first["next_cursor"], scope="list_projects")
+    assert second["projects"] == [{"name": "p2"}, {"name": "p3"}]
+    assert second["source"] == "a"
+    third = paginate("projects", lambda: RECORDS, fields=["n"], cursor=second["next_cursor"], scope="list_projects")
+    assert third["projects"] == [{"n": 4}]
+    assert third["next_cursor"] is None
+
+
+def test_cursor_is_bound_to_its_tool():
+    page = paginate("projects", lambda: RECORDS, limit=2, scope="list_projects")
+    with pytest.raises(PaginationError, match="another tool"):
+        paginate("projects", lambda: RECORDS, limit=2, cursor=page["next_cursor"], scope="search_projects")
+    with pytest.raises(PaginationError, match="another tool"):
+        paginate("jobs", lambda: RECORDS, limit=2, cursor=page["next_cursor"], scope="list_projects")
+
+
+def test_expired_evicted_and_bad_cursors_are_rejected(monkeypatch):
+    monkeypatch.setattr(pagination, "result_cache", ResultCache(ttl=-1))
+    page = paginate("projects", lambda: RECORDS, limit=2)
+    with pytest.raises(PaginationError, match="expired"):
+        paginate("projects", lambda: RECORDS, cursor=page["next_cursor"])
+
+    monkeypatch.setattr(pagination, "result_cache", ResultCache(max_entries=1))
+    old = paginate("projects", lambda: RECORDS, limit=2)
+    paginate("projects", lambda: RECORDS, limit=2)
+    with pytest.raises(PaginationError, match="expired"):
+        paginate("projects", lambda: RECORDS, cursor=old["next_cursor"])
+
+    with pytest.raises(PaginationError, match="Invalid cursor"):
+        paginate("projects", lambda: RECORDS, cursor="!!!")
+    with pytest.raises(PaginationError):
+        paginate("projects", lambda: RECORDS, limit=0)
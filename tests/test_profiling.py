@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Owner-only request profiling (profiling.py, /api/profile)
+
+Checks only the owner API key can turn profiling on or read profiles; public
+keys and the spoofable x-vercel-user header are ignored or refused.
+
+Run: python -m pytest tests/test_profiling.py
+"""
+import pytest
+
+import profiling
+from conftest import OWNER_HEADERS, PUBLIC_HEADERS
+
+SPOOFED_HEADERS = {**PUBLIC_HEADERS, "x-vercel-user": "anyone"}
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize("headers", [PUBLIC_HEADERS, SPOOFED_HEADERS, {"x-vercel-user": "anyone"}])
+def test_flag_ignored_without_owner_key(client, profile_dir, headers):
+    response = client.get("/api/get_skills", params={"profile": "1"}, headers={**PUBLIC_HEADERS, **headers})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert not list(profile_dir.iterdir())
+
+
+@pytest.mark.parametrize("headers", [PUBLIC_HEADERS, SPOOFED_HEADERS, {"x-vercel-user": "anyone"}])
+def test_profile_endpoint_refuses_without_owner_key(client, headers):
+    response = client.get("/api/profile", params={"profile_id": "nope"}, headers=headers)
+    assert response.status_code == 403
+
+
+def test_owner_key_profiles_and_reads_back(client, profile_dir):
+    response = client.get("/api/get_skills", headers={**OWNER_HEADERS, "X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+    assert (profile_dir / f"{profile_id}.pstats").exists()
+
+    summary = client.get("/api/profile", params={"profile_id": profile_id}, headers=OWNER_HEADERS)
+    assert summary.status_code == 200
+    assert "function calls" in summary.text
+
+
+def test_profile_ids_cannot_escape_dir(client):
+    response = client.get("/api/profile", params={"profile_id": "../etc/passwd"}, headers=OWNER_HEADERS)
+    assert response.status_code == 404
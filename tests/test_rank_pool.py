@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Ranking process pool (rank_pool.py)
+
+Checks chunks scored in forked processes give the same ranking as scoring on
+the calling thread, and that a disabled or broken pool falls back to threads.
+
+Run: python -m pytest tests/test_rank_pool.py
+"""
+import os
+import signal
+import time
+
+import pytest
+
+from conftest import PROJECT_ROOT, PUBLIC_HEADERS
+from match_rank import iter_match_and_rank
+from rank_pool import RankPool, rank_pool
+
+FILES = {
+    "jobs_file": str(PROJECT_ROOT / "jobs_clean.csv"),
+    "resume_file": str(PROJECT_ROOT / "resume.json"),
+    "rulebook_file": str(PROJECT_ROOT / "rulebook.yaml"),
+}
+
+pytestmark = pytest.mark.skipif(not os.path.exists(FILES["jobs_file"]), reason="jobs_clean.csv not built")
+
+
+def _rank(pool=None, **kwargs):
+    events = list(iter_match_and_rank(top_n=5, shortlist_file=None, discard_file=None, chunk_size=100, pool=pool, **FILES, **kwargs))
+    return events[-1], [event for event in events if event["event"] == "progress"]
+
+
+@pytest.fixture
+def pool():
+    pool = RankPool(processes=2)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_matches_inline_ranking(pool):
+    assert pool.running
+    inline, inline_progress = _rank()
+    pooled, pooled_progress = _rank(pool)
+    assert pooled["shortlist"] == inline["shortlist"]
+    assert pooled_progress == inline_progress
+    assert pool.chunks == len(pooled_progress) and pool.fallbacks == 0
+
+
+def test_disabled_pool_scores_on_thread():
+    pool = RankPool(processes=0)
+    pool.start()
+    assert not pool.running
+    result, progress = _rank(pool)
+    assert result["count"] == 5
+    assert pool.fallbacks == len(progress) and pool.stats()["processes"] == 0
+
+
+def test_broken_pool_falls_back(pool):
+    inline, _ = _rank()
+    for pid in list(pool._executor._processes):
+        os.kill(pid, signal.SIGKILL)
+    time.sleep(0.2)
+    result, _ = _rank(pool)
+    assert result["shortlist"] == inline["shortlist"]
+    assert not pool.running and pool.fallbacks >= 1
+
+
+def test_server_ranks_through_pool(client):
+    for _ in range(100):
+        if client.get("/readyz").status_code == 200:
+            break
+        time.sleep(0.1)
+    chunks = rank_pool.chunks
+    response = client.post("/call", json={"name": "match_jobs", "arguments": {"top_n": 3}}, headers=PUBLIC_HEADERS)
+    assert response.status_code == 200
+    assert response.json()["result"]["count"] == 3
+    if rank_pool.running:
+        assert rank_pool.chunks > chunks
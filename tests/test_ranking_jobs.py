@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Background ranking jobs
+
+Checks job states (queued until the work starts, then running, done or
+failed), TTL expiry, eviction of the oldest finished job at the limit, and
+that jobs don't report into the submitting request's trace.
+
+Run: python -m pytest tests/test_ranking_jobs.py
+"""
+import asyncio
+
+import pytest
+
+import tracing
+from ranking_jobs import DONE, FAILED, QUEUED, RUNNING, JobLimitReached, JobNotFound, RankingJobs
+
+
+def _runner(started: asyncio.Event, release: asyncio.Event, result="ok"):
+    async def run(job):
+        await started.wait()
+        job.mark_running()
+        await release.wait()
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return run
+
+
+def test_job_states_follow_the_work():
+    async def scenario():
+        jobs = RankingJobs()
+        started, release = asyncio.Event(), asyncio.Event()
+        job = jobs.submit({"top_n": 5}, _runner(started, release))
+        await asyncio.sleep(0)
+        states = [job.state]
+        started.set()
+        await asyncio.sleep(0)
+        states.append(job.state)
+        release.set()
+        while not job.done:
+            await asyncio.sleep(0)
+        states.append(job.state)
+        return jobs, job, states
+
+    jobs, job, states = asyncio.run(scenario())
+    assert states == [QUEUED, RUNNING, DONE]
+    assert job.result == "ok"
+    assert job.started is not None and job.finished >= job.started
+    assert "expires_in" in job.status()
+    assert jobs.get(job.id) is job
+    assert jobs.stats()["completed"] == 1
+
+
+def test_failed_job_reports_error():
+    async def scenario():
+        jobs = RankingJobs()
+        started, release = asyncio.Event(), asyncio.Event()
+        started.set()
+        release.set()
+        job = jobs.submit({}, _runner(started, release, ValueError("Resume or rulebook not found")))
+        await job.task
+        return jobs, job
+
+    jobs, job = asyncio.run(scenario())
+    assert job.state == FAILED
+    assert job.status()["error"] == "Resume or rulebook not found"
+    assert jobs.stats()["failed"] == 1
+
+
+def test_finished_jobs_expire_after_ttl():
+    async def scenario():
+        jobs = RankingJobs(ttl=60)
+        job = jobs.submit({}, lambda job: asyncio.sleep(0, "ok"))
+        await job.task
+        jobs.get(job.id)
+        job.finished -= 61
+        return jobs, job
+
+    jobs, job = asyncio.run(scenario())
+    with pytest.raises(JobNotFound):
+        jobs.get(job.id)
+    with pytest.raises(JobNotFound):
+        jobs.get(None)
+    assert jobs.evicted == 1
+
+
+def test_limit_evicts_oldest_finished_but_never_unfinished():
+    async def scenario():
+        jobs = RankingJobs(max_jobs=2)
+        first = jobs.submit({}, lambda job: asyncio.sleep(0, 1))
+        second = jobs.submit({}, lambda job: asyncio.sleep(0, 2))
+        await asyncio.gather(first.task, second.task)
+        second.finished += 1
+        third = jobs.submit({}, _runner(asyncio.Event(), asyncio.Event()))
+        held_after_third = (first.id in jobs._jobs, second.id in jobs._jobs)
+        fourth = jobs.submit({}, _runner(asyncio.Event(), asyncio.Event()))
+        with pytest.raises(JobLimitReached):
+            jobs.submit({}, _runner(asyncio.Event(), asyncio.Event()))
+        for job in (third, fourth):
+            job.task.cancel()
+        return held_after_third, jobs.evicted
+
+    held_after_third, evicted = asyncio.run(scenario())
+    assert held_after_third == (False, True)
+    assert evicted == 2
+
+
+def test_job_runs_outside_submitting_trace():
+    async def scenario():
+        jobs = RankingJobs()
+
+        async def run(job):
+            return tracing.current_span()
+
+        with tracing.trace("POST /mcp"):
+            job = jobs.submit({}, run)
+        await job.task
+        return job
+
+    assert asyncio.run(scenario()).result is None
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Two-stage RankingPipeline
+
+Checks only the top K stage-1 candidates are reranked, recall@top_n is
+measured against a rerank of every candidate, and the incremental ranking
+gives the same shortlist and report as a whole-corpus pipeline run.
+
+Run: python -m pytest tests/test_ranking_pipeline.py
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import match_rank
+from conftest import PROJECT_ROOT
+from match_rank import RankingPipeline, iter_match_and_rank, load_jobs, load_resume, load_rulebook
+
+FILES = {
+    "jobs_file": str(PROJECT_ROOT / "jobs_clean.csv"),
+    "resume_file": str(PROJECT_ROOT / "resume.json"),
+    "rulebook_file": str(PROJECT_ROOT / "rulebook.yaml"),
+}
+
+
+@pytest.fixture
+def by_bonus(monkeypatch):
+    """A reranker that orders by a 'bonus' column, recording what it was given."""
+    seen = []
+
+    def rerank(df, resume, rulebook):
+        seen.append(len(df))
+        return df.sort_values("bonus", ascending=False, kind="mergesort")
+
+    monkeypatch.setitem(match_rank.RERANKERS, "by_bonus", rerank)
+    return seen
+
+
+def _candidates():
+    # Stage-1 order is by match_score; the reranker prefers the low scorers
+    return pd.DataFrame({"match_score": [9, 8, 7, 6, 5, 4], "bonus": [1, 2, 3, 4, 6, 5]})
+
+
+def test_only_top_k_are_reranked(by_bonus):
+    reranked, report = RankingPipeline("by_bonus", top_k=3).rerank(_candidates(), {}, {}, top_n=2)
+    assert by_bonus == [3]
+    assert list(reranked["bonus"]) == [3, 2, 1]
+    assert report["candidates"] == 3 and report["recall"] is None
+
+
+def test_recall_against_full_rerank(by_bonus):
+    candidates = _candidates()
+    # Full rerank's top 2 are bonus 6 and 5, neither in the top 3 candidates
+    _, report = RankingPipeline("by_bonus", top_k=3, measure_recall=True).rerank(candidates, {}, {}, top_n=2, scored=candidates)
+    assert report["recall"] == 0.0
+    _, report = RankingPipeline("by_bonus", top_k=5, measure_recall=True).rerank(candidates, {}, {}, top_n=2, scored=candidates)
+    assert report["recall"] == 0.5
+    _, report = RankingPipeline("by_bonus", top_k=6, measure_recall=True).rerank(candidates, {}, {}, top_n=2, scored=candidates)
+    assert report["recall"] == 1.0
+
+
+def test_invalid_pipelines_are_rejected():
+    with pytest.raises(ValueError, match="Unknown reranker"):
+        RankingPipeline("nope")
+    with pytest.raises(ValueError):
+        RankingPipeline("word_boundary", top_k=0)
+
+
+@pytest.mark.skipif(not os.path.exists(FILES["jobs_file"]), reason="jobs_clean.csv not built")
+def test_incremental_pipeline_matches_whole_run():
+    pipeline = RankingPipeline("word_boundary", top_k=10, measure_recall=True)
+    events = list(iter_match_and_rank(top_n=5, shortlist_file=None, discard_file=None, chunk_size=100, pipeline=pipeline, **FILES))
+    result = events[-1]
+    reranked, _, report = pipeline.run(load_jobs(FILES["jobs_file"]), load_resume(FILES["resume_file"]), load_rulebook(FILES["rulebook_file"]), top_n=5)
+    assert [job["match_score"] for job in result["shortlist"]] == list(reranked.head(5)["match_score"])
+    assert result["pipeline"]["recall"] == report["recall"]
+    assert result["pipeline"]["passed"] == report["passed"]
+    assert result["pipeline"]["candidates"] == min(10, report["passed"])
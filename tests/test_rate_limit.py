@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Per-principal token-bucket rate limiting
+
+Checks buckets refill at the configured rate, tool costs and cursor pages
+are charged correctly, only the owner API key is exempt, and over-limit
+calls get 429 with Retry-After on /mcp and /call.
+
+Run: python -m pytest tests/test_rate_limit.py
+"""
+import types
+
+import pytest
+
+import rate_limit
+import server_http
+from conftest import OWNER_HEADERS, PUBLIC_HEADERS
+from rate_limit import MemoryBucketStore, RateLimiter, RateLimitExceeded, rate_limiter, tool_cost
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the bucket store's monotonic clock by hand."""
+    now = {"t": 1000.0}
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(monotonic=lambda: now["t"], time=lambda: now["t"]))
+    return now
+
+
+def test_bucket_refills_at_rate(clock):
+    store = MemoryBucketStore()
+    assert store.take("a", 4, capacity=4, rate=2) == (True, 0.0)
+    allowed, wait = store.take("a", 3, capacity=4, rate=2)
+    assert not allowed and wait == pytest.approx(1.5)
+    clock["t"] += 1.5
+    assert store.take("a", 3, capacity=4, rate=2)[0]
+    # Never refills past capacity
+    clock["t"] += 100
+    assert store.take("a", 4, capacity=4, rate=2)[0]
+    assert not store.take("a", 1, capacity=4, rate=2)[0]
+    # Other principals have their own bucket
+    assert store.take("b", 4, capacity=4, rate=2)[0]
+
+
+def test_costs_and_exemptions(clock):
+    limiter = RateLimiter(MemoryBucketStore(), capacity=20, rate=1)
+    assert tool_cost("match_jobs") == 20
+    assert tool_cost("match_jobs", {"cursor": "abc"}) == rate_limit.DEFAULT_TOOL_COST
+    limiter.charge("key:a", "match_jobs")
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        limiter.charge("key:a", "get_skills")
+    assert excinfo.value.retry_after_header == "1"
+    for _ in range(50):
+        limiter.charge(rate_limit.OWNER_PRINCIPAL, "match_jobs")
+    limiter.charge(None, "match_jobs")
+    assert limiter.limited == 1
+
+
+def test_store_error_falls_back_to_memory():
+    class Broken:
+        def take(self, *args):
+            raise ConnectionError("down")
+
+    limiter = RateLimiter(Broken(), capacity=1, rate=0.001)
+    limiter.charge("key:a", "get_skills")
+    with pytest.raises(RateLimitExceeded):
+        limiter.charge("key:a", "get_skills")
+
+
+def _call(request_id):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": {"name": "get_skills", "arguments": {}}}
+
+
+def test_over_limit_gets_429(client, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "capacity", 2)
+    monkeypatch.setattr(rate_limiter, "rate", 0.01)
+    for n in range(2):
+        assert client.post("/mcp", json=_call(n), headers=PUBLIC_HEADERS).status_code == 200
+    response = client.post("/mcp", json=_call(3), headers=PUBLIC_HEADERS)
+    assert response.status_code == 429
+    assert response.json()["error"]["code"] == server_http.RATE_LIMIT_ERROR_CODE
+    assert int(response.headers["retry-after"]) == response.json()["error"]["data"]["retryAfter"] >= 1
+
+    rest = client.post("/call", json={"name": "get_skills", "arguments": {}}, headers=PUBLIC_HEADERS)
+    assert rest.status_code == 429
+    assert "retry-after" in rest.headers
+
+    # The owner key is exempt; a spoofed owner header is not
+    assert client.post("/mcp", json=_call(4), headers=OWNER_HEADERS).status_code == 200
+    spoofed = client.post("/mcp", json=_call(5), headers={**PUBLIC_HEADERS, "x-vercel-user": "owner"})
+    assert spoofed.status_code == 429
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Ranking result store
+
+Checks every backend round-trips a result, file writes are atomic, reads see
+results still queued for the background writer, queued writes coalesce per
+name, and failed writes are counted instead of raised.
+
+Run: python -m pytest tests/test_result_store.py
+"""
+import threading
+
+import pandas as pd
+import pytest
+
+import file_cache
+from result_store import FileBackend, ResultStore, SHORTLIST, create_store
+
+
+def _frame(score):
+    return pd.DataFrame([{"title": "Engineer", "score": score}, {"title": "Analyst", "score": None}])
+
+
+@pytest.mark.parametrize("kind", ["memory", "file", "sqlite"])
+def test_backends_round_trip(tmp_path, kind):
+    path = str(tmp_path / ("results.db" if kind == "sqlite" else "results"))
+    store = create_store(kind, path)
+    assert store.get(SHORTLIST) is None
+    store.put(SHORTLIST, _frame(1.5))
+    assert store.flush()
+    assert store.get(SHORTLIST) == [{"title": "Engineer", "score": 1.5}, {"title": "Analyst", "score": None}]
+    assert store.stats()["failed"] == 0
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_store("s3")
+
+
+def test_file_write_is_atomic(tmp_path, monkeypatch):
+    backend = FileBackend(str(tmp_path))
+    backend.put(SHORTLIST, _frame(1.0))
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(file_cache.os, "replace", fail)
+    with pytest.raises(OSError):
+        backend.put(SHORTLIST, _frame(2.0))
+    assert backend.get(SHORTLIST)[0]["score"] == 1.0
+    assert [path.name for path in tmp_path.iterdir()] == ["shortlist.json"]
+
+
+class BlockingSink:
+    """Export sink that holds the writer thread until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.written = []
+
+    def put(self, name, df):
+        self.release.wait(5)
+        self.written.append(df["score"].iloc[0])
+
+
+def test_pending_results_are_read_and_coalesced(tmp_path):
+    sink = BlockingSink()
+    store = ResultStore(FileBackend(str(tmp_path)), [sink])
+    store.put("first", _frame(0.0))
+    # While "first" blocks the writer, later shortlists queue and replace each other
+    for score in (1.0, 2.0, 3.0):
+        store.put(SHORTLIST, _frame(score))
+    assert store.get(SHORTLIST)[0]["score"] == 3.0
+    sink.release.set()
+    assert store.flush()
+    assert sink.written == [0.0, 3.0]
+    assert store.stats()["coalesced"] == 2
+    assert store.get(SHORTLIST)[0]["score"] == 3.0
+
+
+def test_failed_writes_are_counted_not_raised(tmp_path):
+    class FailingSink:
+        def put(self, name, df):
+            raise OSError("read-only")
+
+    store = ResultStore(FileBackend(str(tmp_path)), [FailingSink()])
+    store.put(SHORTLIST, _frame(1.0))
+    assert store.flush()
+    stats = store.stats()
+    assert stats["failed"] == 1
+    assert "read-only" in stats["last_error"]
+    # The backend write still happened and the result isn't stuck as pending
+    assert store.get(SHORTLIST)[0]["score"] == 1.0
+    assert store._pending == {}
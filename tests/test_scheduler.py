@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Priority scheduler (scheduler.py)
+
+Checks class routing, per-class concurrency limits, SchedulerBusy once a
+class's queue is full, and that a saturated public class doesn't delay the
+owner.
+
+Run: python -m pytest tests/test_scheduler.py
+"""
+import asyncio
+import threading
+
+import pytest
+
+from rate_limit import OWNER_PRINCIPAL
+from scheduler import (
+    BATCH_PRIORITY,
+    OWNER_PRIORITY,
+    PUBLIC_PRIORITY,
+    PriorityClass,
+    PriorityScheduler,
+    SchedulerBusy,
+    priority_for,
+)
+
+
+def test_priority_for():
+    assert priority_for(OWNER_PRINCIPAL) == OWNER_PRIORITY
+    assert priority_for(OWNER_PRINCIPAL, background=True) == OWNER_PRIORITY
+    assert priority_for("key:abc") == PUBLIC_PRIORITY
+    assert priority_for("key:abc", background=True) == BATCH_PRIORITY
+    assert PriorityScheduler().get("unknown").name == PUBLIC_PRIORITY
+
+
+def test_runs_on_class_threads_within_concurrency():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "threads": set()}
+    release = threading.Event()
+
+    def work(n):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["threads"].add(threading.current_thread().name)
+        release.wait(1)
+        with lock:
+            state["active"] -= 1
+        return n * 2
+
+    async def run():
+        cls = PriorityClass("test", concurrency=2, max_queue=4)
+        calls = [asyncio.ensure_future(cls.run(work, n)) for n in range(5)]
+        await asyncio.sleep(0.05)
+        queued = cls.waiting
+        release.set()
+        return await asyncio.gather(*calls), queued, cls.stats()
+
+    results, queued, stats = asyncio.run(run())
+    assert results == [0, 2, 4, 6, 8]
+    assert queued == 3
+    assert state["peak"] == 2
+    assert all(name.startswith("sched-test") for name in state["threads"])
+    assert stats["completed"] == 5 and stats["queued"] == 0 and stats["rejected"] == 0
+
+
+def test_full_queue_raises_scheduler_busy():
+    release = threading.Event()
+
+    async def run():
+        cls = PriorityClass("tiny", concurrency=1, max_queue=1)
+        running = asyncio.ensure_future(cls.run(release.wait, 1))
+        queued = asyncio.ensure_future(cls.run(release.wait, 1))
+        await asyncio.sleep(0.05)
+        with pytest.raises(SchedulerBusy):
+            await cls.run(release.wait, 1)
+        release.set()
+        await asyncio.gather(running, queued)
+        return cls
+
+    cls = asyncio.run(run())
+    assert cls.rejected == 1
+    assert cls.completed == 2
+    assert cls.capacity == 2
+
+
+def test_owner_not_delayed_by_saturated_public_class():
+    release = threading.Event()
+
+    async def run():
+        sched = PriorityScheduler()
+        public = [asyncio.ensure_future(sched.run(PUBLIC_PRIORITY, release.wait, 2)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        owner = await asyncio.wait_for(sched.run(OWNER_PRIORITY, lambda: "owner"), 1)
+        release.set()
+        await asyncio.gather(*public)
+        return owner
+
+    assert asyncio.run(run()) == "owner"
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Slow-request log (slow_log.py)
+
+Checks slow tool calls are written as JSON lines, arguments are sanitized,
+and that an unwritable SLOW_LOG_FILE (or any logging failure) falls back to
+stderr instead of turning a successful tool call into an error.
+
+Run: python -m pytest tests/test_slow_log.py
+"""
+import json
+import logging
+
+import pytest
+
+import server_http
+from conftest import PUBLIC_HEADERS
+from slow_log import SlowLog, sanitize
+
+UNWRITABLE = "/proc/nope/slow.jsonl"
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    """Log every tool call (threshold just above zero) through a fresh SlowLog."""
+    log = SlowLog(threshold_ms=0.001)
+    monkeypatch.setattr(server_http, "slow_requests", log)
+    yield log
+    log.stop()
+
+
+def test_sanitize_redacts_and_truncates():
+    cleaned = sanitize({"api_key": "abc", "job_description": "x" * 500, "ids": list(range(30))})
+    assert cleaned["api_key"] == "[redacted]"
+    assert cleaned["job_description"].endswith("(500 chars)")
+    assert cleaned["ids"][-1] == "... (30 items)"
+
+
+def test_unwritable_file_falls_back_to_stderr():
+    log = SlowLog()
+    log.start(UNWRITABLE)
+    try:
+        assert [type(handler) for handler in log._listener.handlers] == [logging.StreamHandler]
+    finally:
+        log.stop()
+
+
+def test_slow_tool_call_is_logged(client, slow_log, tmp_path):
+    path = tmp_path / "slow.jsonl"
+    slow_log.start(str(path))
+    response = client.post("/call", json={"name": "get_skills", "arguments": {"api_key": "secret"}}, headers=PUBLIC_HEADERS)
+    assert response.status_code == 200
+    slow_log.stop()
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    tool_entries = [entry for entry in entries if entry["kind"] == "tool"]
+    assert tool_entries and tool_entries[0]["tool"] == "get_skills"
+    assert tool_entries[0]["arguments"] == {"api_key": "[redacted]"}
+
+
+def test_unwritable_file_does_not_fail_tool_calls(client, slow_log):
+    slow_log.start(UNWRITABLE)
+    response = client.post("/call", json={"name": "get_resume_info", "arguments": {}}, headers=PUBLIC_HEADERS)
+    assert response.status_code == 200
+    assert "error" not in response.json()
+    assert slow_log.logged >= 1
+
+
+def test_logging_errors_never_reach_the_result(client, slow_log, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("log backend down")
+
+    monkeypatch.setattr(slow_log, "_base_entry", broken)
+    response = client.post("/call", json={"name": "get_resume_info", "arguments": {}}, headers=PUBLIC_HEADERS)
+    assert response.status_code == 200
+    assert "error" not in response.json()
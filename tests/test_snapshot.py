@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Prebuilt data snapshot (snapshot.py)
+
+Checks a snapshot is read back, that one built by other matcher compile code
+or another format is rejected, and that entries are only offered while their
+source file is unchanged.
+
+Run: python -m pytest tests/test_snapshot.py
+"""
+import pickle
+
+import pytest
+
+import match_rank
+import snapshot
+from conftest import PROJECT_ROOT
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    path = tmp_path_factory.mktemp("snapshot") / "data_snapshot.pkl"
+    path.write_bytes(snapshot.build(PROJECT_ROOT))
+    return path
+
+
+def test_snapshot_round_trip(built):
+    contents = snapshot.read_snapshot(str(built))
+    assert contents is not None
+    assert contents["matchers"] == match_rank.matcher_version()
+    assert "matcher" in contents["entries"]["resume.json"]
+
+
+def test_matcher_version_follows_compile_code(monkeypatch):
+    before = match_rank.matcher_version()
+
+    def _compile_resume(resume):
+        return {"skills": [], "skill_weight": 0, "projects": [], "project_weight": 0}
+
+    monkeypatch.setattr(match_rank, "_compile_resume", _compile_resume)
+    assert match_rank.matcher_version() != before
+
+
+def test_snapshot_from_other_matcher_code_is_ignored(built, monkeypatch):
+    monkeypatch.setattr(match_rank, "matcher_version", lambda: "0" * 16)
+    assert snapshot.read_snapshot(str(built)) is None
+
+
+def test_snapshot_of_other_format_is_ignored(built, tmp_path):
+    contents = pickle.loads(built.read_bytes())
+    contents["format"] = snapshot.SNAPSHOT_FORMAT + 1
+    other = tmp_path / "other.pkl"
+    other.write_bytes(pickle.dumps(contents))
+    assert snapshot.read_snapshot(str(other)) is None
+
+
+def test_entry_check_rejects_changed_source(built, tmp_path):
+    entry = snapshot.read_snapshot(str(built))["entries"]["resume.json"]
+    source = tmp_path / "resume.json"
+    source.write_bytes((PROJECT_ROOT / "resume.json").read_bytes())
+    check = snapshot._check(entry)
+    # Same bytes, new mtime (e.g. a copy): accepted by sha256
+    assert check(source, source.stat())
+    source.write_bytes(source.read_bytes() + b"\n")
+    assert not check(source, source.stat())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Shared SSE heartbeat (sse_heartbeat.py)
+
+Checks the ticker broadcasts to subscribers, skips full queues and stops with
+the last subscriber, and that the sub-servers' vendored copies match the root.
+
+Run: python -m pytest tests/test_sse_heartbeat.py
+"""
+import asyncio
+
+import pytest
+
+from conftest import PROJECT_ROOT
+from sse_heartbeat import HeartbeatScheduler
+
+
+@pytest.mark.parametrize("server", ["b_past_life_mcp", "northstar_mcp"])
+def test_vendored_copy_matches_root(server):
+    root = (PROJECT_ROOT / "sse_heartbeat.py").read_bytes()
+    assert (PROJECT_ROOT / server / "sse_heartbeat.py").read_bytes() == root
+
+
+def test_broadcasts_frame_to_every_subscriber():
+    async def run():
+        heartbeat = HeartbeatScheduler(interval=0.01, frame="ping")
+        first, second = asyncio.Queue(), asyncio.Queue()
+        heartbeat.subscribe(first)
+        heartbeat.subscribe(second)
+        frames = await asyncio.wait_for(asyncio.gather(first.get(), second.get()), 1)
+        heartbeat.unsubscribe(first)
+        heartbeat.unsubscribe(second)
+        return frames, heartbeat.stats()
+
+    frames, stats = asyncio.run(run())
+    assert frames == ["ping", "ping"]
+    assert stats["total_connections"] == 2
+    assert stats["open_connections"] == 0
+    assert stats["ticks"] >= 1
+
+
+def test_full_queue_is_skipped():
+    async def run():
+        heartbeat = HeartbeatScheduler(interval=0.01, frame="ping")
+        queue = asyncio.Queue(maxsize=1)
+        queue.put_nowait("pending")
+        heartbeat.subscribe(queue)
+        await asyncio.sleep(0.05)
+        heartbeat.unsubscribe(queue)
+        return queue, heartbeat
+
+    queue, heartbeat = asyncio.run(run())
+    assert queue.qsize() == 1 and queue.get_nowait() == "pending"
+    assert heartbeat.skipped >= 1
+
+
+def test_ticker_stops_after_last_subscriber():
+    async def run():
+        heartbeat = HeartbeatScheduler(interval=0.01, frame="ping")
+        queue = asyncio.Queue()
+        heartbeat.subscribe(queue)
+        task = heartbeat._task
+        heartbeat.unsubscribe(queue)
+        await asyncio.wait_for(task, 1)
+        return heartbeat
+
+    heartbeat = asyncio.run(run())
+    assert heartbeat._task is None
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Stage-level tracing
+
+Checks spans nest under the open span (also on scheduler threads), a span's
+descendants include grandchildren whatever order they finished in, timings
+sum repeated stages, and HTTP requests get a validated X-Request-ID.
+
+Run: python -m pytest tests/test_tracing.py
+"""
+import asyncio
+
+import pytest
+
+import tracing
+from conftest import PUBLIC_HEADERS
+from scheduler import PUBLIC_PRIORITY, scheduler
+
+
+def test_span_outside_trace_is_noop():
+    with tracing.span("stage") as span:
+        assert span is None
+    assert tracing.current_span() is None
+
+
+def test_descendants_include_grandchildren():
+    with tracing.trace("root", "req-1") as root:
+        with tracing.span("tool") as tool:
+            for _ in range(2):
+                with tracing.span("chunk"):
+                    with tracing.span("score"):
+                        pass
+        with tracing.span("sibling"):
+            pass
+    # Grandchildren finish (and are recorded) before their parents
+    assert [span.name for span in tool.descendants()] == ["score", "chunk", "score", "chunk"]
+    assert {span.name for span in root.descendants()} == {"tool", "chunk", "score", "sibling"}
+    timings = tool.timings()
+    assert timings["request_id"] == "req-1"
+    assert set(timings["stages"]) == {"chunk", "score"}
+    chunks = [span for span in tool.descendants() if span.name == "chunk"]
+    assert timings["stages"]["chunk"] == pytest.approx(sum(span.duration_ms for span in chunks), abs=0.01)
+
+
+def test_failed_span_records_error():
+    with tracing.trace("root") as root:
+        with pytest.raises(KeyError):
+            with tracing.span("stage"):
+                raise KeyError("x")
+    assert root.descendants()[0].attributes["error"] == "KeyError"
+
+
+def test_spans_follow_work_onto_scheduler_threads():
+    def work():
+        with tracing.span("on thread"):
+            return tracing.current_span().parent_id
+
+    async def scenario():
+        with tracing.trace("root") as root:
+            with tracing.span("tool") as tool:
+                parent_id = await scheduler.run(PUBLIC_PRIORITY, work)
+        return root, tool, parent_id
+
+    root, tool, parent_id = asyncio.run(scenario())
+    assert parent_id == tool.span_id
+    assert [span.name for span in tool.descendants()] == ["queue_wait", "on thread"]
+
+
+def test_request_id_is_echoed_or_replaced(client):
+    response = client.get("/healthz", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["x-request-id"] == "abc-123"
+    response = client.get("/healthz", headers={"X-Request-ID": "bad id; drop"})
+    assert response.headers["x-request-id"] != "bad id; drop"
+    assert len(response.headers["x-request-id"]) == 32
+
+
+def test_tool_timings_breakdown(client):
+    response = client.post("/call", json={"name": "get_skills", "arguments": {"timings": True}}, headers={**PUBLIC_HEADERS, "X-Request-ID": "t-1"})
+    timings = response.json()["result"]["timings"]
+    assert timings["request_id"] == "t-1"
+    assert timings["total_ms"] >= 0
@@ -0,0 +1,303 @@
+"""
+Lightweight request tracing for Resume MCP
+- Each HTTP request gets a trace keyed by its X-Request-ID (generated if absent)
+- span("stage") records nested timings; outside a trace it does nothing, so
+  the CLI pays nothing for the instrumented ranking stages
+- Finished traces are exported off the request path to a JSON-lines log or an
+  OTLP/HTTP collector (TRACE_EXPORT=json|otlp)
+- Tools can return a per-stage `timings` breakdown
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# "", "json" (append to TRACE_LOG_FILE) or "otlp" (POST to TRACE_OTLP_ENDPOINT)
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "").lower()
+TRACE_LOG_FILE = os.getenv("TRACE_LOG_FILE", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "resume-mcp")
+
+# Finished traces waiting for export; new ones are dropped when full
+TRACE_EXPORT_QUEUE_SIZE = int(os.getenv("TRACE_EXPORT_QUEUE_SIZE", "1000"))
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# JSON schema fragment for tools that can report timings
+TIMINGS_PROPERTY = {
+    "timings": {
+        "type": "boolean",
+        "description": "Include a per-stage timing breakdown (milliseconds) in the result",
+        "default": False,
+    },
+}
+
+_REQUEST_ID_PATTERN = re.compile(r"^[\w.:-]{1,128}$")
+_HEX32 = re.compile(r"^[0-9a-f]{32}$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("resume_mcp_span", default=None)
+
+# Called with the root span of every finished trace (e.g. the slow-request log)
+_finish_hooks: List[Callable[["Span"], None]] = []
+
+
+class Trace:
+    """All spans recorded for one request."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        # OTLP needs a 16-byte trace id; reuse the request id when it already is one
+        self.trace_id = request_id if _HEX32.match(request_id) else hashlib.blake2b(request_id.encode(), digest_size=16).hexdigest()
+        self.spans: List["Span"] = []
+
+
+class Span:
+    """One timed stage; start/end are epoch nanoseconds."""
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "attributes", "start_ns", "end_ns")
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns or time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def descendants(self) -> List["Span"]:
+        """Finished spans nested under this one, in finish order."""
+        # Spans are recorded when they finish, so a grandchild usually comes
+        # before its parent; walk the parent -> children map instead of one pass
+        children: Dict[Optional[str], List[str]] = {}
+        for span in self.trace.spans:
+            children.setdefault(span.parent_id, []).append(span.span_id)
+        below = set()
+        pending = list(children.get(self.span_id, ()))
+        while pending:
+            span_id = pending.pop()
+            if span_id not in below:
+                below.add(span_id)
+                pending.extend(children.get(span_id, ()))
+        return [span for span in self.trace.spans if span.span_id in below]
+
+    def timings(self) -> Dict[str, Any]:
+        """Per-stage breakdown (stages repeated per chunk are summed)."""
+        stages: Dict[str, float] = {}
+        for span in self.descendants():
+            stages[span.name] = stages.get(span.name, 0.0) + span.duration_ms
+        return {
+            "request_id": self.trace.request_id,
+            "total_ms": round(self.duration_ms, 3),
+            "stages": {name: round(ms, 3) for name, ms in stages.items()},
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span, or None outside a trace."""
+    return _current_span.get()
+
+
+def annotate(key: str, value: Any):
+    """Set an attribute on the current span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.attributes[key] = value
+
+
+def add_finish_hook(hook: Callable[[Span], None]):
+    """Run hook(root_span) whenever a trace finishes."""
+    _finish_hooks.append(hook)
+
+
+def new_request_id(header_value: Optional[str] = None) -> str:
+    """Accept a well-formed client request id, otherwise generate one."""
+    if header_value and _REQUEST_ID_PATTERN.match(header_value):
+        return header_value
+    return uuid.uuid4().hex
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a stage inside the current trace (no-op outside one)."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        child.end_ns = time.time_ns()
+        _current_span.reset(token)
+        parent.trace.spans.append(child)
+
+
+@contextmanager
+def trace(name: str, request_id: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+    """Start a new trace with a root span and export it when the block ends."""
+    root = Span(Trace(request_id or new_request_id()), name, None, attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _current_span.reset(token)
+        root.trace.spans.append(root)
+        for hook in _finish_hooks:
+            try:
+                hook(root)
+            except Exception as e:
+                logger.warning("Trace finish hook failed: %s", e)
+        exporter.submit(root.trace)
+
+
+def _json_record(finished: Trace) -> Dict[str, Any]:
+    return {
+        "request_id": finished.request_id,
+        "trace_id": finished.trace_id,
+        "spans": [span.to_dict() for span in finished.spans],
+    }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_payload(traces: List[Trace]) -> Dict[str, Any]:
+    spans = []
+    for finished in traces:
+        for span in finished.spans:
+            attributes = {"request.id": finished.request_id, **span.attributes}
+            spans.append({
+                "traceId": finished.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_id or "",
+                "name": span.name,
+                "kind": 2 if span.parent_id is None else 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()],
+            })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "resume_mcp.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+class TraceExporter:
+    """Ships finished traces from a background thread so requests never wait on I/O."""
+
+    def __init__(self, mode: str = TRACE_EXPORT):
+        self.mode = mode
+        self.queue: "queue.Queue[Trace]" = queue.Queue(maxsize=TRACE_EXPORT_QUEUE_SIZE)
+        self.dropped = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, finished: Trace):
+        if self.mode not in ("json", "otlp"):
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+        try:
+            self.queue.put_nowait(finished)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < 100:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self.mode == "json":
+                    with open(TRACE_LOG_FILE, "a", encoding="utf-8") as f:
+                        for finished in batch:
+                            f.write(json.dumps(_json_record(finished), default=str) + "\n")
+                else:
+                    request = urllib.request.Request(
+                        TRACE_OTLP_ENDPOINT,
+                        data=json.dumps(_otlp_payload(batch), default=str).encode("utf-8"),
+                        headers={"Content-Type": "application/json"},
+                    )
+                    urllib.request.urlopen(request, timeout=5).close()
+            except Exception as e:
+                logger.warning("Trace export failed (%d traces dropped): %s", len(batch), e)
+
+
+exporter = TraceExporter()
+
+
+class TracingMiddleware:
+    """ASGI middleware: one trace per HTTP request, request id echoed in X-Request-ID."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header_value = None
+        for key, value in scope.get("headers", []):
+            if key == REQUEST_ID_HEADER.encode():
+                header_value = value.decode("latin-1")
+                break
+        request_id = new_request_id(header_value)
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        with trace(f"{scope['method']} {scope['path']}", request_id, **{"http.method": scope["method"], "http.target": scope["path"]}) as root:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.attributes["http.status_code"] = message["status"]
+                    message["headers"] = list(message.get("headers", [])) + [(REQUEST_ID_HEADER.encode(), request_id.encode("latin-1"))]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)